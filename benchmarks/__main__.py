@@ -0,0 +1,52 @@
+"""
+Uso: python -m benchmarks [--update-baselines] [--tolerance 0.5] [--filter texto]
+Sale con código 1 si algún caso supera su línea base guardada en baselines.json
+(por defecto, p50 más de un 50% por encima). Los casos sin línea base se informan
+pero no se comparan; ver en benchmarks.cases la corrida opcional de clean_paths
+sobre un millón de archivos.
+"""
+import argparse
+import sys
+from benchmarks import cases as _cases  # registra los casos
+from benchmarks.runner import cases, load_baselines, regressions, run_case, save_baselines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de HardWindows")
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="regresión permitida sobre el p50 base (0.5 = 50%%)")
+    parser.add_argument("--filter", default="", help="solo casos que contengan este texto")
+    parser.add_argument("--repeat", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    _cases.install_fakes()
+    try:
+        results = {}
+        for name, case in sorted(cases().items()):
+            if args.filter and args.filter not in name:
+                continue
+            res = run_case(case, args.repeat)
+            results[name] = res
+            print(f"{name:45s} p50 {res['p50_ms']:9.3f} ms  p95 {res['p95_ms']:9.3f} ms  "
+                  f"p99 {res['p99_ms']:9.3f} ms  {res['ops_per_s']:10.1f} ops/s")
+    finally:
+        _cases.remove_fakes()
+
+    if args.update_baselines:
+        baselines = load_baselines()
+        baselines.update(results)
+        save_baselines(baselines)
+        print("Líneas base actualizadas")
+        return 0
+    baselines = load_baselines()
+    for name in sorted(results.keys() - baselines.keys()):
+        print("SIN LÍNEA BASE", name)
+    failed = regressions(results, baselines, args.tolerance)
+    for line in failed:
+        print("REGRESIÓN", line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
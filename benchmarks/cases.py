@@ -0,0 +1,254 @@
+"""
+Casos de benchmark de los caminos calientes de core, sobre backends falsos
+deterministas (tests.fakes) para que corran en cualquier Linux.
+HW_BENCH_FILES controla el tamaño del árbol de clean_paths (por defecto 10000, con
+línea base en baselines.json). El árbol grande de referencia es una corrida manual,
+sin línea base (el caso se llama clean_paths[1000000] y tarda minutos):
+HW_BENCH_FILES=1000000 python -m benchmarks --filter clean_paths
+"""
+import os
+import shutil
+import tempfile
+from benchmarks.runner import bench
+from tests.fakes import FakePsutil, FakeWinreg, make_uninstall_registry, patch_backends
+
+BENCH_FILES = int(os.getenv("HW_BENCH_FILES", "10000"))
+
+_ctx = []
+
+
+def install_fakes():
+    """Activa los fakes mientras corren los benchmarks (ver __main__)."""
+    fake_ps = FakePsutil(cpus=64, disks=8, nics=4, processes=3000)
+    reg = make_uninstall_registry(1000)
+    policy_root = r"SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Policies\\"
+    reg.add_key(FakeWinreg.HKEY_LOCAL_MACHINE, policy_root + "System", {"DisableTaskMgr": 0})
+    reg.add_key(FakeWinreg.HKEY_LOCAL_MACHINE, policy_root + "Explorer", {"NoRun": 1})
+    cm = patch_backends(psutil=fake_ps, winreg=reg, windows=True)
+    cm.__enter__()
+    _ctx.append(cm)
+
+
+def remove_fakes():
+    while _ctx:
+        _ctx.pop().__exit__(None, None, None)
+    for roots in (_footprint, _temp_roots):
+        while roots:
+            shutil.rmtree(roots.pop(), ignore_errors=True)
+
+
+# ----------------------- monitor -----------------------
+
+_monitor = []
+
+
+def _get_monitor():
+    from core.monitor import Monitor
+    if not _monitor:
+        _monitor.append(Monitor(history_max=180))
+    return _monitor[0]
+
+
+@bench("monitor.sample", repeat=500)
+def bench_monitor_sample():
+    _get_monitor().sample()
+
+
+# ----------------------- procesos -----------------------
+
+@bench("processes.list_processes[3000]", repeat=50)
+def bench_list_processes():
+    from core.processes import list_processes
+    list_processes()
+
+
+_proc_sampler = []
+
+
+@bench("process_snapshot.snapshot[3000]", repeat=20)
+def bench_process_snapshot():
+    from core.process_snapshot import ProcessSampler
+    if not _proc_sampler:
+        _proc_sampler.append(ProcessSampler(uss=True))
+    _proc_sampler[0].snapshot()
+
+
+_index = []
+
+
+def _get_index():
+    from core.process_index import ProcessIndex
+    if not _index:
+        index = ProcessIndex()
+        index.apply({(pid, float(pid)): {"pid": pid, "name": f"proc{pid % 400}.exe"}
+                     for pid in range(5000)})
+        _index.append(index)
+    return _index[0]
+
+
+@bench("process_index.filter[5000]", repeat=200)
+def bench_process_index_filter():
+    # Una tecla: búsqueda por subcadena sobre 5000 procesos
+    _get_index().filter("oc3", "substring")
+
+
+_hist = []
+
+
+@bench("process_history.update[5000]", repeat=50)
+def bench_process_history_update():
+    # 5000 procesos con 10% de recambio por tick
+    from core.process_history import ProcessHistory
+    if not _hist:
+        _hist.extend([ProcessHistory(period=0.0), 0])
+    h, tick = _hist
+    base = tick * 500
+    h.update({(pid, float(pid)): {"pid": pid, "name": "p", "cpu": 1.0, "rss": 1, "io_read": pid}
+              for pid in range(base, base + 5000)}, t=float(tick))
+    _hist[1] = tick + 1
+
+
+_dog = []
+
+
+@bench("watchdog.evaluate[5000]", repeat=100)
+def bench_watchdog_evaluate():
+    # 5000 procesos y 3 reglas; la meta es muy por debajo de 1 ms cada 100 procesos
+    from core.watchdog import Watchdog, WatchRule
+    if not _dog:
+        rules = [WatchRule("ram", "*", "rss", 2 ** 40, duration=30),
+                 WatchRule("cpu", "proc1", "cpu", 95.0, duration=60, mode="prefix"),
+                 WatchRule("x", "^proc4", "rss", 1.0, mode="regex", dry_run=True, cooldown=1e9)]
+        snap = {(pid, float(pid)): {"pid": pid, "name": f"proc{pid % 400}.exe", "cpu": 1.0, "rss": 1024}
+                for pid in range(5000)}
+        _dog.extend([Watchdog(rules), snap])
+    _dog[0].evaluate(_dog[1])
+
+
+# ----------------------- caché -----------------------
+
+def _make_tree(n_files: int = BENCH_FILES, per_dir: int = 500) -> str:
+    root = tempfile.mkdtemp(prefix="hw-bench-")
+    made = 0
+    d = 0
+    while made < n_files:
+        sub = os.path.join(root, f"d{d // 20}", f"s{d}")
+        os.makedirs(sub, exist_ok=True)
+        for i in range(min(per_dir, n_files - made)):
+            with open(os.path.join(sub, f"f{i}.tmp"), "wb") as f:
+                f.write(b"x" * 64)
+        made += per_dir
+        d += 1
+    return root
+
+
+_temp_roots = []
+
+
+def _setup_temp():
+    # Solo el árbol generado: nunca las carpetas reales de temp_candidates() (en Windows
+    # incluyen C:\\Windows\\Temp y Prefetch). El árbol de la ronda anterior se borra acá,
+    # fuera del cronómetro.
+    while _temp_roots:
+        shutil.rmtree(_temp_roots.pop(), ignore_errors=True)
+    root = _make_tree()
+    _temp_roots.append(root)
+    return root
+
+
+@bench(f"cache_utils.clean_paths[{BENCH_FILES}]", repeat=3, setup=_setup_temp)
+def bench_clean_paths(root):
+    from core.cache_utils import clean_paths
+    deleted = clean_paths([root])[root].deleted
+    assert deleted >= BENCH_FILES, deleted
+
+
+_footprint = []
+
+
+def _setup_footprint():
+    if not _footprint:
+        _footprint.append(_make_tree())
+    return _footprint[0]
+
+
+@bench(f"footprint.analyze[cold {BENCH_FILES}]", repeat=3, setup=_setup_footprint)
+def bench_footprint_cold(root):
+    from core.footprint import FootprintAnalyzer
+    subdirs = [os.path.join(root, d) for d in os.listdir(root)]
+    results = FootprintAnalyzer().analyze(subdirs)
+    assert sum(fp.files for fp in results.values()) >= BENCH_FILES
+
+
+@bench(f"footprint.analyze[warm {BENCH_FILES}]", repeat=10, setup=_setup_footprint)
+def bench_footprint_warm(root):
+    # Segunda pasada con la caché por mtime: un stat por carpeta, ningún listado
+    from core.footprint import get_footprint_analyzer
+    subdirs = [os.path.join(root, d) for d in os.listdir(root)]
+    get_footprint_analyzer().analyze(subdirs)
+
+
+@bench(f"cache_utils.scan_paths[{BENCH_FILES}]", repeat=5, setup=_setup_footprint)
+def bench_scan_paths(root):
+    # Vista previa de la limpieza: recorrido completo sin borrar
+    from core.cache_utils import CleanPlan, scan_paths
+    plan = CleanPlan([root])
+    for _ in scan_paths(plan.roots, plan):
+        pass
+    assert plan.files >= BENCH_FILES
+
+
+# ----------------------- registro -----------------------
+
+@bench("system_utils.list_installed_apps[3x1000]", repeat=10)
+def bench_list_installed_apps():
+    # Primera lectura sobre un inventario nuevo (lo que hace list_installed_apps() la
+    # primera vez), comparable con la línea base previa a la caché
+    from core.app_inventory import AppInventory
+    from core.registry import WinregBackend
+    inventory = AppInventory(WinregBackend())
+    inventory.refresh()
+    apps = [a.as_dict() for a in inventory.apps()]
+    assert len(apps) == 3000, len(apps)
+
+
+@bench("system_utils.list_installed_apps[cached 3x1000]", repeat=100)
+def bench_list_installed_apps_cached():
+    # Lecturas siguientes: solo se consultan las marcas de raíces y subclaves
+    from core.system_utils import list_installed_apps
+    apps = list_installed_apps()
+    assert len(apps) == 3000, len(apps)
+
+
+@bench("app_inventory.refresh[cold 3x1000]", repeat=10)
+def bench_inventory_cold():
+    from core.app_inventory import AppInventory
+    from core.registry import WinregBackend
+    inventory = AppInventory(WinregBackend())
+    inventory.refresh()
+    assert len(inventory.apps()) == 3000
+
+
+@bench("app_inventory.refresh[deep 3x1000]", repeat=10)
+def bench_inventory_deep():
+    from core.app_inventory import get_app_inventory
+    get_app_inventory().refresh(deep=True)
+
+
+@bench("app_inventory.find[3x1000]", repeat=1000)
+def bench_inventory_find():
+    # Resolución de una desinstalación: refresco rápido + índice por nombre
+    from core.system_utils import _find_app
+    assert _find_app("Aplicación 2-999")
+
+
+@bench("policies.get_all_policies", repeat=200)
+def bench_get_all_policies():
+    from core.policies import get_all_policies
+    get_all_policies()
+
+
+@bench("policies.set_policy_value", repeat=200)
+def bench_set_policy_value():
+    from core.policies import set_policy_value
+    set_policy_value("NoRun", True)
@@ -0,0 +1,81 @@
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+_CASES: Dict[str, Dict] = {}
+
+
+def bench(name: str, repeat: int = 50, number: int = 1, setup: Optional[Callable] = None):
+    """
+    Registra un caso de benchmark. La función recibe lo que devuelve 'setup'
+    (si hay) y se cronometra 'number' veces por cada una de las 'repeat' rondas.
+    'setup' se ejecuta fuera del cronómetro antes de cada ronda.
+    """
+    def deco(fn):
+        _CASES[name] = {"fn": fn, "repeat": repeat, "number": number, "setup": setup}
+        return fn
+    return deco
+
+
+def cases() -> Dict[str, Dict]:
+    return dict(_CASES)
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def run_case(case: Dict, repeat: Optional[int] = None) -> Dict[str, float]:
+    """Devuelve latencias por operación (p50/p95/p99 en ms) y throughput (ops/s)."""
+    fn, number, setup = case["fn"], case["number"], case["setup"]
+    samples = []
+    for _ in range(repeat or case["repeat"]):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(arg) if setup else fn()
+        samples.append((time.perf_counter() - t0) / number)
+    samples.sort()
+    total = sum(samples)
+    return {
+        "p50_ms": _percentile(samples, 0.50) * 1e3,
+        "p95_ms": _percentile(samples, 0.95) * 1e3,
+        "p99_ms": _percentile(samples, 0.99) * 1e3,
+        "ops_per_s": len(samples) / total if total else 0.0,
+    }
+
+
+def load_baselines(path: str = BASELINES) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_baselines(results: Dict[str, Dict[str, float]], path: str = BASELINES) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressions(results: Dict[str, Dict[str, float]], baselines: Dict[str, Dict[str, float]],
+                tolerance: float) -> List[str]:
+    """Casos cuyo p50 supera la línea base en más de 'tolerance' (0.5 = 50%)."""
+    out = []
+    for name, res in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        limit = base["p50_ms"] * (1.0 + tolerance)
+        if res["p50_ms"] > limit:
+            out.append(f"{name}: p50 {res['p50_ms']:.3f} ms > {limit:.3f} ms (base {base['p50_ms']:.3f} ms)")
+    return out
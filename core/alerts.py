@@ -0,0 +1,194 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+logger = logging.getLogger("hardwindows.alerts")
+
+
+class AlertEvent(NamedTuple):
+    rule: str
+    metric: str
+    value: float
+    state: str          # "firing" o "resolved"
+    time: float
+    message: str
+
+
+class Rule:
+    """
+    Regla base con histéresis y enfriamiento. Las subclases implementan _update(),
+    que recibe cada muestra y devuelve si la condición se cumple (O(1) por muestra).
+    Se dispara al entrar en condición y se resuelve recién cuando el valor cae por
+    debajo de 'clear' (histéresis). 'cooldown' evita repetir avisos seguidos.
+    """
+
+    def __init__(self, name: str, metric: str, threshold: float,
+                 clear: Optional[float] = None, cooldown: float = 300.0, message: str = ""):
+        self.name = name
+        self.metric = metric
+        self.threshold = threshold
+        self.clear = threshold if clear is None else clear
+        self.cooldown = cooldown
+        self.message = message or name
+        self.active = False
+        self._last_fired = -float("inf")
+
+    def _update(self, t: float, value: float) -> Optional[float]:
+        """Devuelve el valor observado por la regla (nivel, tasa, promedio) o None si aún no hay datos."""
+        raise NotImplementedError
+
+    def _condition(self, t: float, observed: float) -> bool:
+        return observed >= self.threshold
+
+    def evaluate(self, t: float, value: float) -> Optional[AlertEvent]:
+        observed = self._update(t, value)
+        if observed is None:
+            return None
+        if not self.active:
+            if self._condition(t, observed) and t - self._last_fired >= self.cooldown:
+                self.active = True
+                self._last_fired = t
+                return AlertEvent(self.name, self.metric, observed, "firing", t, self.message)
+        elif observed < self.clear:
+            self.active = False
+            return AlertEvent(self.name, self.metric, observed, "resolved", t, self.message)
+        return None
+
+
+class ThresholdRule(Rule):
+    """Dispara si el valor se mantiene >= threshold durante 'duration' segundos."""
+
+    def __init__(self, name: str, metric: str, threshold: float, duration: float = 0.0, **kw):
+        super().__init__(name, metric, threshold, **kw)
+        self.duration = duration
+        self._since: Optional[float] = None
+
+    def _update(self, t: float, value: float) -> Optional[float]:
+        if value >= self.threshold:
+            if self._since is None:
+                self._since = t
+        else:
+            self._since = None
+        return value
+
+    def _condition(self, t: float, observed: float) -> bool:
+        return self._since is not None and t - self._since >= self.duration
+
+
+class _Window:
+    """Ventana deslizante por tiempo con suma corriente (append/popleft amortizado O(1))."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.items: deque = deque()
+        self.total = 0.0
+
+    def push(self, t: float, v: float) -> None:
+        self.items.append((t, v))
+        self.total += v
+        cutoff = t - self.seconds
+        while self.items and self.items[0][0] < cutoff:
+            self.total -= self.items.popleft()[1]
+
+    def full(self, t: float) -> bool:
+        return bool(self.items) and t - self.items[0][0] >= self.seconds * 0.9
+
+
+class RollingAverageRule(Rule):
+    """Dispara si el promedio de los últimos 'window' segundos es >= threshold."""
+
+    def __init__(self, name: str, metric: str, threshold: float, window: float = 60.0, **kw):
+        super().__init__(name, metric, threshold, **kw)
+        self._window = _Window(window)
+
+    def _update(self, t: float, value: float) -> Optional[float]:
+        w = self._window
+        w.push(t, value)
+        if not w.full(t):
+            return None
+        return w.total / len(w.items)
+
+
+class RateOfChangeRule(Rule):
+    """Dispara si el valor sube más de 'threshold' unidades por segundo dentro de 'window' segundos."""
+
+    def __init__(self, name: str, metric: str, threshold: float, window: float = 30.0, **kw):
+        super().__init__(name, metric, threshold, **kw)
+        self._window = _Window(window)
+
+    def _update(self, t: float, value: float) -> Optional[float]:
+        w = self._window
+        w.push(t, value)
+        t0, v0 = w.items[0]
+        if t - t0 <= 0:
+            return None
+        return (value - v0) / (t - t0)
+
+
+class AlertEngine:
+    """
+    Evalúa reglas sobre el flujo de snapshots del Sampler. Las reglas se indexan por
+    métrica y cada una es O(1) por muestra, así cientos de reglas no pesan en el tick.
+    Los eventos se envían a los 'sinks' (callables que reciben un AlertEvent).
+    """
+
+    def __init__(self, rules: Optional[List[Rule]] = None,
+                 sinks: Optional[List[Callable[[AlertEvent], None]]] = None, history: int = 200):
+        self._by_metric: Dict[str, List[Rule]] = {}
+        self.sinks: List[Callable[[AlertEvent], None]] = list(sinks or [])
+        self.events: deque = deque(maxlen=history)
+        for r in rules or []:
+            self.add_rule(r)
+
+    def add_rule(self, rule: Rule) -> None:
+        self._by_metric.setdefault(rule.metric, []).append(rule)
+
+    def rules(self) -> List[Rule]:
+        return [r for rules in self._by_metric.values() for r in rules]
+
+    def active(self) -> List[Rule]:
+        return [r for r in self.rules() if r.active]
+
+    def evaluate(self, values: Mapping[str, Any], t: Optional[float] = None) -> List[AlertEvent]:
+        if t is None:
+            t = time.time()
+        fired = []
+        for metric, rules in self._by_metric.items():
+            value = values.get(metric)
+            if value is None or value != value:
+                continue
+            for rule in rules:
+                event = rule.evaluate(t, value)
+                if event is not None:
+                    fired.append(event)
+        for event in fired:
+            self.events.append(event)
+            for sink in self.sinks:
+                try:
+                    sink(event)
+                except Exception:
+                    pass
+        return fired
+
+    def on_snapshot(self, snap: Mapping[str, Any]) -> None:
+        """Callback para Sampler.subscribe()."""
+        self.evaluate(snap, snap.get("time"))
+
+
+def log_sink(event: AlertEvent) -> None:
+    level = logging.WARNING if event.state == "firing" else logging.INFO
+    logger.log(level, "%s [%s] %s=%.1f", event.message, event.state, event.metric, event.value)
+
+
+def default_rules() -> List[Rule]:
+    return [
+        ThresholdRule("ram_sostenida", "ram", 95.0, duration=600, clear=90.0,
+                      message="RAM sobre 95% durante 10 minutos"),
+        RollingAverageRule("cpu_promedio", "cpu", 90.0, window=300, clear=80.0,
+                           message="CPU promedio sobre 90% en 5 minutos"),
+        ThresholdRule("disco_lleno", "disk", 90.0, clear=88.0, cooldown=3600,
+                      message="Disco sobre 90% de capacidad"),
+        ThresholdRule("tormenta_procesos", "process_spawn_rate", 20.0, duration=10, clear=10.0,
+                      cooldown=600, message="Más de 20 procesos nuevos por segundo"),
+    ]
@@ -0,0 +1,276 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from core.registry import RegistryBackend, WinregBackend
+
+UNINSTALL_ROOTS = (
+    ("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKLM", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    ("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+)
+
+VALUE_NAMES = ("DisplayName", "DisplayVersion", "InstallLocation", "DisplayIcon",
+               "UninstallString", "QuietUninstallString")
+
+Root = Tuple[str, str]
+
+
+class AppEntry(NamedTuple):
+    name: str
+    version: str
+    path: str                   # ejecutable de DisplayIcon o InstallLocation, si existen
+    uninstall: str
+    quiet_uninstall: str
+    install_location: str
+    icon: str
+    hive: str
+    key: str                    # ruta completa de la subclave Uninstall
+
+    def as_dict(self) -> Dict[str, str]:
+        """Forma que devuelve list_installed_apps()."""
+        return {"name": self.name, "version": self.version, "path": self.path, "uninstall": self.uninstall}
+
+    @property
+    def uninstall_command(self) -> str:
+        """QuietUninstallString si existe, si no UninstallString."""
+        return self.quiet_uninstall or self.uninstall
+
+    @property
+    def ident(self) -> Tuple[str, str]:
+        """Identidad estable de la entrada: (raíz, subclave)."""
+        return self.hive, self.key
+
+
+def normalize_name(name: str) -> str:
+    return (name or "").strip().lower()
+
+
+def _guess_path(icon: str, location: str) -> str:
+    exe = icon.split(",")[0].strip('"') if icon else ""
+    if exe and os.path.exists(exe):
+        return exe
+    if location and os.path.isdir(location):
+        return location
+    return ""
+
+
+def icon_file(entry: AppEntry) -> str:
+    """Archivo del ícono (DisplayIcon sin el índice ',N'), o el ejecutable de 'path'."""
+    icon = entry.icon.split(",")[0].strip().strip('"') if entry.icon else ""
+    for candidate in (icon, entry.path):
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return ""
+
+
+def _entry(hive: str, key: str, values: Optional[Dict]) -> Optional[AppEntry]:
+    if not values or not values.get("DisplayName"):
+        return None
+    icon = values.get("DisplayIcon") or ""
+    location = values.get("InstallLocation") or ""
+    return AppEntry(str(values["DisplayName"]), str(values.get("DisplayVersion") or ""),
+                    _guess_path(icon, location), values.get("UninstallString") or "",
+                    values.get("QuietUninstallString") or "", location, icon, hive, key)
+
+
+class AppInventory:
+    """
+    Inventario de aplicaciones instaladas (claves Uninstall) con caché por subclave
+    e índice por nombre visible.
+    Cada subclave guarda su marca de última escritura: refresh() consulta la marca
+    de cada raíz (si cambió, se agregó o quitó una subclave y se re-enumera) y la de
+    cada subclave, y relee los valores solo de las nuevas o modificadas (por
+    ejemplo, una actualización que cambia DisplayVersion o UninstallString; la marca
+    de la raíz no cambia en ese caso). Sin cambios, un refresh cuesta una consulta
+    de info por clave y ninguna lectura de valores. refresh(subkeys=False) consulta
+    solo las marcas de las raíces (una consulta por raíz), para búsquedas que luego
+    validan las entradas encontradas con current(). refresh(deep=True) además
+    re-enumera las subclaves de todas las raíces aunque su marca no haya cambiado.
+    """
+
+    def __init__(self, backend: Optional[RegistryBackend] = None, roots=UNINSTALL_ROOTS):
+        self._backend = backend
+        self.roots: Tuple[Root, ...] = tuple(roots)
+        self._root_mtime: Dict[Root, int] = {}
+        # raíz -> {subclave: (última escritura, entrada o None si no es una aplicación)}
+        self._keys: Dict[Root, Dict[str, Tuple[Optional[int], Optional[AppEntry]]]] = {}
+        self._apps: Optional[List[AppEntry]] = None
+        self._by_name: Optional[Dict[str, List[AppEntry]]] = None
+        self._lock = threading.Lock()
+        self.updated_at: Optional[float] = None
+
+    @property
+    def backend(self) -> RegistryBackend:
+        if self._backend is None:
+            self._backend = WinregBackend()
+        return self._backend
+
+    def refresh(self, deep: bool = False, subkeys: bool = True) -> bool:
+        """
+        Relee lo que cambió desde la última vez; devuelve True si hubo cambios.
+        Primero se consultan las marcas de las raíces (barato) y luego cada raíz
+        revisa sus subclaves en paralelo, una por hilo.
+        """
+        with self._lock:
+            backend = self.backend
+            pending: List[Tuple[Root, int]] = []
+            changed = False
+            for root in self.roots:
+                mtime = backend.last_write(*root)
+                if mtime is None:
+                    self._root_mtime.pop(root, None)
+                    changed |= self._keys.pop(root, None) is not None
+                elif deep or subkeys or root not in self._keys or self._root_mtime.get(root) != mtime:
+                    pending.append((root, mtime))
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="hw-apps") as pool:
+                    scans = list(pool.map(lambda p: self._scan_root(p[0], p[1], deep, subkeys), pending))
+            else:
+                scans = [self._scan_root(root, mtime, deep, subkeys) for root, mtime in pending]
+            for (root, mtime), (keys, root_changed) in zip(pending, scans):
+                self._keys[root] = keys
+                self._root_mtime[root] = mtime
+                changed |= root_changed
+            if changed:
+                self._apps = None
+                self._by_name = None
+            self.updated_at = time.monotonic()
+            return changed
+
+    def _scan_root(self, root: Root, mtime: int, deep: bool, subkeys: bool = True):
+        """Subclaves de una raíz: (nuevo dict de caché, hubo cambios). No modifica estado."""
+        backend = self.backend
+        hive, path = root
+        cached = self._keys.get(root)
+        same_root = not deep and cached is not None and self._root_mtime.get(root) == mtime
+        names = list(cached) if same_root else backend.subkeys(hive, path)
+        cached = cached or {}
+        fresh: Dict[str, Tuple[Optional[int], Optional[AppEntry]]] = {}
+        changed = len(names) != len(cached)
+        for name in names:
+            sub = path + "\\" + name
+            old = cached.get(name)
+            if old is not None and not deep and not subkeys:
+                fresh[name] = old
+                continue
+            sub_mtime = backend.last_write(hive, sub)
+            if old is not None and old[0] == sub_mtime:
+                fresh[name] = old
+                continue
+            entry = _entry(hive, sub, backend.values(hive, sub, VALUE_NAMES))
+            fresh[name] = (sub_mtime, entry)
+            changed |= old is None or old[1] != entry
+        return fresh, changed
+
+    def current(self, entry: AppEntry) -> Optional[AppEntry]:
+        """
+        La entrada tal como está ahora en el registro: si la marca de su subclave
+        cambió desde que se leyó, relee sus valores y actualiza la caché. None si la
+        subclave ya no existe o dejó de ser una aplicación.
+        """
+        path, _, name = entry.key.rpartition("\\")
+        root = (entry.hive, path)
+        with self._lock:
+            backend = self.backend
+            mtime = backend.last_write(entry.hive, entry.key)
+            keys = self._keys.get(root)
+            cached = keys.get(name) if keys is not None else None
+            if mtime is not None and cached is not None and cached[0] == mtime:
+                return cached[1]
+            fresh = None
+            if mtime is not None:
+                fresh = _entry(entry.hive, entry.key, backend.values(entry.hive, entry.key, VALUE_NAMES))
+            if keys is not None and cached is not None:
+                if mtime is None:
+                    del keys[name]
+                else:
+                    keys[name] = (mtime, fresh)
+                self._apps = None
+                self._by_name = None
+            return fresh
+
+    def apps(self) -> List[AppEntry]:
+        """Aplicaciones sin duplicados por (nombre, versión), en el orden del registro."""
+        with self._lock:
+            if self._apps is None:
+                seen = set()
+                apps = []
+                for root in self.roots:
+                    for _, entry in self._keys.get(root, {}).values():
+                        if entry is None or (entry.name, entry.version) in seen:
+                            continue
+                        seen.add((entry.name, entry.version))
+                        apps.append(entry)
+                self._apps = apps
+            return self._apps
+
+    def find(self, display_name: str) -> List[AppEntry]:
+        """
+        Entradas con ese DisplayName (sin distinguir mayúsculas ni espacios en los
+        extremos), incluidas las duplicadas entre raíces. El índice se arma una vez
+        por cambio del inventario, así cada búsqueda es O(1).
+        """
+        with self._lock:
+            if self._by_name is None:
+                index: Dict[str, List[AppEntry]] = {}
+                for root in self.roots:
+                    for _, entry in self._keys.get(root, {}).values():
+                        if entry is not None:
+                            index.setdefault(normalize_name(entry.name), []).append(entry)
+                self._by_name = index
+            return self._by_name.get(normalize_name(display_name), [])
+
+    def estimated_size(self, entry: AppEntry) -> Optional[int]:
+        """EstimatedSize de la subclave en bytes (el registro lo guarda en KB), o None."""
+        values = self.backend.values(entry.hive, entry.key, ("EstimatedSize",))
+        size = (values or {}).get("EstimatedSize")
+        return int(size) * 1024 if isinstance(size, int) else None
+
+
+class AppFilter:
+    """
+    Filtro de texto sobre los nombres de las aplicaciones. Mientras el usuario sigue
+    escribiendo (el texto nuevo extiende al anterior) solo se revisan las entradas
+    que ya coincidían, así cada tecla cuesta menos que la anterior.
+    """
+
+    def __init__(self, entries: Iterable[AppEntry] = ()):
+        self._names: Dict[Tuple[str, str], str] = {}
+        self._text = ""
+        self._matched: Optional[Set[Tuple[str, str]]] = None
+        self.set_entries(entries)
+
+    def set_entries(self, entries: Iterable[AppEntry]) -> None:
+        self._names = {e.ident: normalize_name(e.name) for e in entries}
+        self._text = ""
+        self._matched = None
+
+    def match(self, text: str) -> Optional[Set[Tuple[str, str]]]:
+        """Identidades que contienen 'text'; None si no hay texto (sin filtro)."""
+        text = normalize_name(text)
+        if not text:
+            self._text, self._matched = "", None
+            return None
+        if self._matched is not None and text.startswith(self._text):
+            candidates = self._matched
+        else:
+            candidates = self._names.keys()
+        names = self._names
+        self._matched = {k for k in candidates if text in names[k]}
+        self._text = text
+        return self._matched
+
+
+_inventory: Optional[AppInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_app_inventory() -> AppInventory:
+    """Inventario compartido sobre el registro real (se llena en el primer refresh)."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = AppInventory()
+        return _inventory
@@ -1,49 +1,31 @@
 import os
-import shutil
-from typing import Tuple
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-def _safe_remove_file(path: str) -> Tuple[int, int]:
-    try:
-        size = os.path.getsize(path)
-    except Exception:
-        size = 0
-    try:
-        os.remove(path)
-        return 1, size
-    except Exception:
-        return 0, 0
+# unlink/rmdir relativos a un descriptor de carpeta (POSIX); en Windows se usan rutas
+_DIR_FD = {os.open, os.unlink, os.rmdir} <= os.supports_dir_fd and os.scandir in os.supports_fd
+_OPEN_ROOT = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+# Las subcarpetas no se siguen si son enlaces: se borra el enlace, no el destino
+_OPEN_DIR = _OPEN_ROOT | getattr(os, "O_NOFOLLOW", 0)
 
-def _safe_remove_dir(path: str) -> Tuple[int, int]:
-    deleted = 0
-    freed = 0
-    try:
-        for root, dirs, files in os.walk(path, topdown=False):
-            for name in files:
-                d, f = _safe_remove_file(os.path.join(root, name))
-                deleted += d
-                freed += f
-            for name in dirs:
-                try:
-                    os.rmdir(os.path.join(root, name))
-                except Exception:
-                    pass
-        try:
-            os.rmdir(path)
-        except Exception:
-            pass
-    except Exception:
-        pass
-    return deleted, freed
+# Archivos de primer nivel por tarea: Temp suele tener muchos archivos sueltos
+FILE_BATCH = 512
+# Cada cuántas entradas se revisa la cancelación dentro de una misma carpeta
+CANCEL_CHECK = 128
+
+
+class CleanResult(NamedTuple):
+    root: str
+    deleted: int
+    freed: int
+    errors: int         # archivos o carpetas que no se pudieron borrar (en uso, sin permiso)
 
-def clear_temp() -> Tuple[int, int]:
-    """
-    Elimina archivos temporales comunes de Windows.
-    Retorna (cantidad_eliminados, bytes_liberados).
-    Requiere permisos elevados para rutas del sistema como C:\\Windows\\Temp y Prefetch.
-    """
-    deleted_total = 0
-    freed_total = 0
 
+def temp_candidates() -> List[str]:
+    """Carpetas temporales comunes de Windows que existen en este equipo."""
     candidates = []
     # Temp del usuario
     user_temp = os.getenv("TEMP") or os.getenv("TMP")
@@ -53,26 +35,367 @@ def clear_temp() -> Tuple[int, int]:
     candidates.append(r"C:\\Windows\\Temp")
     # Prefetch
     candidates.append(r"C:\\Windows\\Prefetch")
+    return [p for p in dict.fromkeys(candidates) if p and os.path.exists(p)]
+
+
+def _entry_size(entry: os.DirEntry) -> int:
+    # En Windows el stat viene del listado; en POSIX es un único lstat
+    try:
+        return entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+
+_IO_REPARSE_TAG_MOUNT_POINT = getattr(stat, "IO_REPARSE_TAG_MOUNT_POINT", 0xA0000003)
+
+
+def is_junction(entry: os.DirEntry) -> bool:
+    """
+    Puntos de unión de NTFS: no se entra al destino (el limpiador quita el enlace
+    con rmdir, el análisis de espacio lo cuenta como una entrada más).
+    DirEntry.is_junction() existe desde Python 3.12; antes se mira la etiqueta de
+    reparse del stat, igual que shutil.rmtree (en Windows viene del listado).
+    """
+    try:
+        if hasattr(entry, "is_junction"):
+            return entry.is_junction()
+        if os.name != "nt":
+            return False
+        tag = getattr(entry.stat(follow_symlinks=False), "st_reparse_tag", 0)
+        return tag == _IO_REPARSE_TAG_MOUNT_POINT
+    except OSError:
+        return False
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir(follow_symlinks=False) and not is_junction(entry)
+    except OSError:
+        return False
+
+
+def _remove_files(entries: List[os.DirEntry], dir_fd: Optional[int] = None) -> Tuple[int, int, int]:
+    deleted = freed = errors = 0
+    for entry in entries:
+        size = _entry_size(entry)
+        try:
+            if dir_fd is not None:
+                os.unlink(entry.name, dir_fd=dir_fd)
+            elif is_junction(entry):
+                os.rmdir(entry.path)
+                size = 0
+            else:
+                os.unlink(entry.path)
+            deleted += 1
+            freed += size
+        except OSError:
+            errors += 1
+    return deleted, freed, errors
+
+
+def _remove_file(path: str) -> Tuple[int, int, int]:
+    try:
+        size = os.lstat(path).st_size
+        os.unlink(path)
+        return 1, size, 0
+    except OSError:
+        return 0, 0, 1
+
+
+def _remove_tree_fd(parent_fd: int, name: str) -> Tuple[int, int, int]:
+    """Vacía y borra la carpeta 'name' de 'parent_fd' sin resolver rutas completas."""
+    deleted = freed = errors = 0
+    try:
+        fd = os.open(name, _OPEN_DIR, dir_fd=parent_fd)
+    except OSError:
+        return 0, 0, 1
+    try:
+        with os.scandir(fd) as it:
+            entries = list(it)
+        files = []
+        for entry in entries:
+            if _is_dir(entry):
+                d, f, e = _remove_tree_fd(fd, entry.name)
+                deleted += d
+                freed += f
+                errors += e
+            else:
+                files.append(entry)
+        d, f, e = _remove_files(files, fd)
+        deleted += d
+        freed += f
+        errors += e
+    except OSError:
+        errors += 1
+    finally:
+        os.close(fd)
+    try:
+        os.rmdir(name, dir_fd=parent_fd)
+    except OSError:
+        errors += 1
+    return deleted, freed, errors
+
+
+def _remove_tree_path(path: str) -> Tuple[int, int, int]:
+    deleted = freed = errors = 0
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+        files = []
+        for entry in entries:
+            if _is_dir(entry):
+                d, f, e = _remove_tree_path(entry.path)
+                deleted += d
+                freed += f
+                errors += e
+            else:
+                files.append(entry)
+        d, f, e = _remove_files(files)
+        deleted += d
+        freed += f
+        errors += e
+    except OSError:
+        errors += 1
+    try:
+        os.rmdir(path)
+    except OSError:
+        errors += 1
+    return deleted, freed, errors
+
+
+def _remove_dir(root: str, name: str) -> Tuple[int, int, int]:
+    if _DIR_FD:
+        try:
+            root_fd = os.open(root, _OPEN_ROOT)
+        except OSError:
+            return 0, 0, 1
+        try:
+            return _remove_tree_fd(root_fd, name)
+        finally:
+            os.close(root_fd)
+    return _remove_tree_path(os.path.join(root, name))
 
 
-    for path in candidates:
-        if not path or not os.path.exists(path):
-            continue
-        if os.path.isfile(path):
-            d, f = _safe_remove_file(path)
-            deleted_total += d
-            freed_total += f
-            continue
+def _remove_batch(root: str, entries: List[os.DirEntry]) -> Tuple[int, int, int]:
+    if _DIR_FD:
+        try:
+            root_fd = os.open(root, _OPEN_ROOT)
+        except OSError:
+            return 0, 0, len(entries)
         try:
-            for name in os.listdir(path):
-                full = os.path.join(path, name)
-                if os.path.isdir(full):
-                    d, f = _safe_remove_dir(full)
+            return _remove_files(entries, root_fd)
+        finally:
+            os.close(root_fd)
+    return _remove_files(entries)
+
+
+def clean_paths(roots: List[str], workers: int = 4) -> Dict[str, CleanResult]:
+    """
+    Borra el contenido de cada carpeta de 'roots' (no la carpeta en sí) y devuelve el
+    detalle por raíz. Cada subcarpeta de primer nivel, y cada lote de FILE_BATCH
+    archivos sueltos, es una tarea independiente del pool de 'workers' hilos. Los
+    tamaños salen del stat del DirEntry (uno por archivo) y, donde el sistema lo
+    permite, los borrados son relativos al descriptor de la carpeta. Una raíz que es
+    un archivo se borra tal cual.
+    """
+    totals: Dict[str, List[int]] = {root: [0, 0, 0] for root in roots}
+    tasks = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="hw-clean") as pool:
+        for root in roots:
+            try:
+                mode = os.stat(root).st_mode
+            except OSError:
+                continue
+            if not stat.S_ISDIR(mode):
+                tasks.append((root, pool.submit(_remove_file, root)))
+                continue
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError:
+                totals[root][2] += 1
+                continue
+            files = []
+            for entry in entries:
+                if _is_dir(entry):
+                    tasks.append((root, pool.submit(_remove_dir, root, entry.name)))
                 else:
-                    d, f = _safe_remove_file(full)
-                deleted_total += d
-                freed_total += f
-        except Exception:
-            continue
+                    files.append(entry)
+            for i in range(0, len(files), FILE_BATCH):
+                tasks.append((root, pool.submit(_remove_batch, root, files[i:i + FILE_BATCH])))
+        for root, future in tasks:
+            try:
+                d, f, e = future.result()
+            except Exception:
+                d, f, e = 0, 0, 1
+            t = totals[root]
+            t[0] += d
+            t[1] += f
+            t[2] += e
+    return {root: CleanResult(root, *t) for root, t in totals.items()}
+
+
+def clear_temp(workers: int = 4) -> Tuple[int, int]:
+    """
+    Elimina archivos temporales comunes de Windows.
+    Retorna (cantidad_eliminados, bytes_liberados); el detalle por carpeta está en
+    clean_paths(temp_candidates()).
+    Requiere permisos elevados para rutas del sistema como C:\\Windows\\Temp y Prefetch.
+    """
+    try:
+        results = clean_paths(temp_candidates(), workers)
+    except Exception:
+        return 0, 0
+    return sum(r.deleted for r in results.values()), sum(r.freed for r in results.values())
+
 
-    return deleted_total, freed_total
+# ----------------------- vista previa y aplicación -----------------------
+
+class DirScan(NamedTuple):
+    root: str
+    path: str
+    files: int          # archivos directos de la carpeta (sin subcarpetas)
+    size: int
+
+
+class CleanPlan:
+    """
+    Lo que mostró la vista previa: las carpetas recorridas (en preorden) y el
+    momento del recorrido. apply_plan() borra solo dentro de esas carpetas y solo
+    archivos que no se crearon ni cambiaron después de 'started': se compara el
+    mayor entre st_mtime y st_ctime (creación en Windows, cambio de inodo en POSIX),
+    así una copia o un archivo extraído después de la vista previa se conserva
+    aunque traiga un mtime viejo. Guarda una fila por carpeta,
+    no una por archivo, así la memoria no crece con árboles de millones de archivos.
+    """
+
+    def __init__(self, roots: List[str]):
+        self.roots = list(roots)
+        self.started = time.time()
+        self.dirs: List[Tuple[str, str]] = []       # (raíz, carpeta)
+        self.totals: Dict[str, List[int]] = {root: [0, 0] for root in self.roots}
+        self.complete = False
+
+    def add(self, scan: DirScan) -> None:
+        self.dirs.append((scan.root, scan.path))
+        t = self.totals[scan.root]
+        t[0] += scan.files
+        t[1] += scan.size
+
+    @property
+    def files(self) -> int:
+        return sum(t[0] for t in self.totals.values())
+
+    @property
+    def size(self) -> int:
+        return sum(t[1] for t in self.totals.values())
+
+
+def scan_paths(roots: List[str], plan: Optional[CleanPlan] = None,
+               cancel: Optional[threading.Event] = None) -> Iterator[DirScan]:
+    """
+    Recorre las raíces y produce un DirScan por carpeta a medida que la termina de
+    leer (la raíz incluida). Si se pasa 'plan' se registra cada carpeta; el plan
+    queda 'complete' solo si el recorrido terminó sin cancelarse. 'cancel' se
+    revisa cada CANCEL_CHECK entradas, así se corta en milisegundos aun en una
+    carpeta enorme.
+    """
+    for root in roots:
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            files = size = 0
+            try:
+                with os.scandir(path) as it:
+                    for n, entry in enumerate(it):
+                        if n % CANCEL_CHECK == 0 and cancel is not None and cancel.is_set():
+                            return
+                        if _is_dir(entry):
+                            stack.append(entry.path)
+                        else:
+                            files += 1
+                            size += _entry_size(entry)
+            except OSError:
+                continue
+            scan = DirScan(root, path, files, size)
+            if plan is not None:
+                plan.add(scan)
+            yield scan
+    if plan is not None:
+        plan.complete = True
+
+
+def _apply_dir(path: str, cutoff: float, cancel: Optional[threading.Event]) -> Tuple[int, int, int]:
+    """Borra los archivos directos de 'path' no creados ni modificados después de 'cutoff'."""
+    deleted = freed = errors = 0
+    fd = None
+    try:
+        if _DIR_FD:
+            fd = os.open(path, _OPEN_ROOT)
+        with os.scandir(fd if fd is not None else path) as it:
+            for n, entry in enumerate(it):
+                if n % CANCEL_CHECK == 0 and cancel is not None and cancel.is_set():
+                    break
+                if _is_dir(entry):
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    if max(st.st_mtime, st.st_ctime) > cutoff:
+                        continue
+                    if fd is not None:
+                        os.unlink(entry.name, dir_fd=fd)
+                    elif is_junction(entry):
+                        os.rmdir(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                    deleted += 1
+                    freed += st.st_size
+                except OSError:
+                    errors += 1
+    except OSError:
+        errors += 1
+    finally:
+        if fd is not None:
+            os.close(fd)
+    return deleted, freed, errors
+
+
+def apply_plan(plan: CleanPlan, workers: int = 4, cancel: Optional[threading.Event] = None,
+               progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, CleanResult]:
+    """
+    Borra lo previsto en 'plan': los archivos de cada carpeta recorrida en paralelo
+    ('workers' hilos) y después las subcarpetas que quedaron vacías, de la más
+    profunda a la más alta (las raíces no se borran). 'progress(eliminados, bytes)'
+    se llama con los acumulados, desde el hilo que invoca, tras cada carpeta.
+    """
+    totals: Dict[str, List[int]] = {root: [0, 0, 0] for root in plan.roots}
+    deleted = freed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="hw-clean") as pool:
+        futures = [(root, pool.submit(_apply_dir, path, plan.started, cancel)) for root, path in plan.dirs]
+        for root, future in futures:
+            if cancel is not None and cancel.is_set():
+                for _, f in futures:
+                    f.cancel()
+            if future.cancelled():
+                continue
+            try:
+                d, f, e = future.result()
+            except Exception:
+                d, f, e = 0, 0, 1
+            t = totals[root]
+            t[0] += d
+            t[1] += f
+            t[2] += e
+            deleted += d
+            freed += f
+            if progress is not None:
+                progress(deleted, freed)
+    if cancel is None or not cancel.is_set():
+        roots = set(plan.roots)
+        for root, path in reversed(plan.dirs):
+            if path not in roots:
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+    return {root: CleanResult(root, *t) for root, t in totals.items()}
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Período por defecto (segundos) de cada clase de costo
+COST_PERIODS = {
+    "cheap": 0.0,        # en cada tick (CPU, RAM, contadores de red)
+    "medium": 30.0,      # capacidad de disco
+    "expensive": 300.0,  # particiones, sensores, batería
+}
+
+
+class Source:
+    """Fuente de métricas con su propio período y clase de costo."""
+
+    def __init__(self, name: str, fn: Callable[[], Any], period: Optional[float] = None,
+                 cost: str = "cheap"):
+        if cost not in COST_PERIODS:
+            raise ValueError(f"clase de costo desconocida: {cost}")
+        self.name = name
+        self.fn = fn
+        self.cost = cost
+        self.period = COST_PERIODS[cost] if period is None else period
+        self.last_run = -float("inf")
+
+
+class Collector:
+    """
+    Ejecuta en cada tick solo las fuentes que están vencidas y guarda el último valor
+    con su marca de tiempo. Los consumidores leen (valor, antigüedad) sin volver a
+    consultar psutil. Cada resultado se guarda como tupla inmutable (lectura segura
+    desde otros hilos); el lock protege los períodos y valores, no las lecturas de
+    las fuentes, que corren fuera de él. Desde la GUI conviene invalidate(): la
+    fuente se vuelve a leer en el próximo tick, en el hilo del muestreo.
+    """
+
+    def __init__(self, sources: Optional[List[Source]] = None):
+        self.sources: Dict[str, Source] = {}
+        self._values: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        for s in sources or []:
+            self.add(s)
+
+    def add(self, source: Source) -> None:
+        self.sources[source.name] = source
+
+    def due(self, now: float) -> List[Source]:
+        return [s for s in self.sources.values() if now - s.last_run >= s.period]
+
+    def collect(self, now: Optional[float] = None, costs: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Corre las fuentes vencidas; devuelve los nombres actualizados. 'costs' limita
+        a esas clases de costo (las demás siguen vencidas para el próximo collect).
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            due = self.due(now)
+            if costs is not None:
+                costs = set(costs)
+                due = [s for s in due if s.cost in costs]
+            for source in due:
+                source.last_run = now
+        updated = []
+        for source in due:
+            try:
+                value = source.fn()
+            except Exception:
+                continue
+            with self._lock:
+                self._values[source.name] = (value, now)
+            updated.append(source.name)
+        return updated
+
+    def invalidate(self, name: str) -> None:
+        """Marca la fuente como vencida: se lee en el próximo collect()."""
+        with self._lock:
+            self.sources[name].last_run = -float("inf")
+
+    def refresh(self, name: str) -> Any:
+        """Fuerza la lectura de una fuente en el hilo que llama (p. ej. tras limpiar la caché)."""
+        source = self.sources[name]
+        now = time.monotonic()
+        with self._lock:
+            source.last_run = now
+        try:
+            value = source.fn()
+        except Exception:
+            return self.value(name)
+        with self._lock:
+            self._values[name] = (value, now)
+        return value
+
+    def get(self, name: str) -> Tuple[Any, Optional[float]]:
+        """(último valor, antigüedad en segundos) o (None, None) si nunca se leyó."""
+        item = self._values.get(name)
+        if item is None:
+            return None, None
+        return item[0], time.monotonic() - item[1]
+
+    def value(self, name: str, default: Any = None) -> Any:
+        item = self._values.get(name)
+        return default if item is None else item[0]
+
+    def collected_at(self, name: str) -> Optional[float]:
+        item = self._values.get(name)
+        return None if item is None else item[1]
@@ -0,0 +1,147 @@
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Mapping, Optional
+import psutil
+from core.sampler import Sampler
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "hardwindows_"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    """Valor de una muestra; NaN e infinitos con la forma que exige OpenMetrics."""
+    v = float(value)
+    if math.isnan(v):
+        return "NaN"
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(v)
+
+
+def _family(out: List[str], name: str, kind: str, help_text: str, samples) -> None:
+    out.append(f"# TYPE {PREFIX}{name} {kind}")
+    out.append(f"# HELP {PREFIX}{name} {help_text}")
+    suffix = "_total" if kind == "counter" else ""
+    for labels, value in samples:
+        if labels:
+            lbl = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+            out.append(f"{PREFIX}{name}{suffix}{{{lbl}}} {_number(value)}")
+        else:
+            out.append(f"{PREFIX}{name}{suffix} {_number(value)}")
+
+
+def render_openmetrics(snap: Mapping, device_names: Optional[Mapping] = None,
+                       disks: Optional[Mapping] = None, process_count: Optional[int] = None) -> str:
+    """
+    Genera el texto OpenMetrics para un snapshot del Sampler.
+    'disks' es {métrica: [valor por disco]} y 'process_count' es opcional.
+    """
+    out: List[str] = []
+    _family(out, "cpu_percent", "gauge", "Uso total de CPU en porcentaje.", [({}, snap["cpu"])])
+    cores = snap.get("cpu_cores") or ()
+    if cores:
+        _family(out, "cpu_core_percent", "gauge", "Uso de CPU por núcleo en porcentaje.",
+                [({"core": i}, v) for i, v in enumerate(cores)])
+    _family(out, "memory_percent", "gauge", "Uso de RAM en porcentaje.", [({}, snap["ram"])])
+    _family(out, "disk_usage_percent", "gauge", "Capacidad usada del disco en porcentaje.",
+            [({}, snap["disk"])])
+    _family(out, "network_sent_kbps", "gauge", "Tasa de envío de red en KB/s.", [({}, snap["net_sent_kb"])])
+    _family(out, "network_recv_kbps", "gauge", "Tasa de recepción de red en KB/s.", [({}, snap["net_recv_kb"])])
+    if "net_sent_bytes" in snap:
+        _family(out, "network_sent_bytes", "counter", "Bytes enviados por red.", [({}, snap["net_sent_bytes"])])
+        _family(out, "network_recv_bytes", "counter", "Bytes recibidos por red.", [({}, snap["net_recv_bytes"])])
+    if disks and device_names:
+        names = device_names.get("disks", [])
+        for metric, help_text in (("disk_read", "Lectura de disco en KB/s."),
+                                  ("disk_write", "Escritura de disco en KB/s."),
+                                  ("disk_read_iops", "Operaciones de lectura por segundo."),
+                                  ("disk_write_iops", "Operaciones de escritura por segundo.")):
+            values = disks.get(metric)
+            if values:
+                _family(out, metric, "gauge", help_text,
+                        [({"disk": n}, v) for n, v in zip(names, values)])
+    if process_count is not None:
+        _family(out, "processes", "gauge", "Cantidad de procesos.", [({}, process_count)])
+    _family(out, "samples", "counter", "Muestras tomadas por el sampler.", [({}, snap.get("seq", 0))])
+    out.append("# EOF")
+    return "\n".join(out) + "\n"
+
+
+class MetricsExporter:
+    """
+    Servidor HTTP local que expone las métricas en formato OpenMetrics.
+    El texto se renderiza una vez por muestra (en el hilo del Sampler) y cada scrape
+    solo envía los bytes cacheados: el costo por scrape no depende de cuántas métricas haya.
+    """
+
+    def __init__(self, sampler: Sampler, host: str = "127.0.0.1", port: int = 9108,
+                 disks: bool = False, processes: bool = False):
+        self.sampler = sampler
+        self.host = host
+        self.port = port
+        self.disks = disks
+        self.processes = processes
+        self._body = b"# EOF\n"
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        sampler.subscribe(self._on_sample)
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+    def _on_sample(self, snap) -> None:
+        monitor = self.sampler.monitor
+        disks = None
+        if self.disks:
+            disks = {m: monitor.devices[m].last()
+                     for m in ("disk_read", "disk_write", "disk_read_iops", "disk_write_iops")}
+        count = None
+        if self.processes:
+            try:
+                count = len(psutil.pids())
+            except Exception:
+                count = None
+        text = render_openmetrics(snap, monitor.device_names, disks, count)
+        # Reemplazo atómico de la referencia: los scrapes nunca ven texto a medias
+        self._body = text.encode("utf-8")
+
+    def _handler(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter._body
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="hw-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,173 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+from core.cache_utils import is_junction
+
+
+class Footprint(NamedTuple):
+    path: str
+    size: int           # bytes de los archivos (sin seguir enlaces ni puntos de unión)
+    files: int          # incluye los puntos de unión, que no se recorren
+    dirs: int
+    errors: int         # carpetas que no se pudieron leer
+
+
+class _DirInfo(NamedTuple):
+    mtime: int          # st_mtime_ns de la carpeta
+    size: int           # solo archivos directos
+    files: int
+    subdirs: Tuple[str, ...]
+
+
+def install_dir(path: str, location: str = "") -> str:
+    """
+    Carpeta a medir para una aplicación: InstallLocation si existe, si no la carpeta
+    del ejecutable de 'path'. Nunca la raíz de una unidad ni la carpeta de Windows
+    (un DisplayIcon que apunta a System32 no es la instalación de la aplicación).
+    """
+    candidate = ""
+    if location and os.path.isdir(location):
+        candidate = location
+    elif path and os.path.isdir(path):
+        candidate = path
+    elif path and os.path.isfile(path):
+        candidate = os.path.dirname(path)
+    if not candidate:
+        return ""
+    candidate = os.path.normpath(os.path.abspath(candidate))
+    if os.path.dirname(candidate) == candidate:
+        return ""
+    windir = os.getenv("WINDIR") or os.getenv("SystemRoot")
+    if windir:
+        windir = os.path.normcase(os.path.normpath(windir))
+        norm = os.path.normcase(candidate)
+        if norm == windir or norm.startswith(windir + os.sep):
+            return ""
+    return candidate
+
+
+class FootprintAnalyzer:
+    """
+    Mide tamaño y cantidad de archivos de carpetas de instalación con varios
+    recorridos os.scandir en paralelo (uno por carpeta raíz). Cada carpeta visitada
+    queda en caché con su mtime: si no cambió, su listado no se vuelve a leer y solo
+    se desciende a sus subcarpetas (un stat en lugar de un scandir). Cambios de
+    tamaño de un archivo existente no modifican el mtime de la carpeta; refresh=True
+    ignora la caché. 'io_limit' acota cuántos listados se leen a la vez, así el
+    análisis no satura el disco aunque haya más hilos. Los puntos de unión de NTFS
+    no se recorren: contarían dos veces el destino y pueden formar ciclos.
+    """
+
+    def __init__(self, workers: int = 4, io_limit: int = 2):
+        self.workers = workers
+        self._io = threading.Semaphore(io_limit)
+        self._cache: Dict[str, _DirInfo] = {}
+        self._cancel = threading.Event()
+        self._stats = threading.Lock()
+        self.listed = 0         # listados leídos del disco (para tests y métricas)
+        self.reused = 0         # carpetas resueltas desde la caché
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def reset(self) -> None:
+        """Descarta un cancel() anterior (antes de lanzar un análisis nuevo)."""
+        self._cancel.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _list(self, path: str, mtime: int) -> _DirInfo:
+        size = files = 0
+        subdirs = []
+        with self._io:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if is_junction(entry):
+                                files += 1
+                            else:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            # En Windows el stat del DirEntry viene del listado, sin syscall
+                            size += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        pass
+        with self._stats:
+            self.listed += 1
+        return _DirInfo(mtime, size, files, tuple(subdirs))
+
+    def measure(self, root: str, refresh: bool = False) -> Optional[Footprint]:
+        """Recorre 'root'; None si se canceló a mitad de camino."""
+        size = files = dirs = errors = 0
+        stack = [root]
+        cache = self._cache
+        while stack:
+            if self._cancel.is_set():
+                return None
+            path = stack.pop()
+            try:
+                mtime = os.stat(path, follow_symlinks=False).st_mtime_ns
+                info = cache.get(path)
+                if info is None or info.mtime != mtime or refresh:
+                    info = cache[path] = self._list(path, mtime)
+                else:
+                    with self._stats:
+                        self.reused += 1
+            except OSError:
+                cache.pop(path, None)
+                errors += 1
+                continue
+            size += info.size
+            files += info.files
+            dirs += 1
+            stack.extend(info.subdirs)
+        return Footprint(root, size, files, dirs, errors)
+
+    def analyze(self, roots: Iterable[str], progress: Optional[Callable[[int, int, Footprint], None]] = None,
+                refresh: bool = False, reset: bool = True) -> Dict[str, Footprint]:
+        """
+        Mide cada carpeta (las repetidas una sola vez). 'progress(hechas, total, resultado)'
+        se llama desde el hilo que invoca analyze() a medida que termina cada una.
+        Tras cancel() devuelve lo que se alcanzó a medir. Quien lanza analyze() en
+        otro hilo llama a reset() antes y pasa reset=False, así un cancel() hecho
+        mientras el hilo arranca no se pierde.
+        """
+        if reset:
+            self._cancel.clear()
+        unique = list(dict.fromkeys(r for r in roots if r))
+        results: Dict[str, Footprint] = {}
+        if not unique:
+            return results
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hw-footprint") as pool:
+            futures = {pool.submit(self.measure, root, refresh): root for root in unique}
+            done = 0
+            for future in as_completed(futures):
+                done += 1
+                try:
+                    fp = future.result()
+                except Exception:
+                    fp = None
+                if fp is None:
+                    continue
+                results[fp.path] = fp
+                if progress is not None:
+                    progress(done, len(unique), fp)
+        return results
+
+
+_analyzer: Optional[FootprintAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_footprint_analyzer() -> FootprintAnalyzer:
+    """Analizador compartido: su caché de carpetas sirve entre análisis sucesivos."""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = FootprintAnalyzer()
+        return _analyzer
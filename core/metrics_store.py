@@ -0,0 +1,260 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"HWM1"
+HEADER_SIZE = 256
+_HEADER = struct.Struct("<4sHH")
+SEGMENT_PREFIX = "seg-"
+SEGMENT_SUFFIX = ".bin"
+
+
+def default_store_dir() -> str:
+    """Carpeta por defecto: %LOCALAPPDATA%\\HardWindows\\metrics o ~/.hardwindows/metrics."""
+    base = os.getenv("LOCALAPPDATA")
+    if base:
+        return os.path.join(base, "HardWindows", "metrics")
+    return os.path.join(os.path.expanduser("~"), ".hardwindows", "metrics")
+
+
+class _Segment:
+    """Segmento de solo lectura mapeado en memoria. Ignora registros truncados o con CRC inválido."""
+
+    def __init__(self, path: str, record: struct.Struct, fields: Sequence[str]):
+        self.path = path
+        self.record = record
+        self.fields = list(fields)
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.count = max(0, (size - HEADER_SIZE) // record.size)
+        # Un registro final roto (escritura interrumpida) se descarta
+        while self.count and self._read(self.count - 1) is None:
+            self.count -= 1
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def _read(self, i: int) -> Optional[tuple]:
+        off = HEADER_SIZE + i * self.record.size
+        row = self.record.unpack_from(self._mm, off)
+        crc = zlib.crc32(self._mm[off:off + self.record.size - 8]) & 0xFFFFFFFF
+        if crc != row[-2]:
+            return None
+        return row
+
+    def time_at(self, i: int) -> float:
+        return struct.unpack_from("<d", self._mm, HEADER_SIZE + i * self.record.size)[0]
+
+    def first_time(self) -> Optional[float]:
+        return self.time_at(0) if self.count else None
+
+    def last_time(self) -> Optional[float]:
+        return self.time_at(self.count - 1) if self.count else None
+
+    def find(self, t: float) -> int:
+        """Primer índice con tiempo >= t (búsqueda binaria sobre el mmap)."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.time_at(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class MetricsStore:
+    """
+    Almacén binario append-only de registros de tamaño fijo:
+    tiempo (epoch) + un double por métrica + CRC32. Los segmentos rotan por tamaño
+    o antigüedad y se borran los más viejos para no superar 'max_total_bytes'.
+    Las consultas mapean los segmentos con mmap y solo leen las páginas necesarias.
+    """
+
+    def __init__(self, directory: str, fields: Sequence[str],
+                 max_segment_bytes: int = 4 * 1024 * 1024,
+                 max_segment_seconds: float = 6 * 3600,
+                 max_total_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.fields = tuple(fields)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_seconds = max_segment_seconds
+        self.max_total_bytes = max_total_bytes
+        # tiempo, métricas..., crc, relleno
+        self.record = struct.Struct("<d" + "d" * len(self.fields) + "II")
+        self._lock = threading.Lock()
+        self._fh = None
+        self._fh_path: Optional[str] = None
+        self._fh_started = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    # ----------------------- escritura -----------------------
+
+    def _header(self) -> bytes:
+        names = ",".join(self.fields).encode("utf-8")
+        head = _HEADER.pack(MAGIC, 1, len(self.fields)) + names
+        if len(head) > HEADER_SIZE:
+            raise ValueError("demasiados campos para el encabezado")
+        return head.ljust(HEADER_SIZE, b"\0")
+
+    def _segments(self) -> List[str]:
+        try:
+            names = [n for n in os.listdir(self.directory)
+                     if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_SUFFIX)]
+        except OSError:
+            return []
+        return [os.path.join(self.directory, n) for n in sorted(names)]
+
+    def _open_segment(self, t: float) -> None:
+        self._close_segment()
+        path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{int(t * 1000):015d}{SEGMENT_SUFFIX}")
+        self._fh = open(path, "ab")
+        if self._fh.tell() == 0:
+            self._fh.write(self._header())
+        else:
+            # Alinear tras un registro truncado de una ejecución anterior
+            extra = (self._fh.tell() - HEADER_SIZE) % self.record.size
+            if extra:
+                self._fh.truncate(self._fh.tell() - extra)
+                self._fh.seek(0, os.SEEK_END)
+        self._fh_path = path
+        self._fh_started = t
+        self._enforce_quota()
+
+    def _close_segment(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+        self._fh = None
+        self._fh_path = None
+
+    def _enforce_quota(self) -> None:
+        segments = self._segments()
+        sizes = []
+        for p in segments:
+            try:
+                sizes.append(os.path.getsize(p))
+            except OSError:
+                sizes.append(0)
+        total = sum(sizes)
+        for path, size in zip(segments, sizes):
+            if total <= self.max_total_bytes or path == self._fh_path:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def append(self, t: float, values: Dict[str, float]) -> None:
+        """Agrega un registro (t en segundos epoch). Rota el segmento si corresponde."""
+        row = [float(values.get(f, 0.0)) for f in self.fields]
+        body = struct.pack("<d" + "d" * len(row), t, *row)
+        data = body + struct.pack("<II", zlib.crc32(body) & 0xFFFFFFFF, 0)
+        with self._lock:
+            if (self._fh is None
+                    or self._fh.tell() >= self.max_segment_bytes
+                    or t - self._fh_started >= self.max_segment_seconds):
+                self._open_segment(t)
+            self._fh.write(data)
+            self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segment()
+
+    # ----------------------- lectura -----------------------
+
+    def _open_for_read(self, path: str) -> Optional[_Segment]:
+        try:
+            with open(path, "rb") as f:
+                head = f.read(HEADER_SIZE)
+            magic, _, n = _HEADER.unpack_from(head)
+            names = head[_HEADER.size:].rstrip(b"\0").decode("utf-8").split(",")
+            if magic != MAGIC or n != len(self.fields) or tuple(names) != self.fields:
+                return None
+            return _Segment(path, self.record, self.fields)
+        except Exception:
+            return None
+
+    def query(self, metric: str, t0: float, t1: float,
+              step: Optional[float] = None) -> Tuple[array, array]:
+        """
+        Devuelve (tiempos, valores) con t0 <= t <= t1. Si 'step' se indica, promedia
+        por buckets de 'step' segundos. Nunca carga segmentos completos en memoria.
+        """
+        times, columns = self.query_columns((metric,), t0, t1, step)
+        return times, columns[metric]
+
+    def query_columns(self, metrics: Sequence[str], t0: float, t1: float,
+                      step: Optional[float] = None) -> Tuple[array, Dict[str, array]]:
+        """Como query() pero para varias métricas en una sola pasada por los segmentos."""
+        cols = [(m, 1 + self.fields.index(m)) for m in metrics]
+        times = array("d")
+        out = {m: array("d") for m in metrics}
+        bucket, n = None, 0
+        acc = [0.0] * len(cols)
+
+        def _emit():
+            times.append(bucket)
+            for k, (m, _) in enumerate(cols):
+                out[m].append(acc[k] / n)
+
+        segments = self._segments()
+        starts = [int(os.path.basename(p)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) / 1000.0
+                  for p in segments]
+        first = max(0, bisect_left(starts, t0) - 1)
+        for path, start in zip(segments[first:], starts[first:]):
+            if start > t1:
+                break
+            seg = self._open_for_read(path)
+            if seg is None:
+                continue
+            try:
+                i = seg.find(t0)
+                while i < seg.count:
+                    row = seg._read(i)
+                    i += 1
+                    if row is None:
+                        continue
+                    t = row[0]
+                    if t > t1:
+                        break
+                    if step is None:
+                        times.append(t)
+                        for m, c in cols:
+                            out[m].append(row[c])
+                        continue
+                    b = t - (t % step)
+                    if b != bucket:
+                        if n:
+                            _emit()
+                        bucket, n = b, 0
+                        acc = [0.0] * len(cols)
+                    for k, (_, c) in enumerate(cols):
+                        acc[k] += row[c]
+                    n += 1
+            finally:
+                seg.close()
+        if step is not None and n:
+            _emit()
+        return times, out
+
+    def disk_usage(self) -> int:
+        total = 0
+        for p in self._segments():
+            try:
+                total += os.path.getsize(p)
+            except OSError:
+                pass
+        return total
@@ -1,6 +1,20 @@
+import time
 import psutil
-from collections import deque
-from typing import Deque, Dict, Any
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from core.collector import Collector, Source
+from core.ring_buffer import MatrixRing, RingBuffer
+from core.retention import DEFAULT_TIERS, TieredHistory
+
+COLUMNS = ("time", "cpu", "ram", "disk", "net_sent", "net_recv")
+METRICS = COLUMNS[1:]
+# Matrices tiempo x dispositivo: (nombre, grupo de dispositivos)
+DEVICE_METRICS = (
+    ("cpu_core", "cores"),
+    ("disk_read", "disks"), ("disk_write", "disks"),
+    ("disk_read_iops", "disks"), ("disk_write_iops", "disks"),
+    ("nic_sent", "nics"), ("nic_recv", "nics"),
+)
 
 def cpu_percent() -> float:
     return psutil.cpu_percent(interval=None)
@@ -8,40 +22,243 @@ def cpu_percent() -> float:
 def ram_percent() -> float:
     return psutil.virtual_memory().percent
 
+def disk_percent(path: str = ".") -> float:
+    return psutil.disk_usage(path).percent
+
+def partitions_usage() -> List[Dict[str, Any]]:
+    """Uso de cada partición montada (costoso: un disk_usage por partición)."""
+    out = []
+    for p in psutil.disk_partitions():
+        try:
+            u = psutil.disk_usage(p.mountpoint)
+        except Exception:
+            continue
+        out.append({"device": p.device, "mountpoint": p.mountpoint, "percent": u.percent,
+                    "total": u.total, "free": u.free})
+    return out
+
+def battery_status() -> Optional[Dict[str, Any]]:
+    battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+    if battery is None:
+        return None
+    return {"percent": battery.percent, "plugged": bool(battery.power_plugged)}
+
+def temperatures() -> Dict[str, float]:
+    """Temperatura máxima por sensor (no disponible en Windows con psutil)."""
+    if not hasattr(psutil, "sensors_temperatures"):
+        return {}
+    out = {}
+    for name, entries in (psutil.sensors_temperatures() or {}).items():
+        if entries:
+            out[name] = max(e.current for e in entries)
+    return out
+
+def _disk_counters() -> Dict[str, Any]:
+    return psutil.disk_io_counters(perdisk=True) or {}
+
+def _nic_counters() -> Dict[str, Any]:
+    return psutil.net_io_counters(pernic=True) or {}
+
+def default_sources() -> List[Source]:
+    """Fuentes del Monitor con su clase de costo (ver core.collector.COST_PERIODS)."""
+    return [
+        Source("cpu", lambda: psutil.cpu_percent(interval=None)),
+        Source("cpu_cores", lambda: psutil.cpu_percent(interval=None, percpu=True)),
+        Source("ram", lambda: psutil.virtual_memory().percent),
+        Source("net", lambda: psutil.net_io_counters()),
+        Source("disk_io", _disk_counters),
+        Source("nic_io", _nic_counters),
+        Source("disk", disk_percent, cost="medium"),
+        Source("partitions", partitions_usage, cost="expensive"),
+        Source("battery", battery_status, cost="expensive"),
+        Source("sensors", temperatures, cost="expensive"),
+    ]
+
 class Monitor:
-    def __init__(self, history_max: int = 120):
+    """
+    Historial de recursos en un RingBuffer columnar con marca de tiempo monotónica.
+    Los atributos *_hist son vistas memoryview de solo lectura (sin copias por tick).
+    net_sent/net_recv se guardan en KB/s reales usando el tiempo transcurrido entre muestras.
+    Además alimenta niveles de retención (rollups min/max/avg) para consultar rangos largos.
+    Las lecturas pasan por un Collector multi-período: CPU/RAM/red en cada muestra,
+    capacidad de disco cada 30 s y particiones/batería/sensores cada pocos minutos.
+    El constructor lee solo las fuentes baratas; el resto llega con la primera muestra.
+    """
+
+    def __init__(self, history_max: int = 120, tiers: Sequence[Tuple[float, int]] = DEFAULT_TIERS,
+                 sources: Optional[List[Source]] = None):
         self.history_max = history_max
-        self.cpu_hist: Deque[float] = deque(maxlen=history_max)
-        self.ram_hist: Deque[float] = deque(maxlen=history_max)
-        self.disk_hist: Deque[float] = deque(maxlen=history_max)
-        self.net_sent_hist: Deque[float] = deque(maxlen=history_max)
-        self.net_recv_hist: Deque[float] = deque(maxlen=history_max)
-        self._last_net = psutil.net_io_counters()
+        self.history = RingBuffer(COLUMNS, history_max)
+        self.rollups = TieredHistory(METRICS, tiers)
+        self.collector = Collector(default_sources() if sources is None else sources)
+        self._last_time = time.monotonic()
+        # Solo las fuentes baratas (referencias de red, disco y núcleos): las caras
+        # corren en la primera muestra, en el hilo del Sampler y no en el que lo crea
+        self.collector.collect(self._last_time, costs=("cheap",))
+        self._last_net = self.collector.value("net")
+
+        # Conjunto de dispositivos fijado al crear el Monitor (los nuevos se ignoran)
+        self._last_disk = self.collector.value("disk_io", {})
+        self._last_nic = self.collector.value("nic_io", {})
+        self.device_names: Dict[str, list] = {
+            "cores": [str(i) for i in range(len(self.collector.value("cpu_cores", [0.0])))],
+            "disks": sorted(self._last_disk),
+            "nics": sorted(self._last_nic),
+        }
+        self.devices: Dict[str, MatrixRing] = {
+            name: MatrixRing(history_max, max(1, len(self.device_names[group])))
+            for name, group in DEVICE_METRICS
+        }
+
+    @property
+    def times(self) -> memoryview:
+        return self.history.view("time")
+
+    @property
+    def cpu_hist(self) -> memoryview:
+        return self.history.view("cpu")
+
+    @property
+    def ram_hist(self) -> memoryview:
+        return self.history.view("ram")
+
+    @property
+    def disk_hist(self) -> memoryview:
+        return self.history.view("disk")
+
+    @property
+    def net_sent_hist(self) -> memoryview:
+        return self.history.view("net_sent")
+
+    @property
+    def net_recv_hist(self) -> memoryview:
+        return self.history.view("net_recv")
 
     def sample(self) -> None:
-        cpu = psutil.cpu_percent(interval=None)
-        ram = psutil.virtual_memory().percent
-        try:
-            disk = psutil.disk_usage('.') .percent
-        except Exception:
-            disk = 0.0
+        now = time.monotonic()
+        c = self.collector
+        c.collect(now)
+        cpu = c.value("cpu", 0.0)
+        ram = c.value("ram", 0.0)
+        disk = c.value("disk", 0.0)
 
-        net = psutil.net_io_counters()
-        sent = (net.bytes_sent - self._last_net.bytes_sent) / 1024.0
-        recv = (net.bytes_recv - self._last_net.bytes_recv) / 1024.0
+        net = c.value("net")
+        elapsed = now - self._last_time
+        if net is None or self._last_net is None:
+            sent = recv = 0.0
+        elif elapsed > 0:
+            sent = (net.bytes_sent - self._last_net.bytes_sent) / 1024.0 / elapsed
+            recv = (net.bytes_recv - self._last_net.bytes_recv) / 1024.0 / elapsed
+        else:
+            sent = recv = 0.0
         self._last_net = net
+        self._sample_devices(elapsed)
+        self._last_time = now
+
+        values = {"cpu": cpu, "ram": ram, "disk": disk, "net_sent": sent, "net_recv": recv}
+        self.history.append(time=now, **values)
+        self.rollups.add(now, values)
+
+    def _sample_devices(self, elapsed: float) -> None:
+        """Una llamada por fuente (percpu/perdisk/pernic) y tasas por dispositivo en una pasada."""
+        c = self.collector
+        self.devices["cpu_core"].append(c.value("cpu_cores", []))
+
+        scale = 1.0 / elapsed if elapsed > 0 else 0.0
+        kb = scale / 1024.0
+        disks = c.value("disk_io", {})
+        prev = self._last_disk
+        rows = {"disk_read": [], "disk_write": [], "disk_read_iops": [], "disk_write_iops": []}
+        for name in self.device_names["disks"]:
+            cur, old = disks.get(name), prev.get(name)
+            if cur is None or old is None:
+                for r in rows.values():
+                    r.append(0.0)
+                continue
+            rows["disk_read"].append(max(0, cur.read_bytes - old.read_bytes) * kb)
+            rows["disk_write"].append(max(0, cur.write_bytes - old.write_bytes) * kb)
+            rows["disk_read_iops"].append(max(0, cur.read_count - old.read_count) * scale)
+            rows["disk_write_iops"].append(max(0, cur.write_count - old.write_count) * scale)
+        self._last_disk = disks
+
+        nics = c.value("nic_io", {})
+        prev = self._last_nic
+        sent, recv = [], []
+        for name in self.device_names["nics"]:
+            cur, old = nics.get(name), prev.get(name)
+            if cur is None or old is None:
+                sent.append(0.0)
+                recv.append(0.0)
+                continue
+            sent.append(max(0, cur.bytes_sent - old.bytes_sent) * kb)
+            recv.append(max(0, cur.bytes_recv - old.bytes_recv) * kb)
+        self._last_nic = nics
+        rows["nic_sent"] = sent
+        rows["nic_recv"] = recv
+
+        for name, row in rows.items():
+            self.devices[name].append(row)
+
+    def mark_gap(self, t: float) -> None:
+        """Agrega una fila NaN en 't' para que los gráficos no unan datos separados por una pausa."""
+        nan = float("nan")
+        self.history.append(time=t, **{m: nan for m in METRICS})
+
+    def backfill(self, rows) -> None:
+        """
+        Carga historial previo (p. ej. del MetricsStore) antes de la primera muestra.
+        'rows' es un iterable ordenado de (tiempo_monotónico, {métrica: valor}); las filas
+        alimentan los rollups y, si caen dentro del historial de 1 s, también el RingBuffer.
+        """
+        now = time.monotonic()
+        for t, values in rows:
+            if t >= now - self.history_max:
+                self.history.append(time=t, **{m: values.get(m, 0.0) for m in METRICS})
+            self.rollups.add(t, values)
+
+    def device_history(self, name: str) -> memoryview:
+        """Vista (tiempo x dispositivo) de una métrica de DEVICE_METRICS."""
+        return self.devices[name].view()
+
+    def query(self, metric: str, t0: float, t1: Optional[float] = None,
+              stat: str = "avg") -> Tuple[memoryview, memoryview]:
+        """
+        Devuelve (tiempos, valores) entre t0 y t1 (reloj monotónico) eligiendo el nivel:
+        el historial de 1 s si cubre t0, si no el rollup más fino que lo cubra.
+        'stat' (min/max/avg) solo aplica a los rollups.
+        """
+        if t1 is None:
+            t1 = self._last_time
+        times = self.times
+        if not len(times) or times[0] <= t0:
+            tier = None
+        else:
+            tier = self.rollups.pick(t0)
+            oldest = tier.oldest() if tier else None
+            if oldest is None or oldest >= times[0]:
+                tier = None
+        if tier is None:
+            i = bisect_left(times, t0)
+            j = bisect_right(times, t1)
+            return times[i:j], self.history.view(metric)[i:j]
+        return tier.query(metric, t0, t1, stat)
 
-        self.cpu_hist.append(cpu)
-        self.ram_hist.append(ram)
-        self.disk_hist.append(disk)
-        self.net_sent_hist.append(sent)
-        self.net_recv_hist.append(recv)
+    def query_last(self, metric: str, seconds: float, stat: str = "avg") -> Tuple[memoryview, memoryview]:
+        """Atajo para query() de los últimos 'seconds' segundos."""
+        return self.query(metric, self._last_time - seconds, self._last_time, stat)
 
     def snapshot(self) -> Dict[str, Any]:
+        h = self.history
         return {
-            "cpu": self.cpu_hist[-1] if self.cpu_hist else 0.0,
-            "ram": self.ram_hist[-1] if self.ram_hist else 0.0,
-            "disk": self.disk_hist[-1] if self.disk_hist else 0.0,
-            "net_sent_kb": self.net_sent_hist[-1] if self.net_sent_hist else 0.0,
-            "net_recv_kb": self.net_recv_hist[-1] if self.net_recv_hist else 0.0,
+            "cpu": h.last("cpu"),
+            "ram": h.last("ram"),
+            "disk": h.last("disk"),
+            "net_sent_kb": h.last("net_sent"),
+            "net_recv_kb": h.last("net_recv"),
+            "net_sent_bytes": self._last_net.bytes_sent if self._last_net else 0,
+            "net_recv_bytes": self._last_net.bytes_recv if self._last_net else 0,
+            "disk_age": self.collector.get("disk")[1],
+            "cpu_cores": tuple(self.devices["cpu_core"].last()),
+            "disk_read_kb": sum(self.devices["disk_read"].last()),
+            "disk_write_kb": sum(self.devices["disk_write"].last()),
         }
@@ -0,0 +1,374 @@
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from core.processes import ProcKey, snapshot_processes
+from core.process_snapshot import ProcessSampler, get_process_sampler
+
+
+class ProcessEvent(NamedTuple):
+    kind: str                   # "start" o "exit"
+    pid: int
+    name: str
+    ppid: int
+    create_time: float
+    time: float
+    lifetime: Optional[float]   # solo en "exit": segundos que vivió el proceso
+
+
+class ProcessEventSource:
+    """
+    Fuente de eventos de inicio/fin de procesos.
+    Por defecto compara snapshots sucesivos con diferencia de conjuntos sobre
+    (pid, create_time); en Linux con permisos usa el proc connector (netlink),
+    que avisa de cada fork/exec/exit y atrapa procesos que viven menos que el
+    período de sondeo. Con un 'sampler' todos los snapshots salen de él (si
+    ninguna vista lo refrescó en el último 'interval', la fuente le pide uno): así
+    el diff compara siempre filas con las mismas reglas de omisión, y un proceso
+    sin permiso no "termina" y "arranca" al cambiar de origen. Sin sampler se usa
+    'snapshot_fn'. Si el hilo del proc connector termina (socket cerrado o error),
+    la fuente vuelve al sondeo. Los eventos quedan en un buffer circular acotado y
+    se envían a los suscriptores (desde el hilo que los detectó).
+    """
+
+    def __init__(self, interval: float = 2.0, capacity: int = 5000, use_connector: bool = True,
+                 snapshot_fn: Callable[[], Dict[ProcKey, Dict[str, Any]]] = snapshot_processes,
+                 sampler: Optional[ProcessSampler] = None):
+        self.interval = interval
+        self.use_connector = use_connector
+        self.snapshot_fn = snapshot_fn
+        self.sampler = sampler
+        self.events: deque = deque(maxlen=capacity)
+        self._rows: Optional[Dict[ProcKey, Dict[str, Any]]] = None
+        self._sampled_at: Optional[float] = None
+        self._feed_lock = threading.Lock()
+        self._subscribers: List[Callable[[List[ProcessEvent]], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.connector: Optional["ProcConnector"] = None
+
+    # ----------------------- suscripción -----------------------
+
+    def subscribe(self, callback: Callable[[List[ProcessEvent]], None]) -> None:
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[List[ProcessEvent]], None]) -> None:
+        with self._lock:
+            self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def _publish(self, events: List[ProcessEvent]) -> None:
+        if not events:
+            return
+        with self._lock:
+            self.events.extend(events)
+        for callback in self._subscribers:
+            try:
+                callback(events)
+            except Exception:
+                pass
+
+    # ----------------------- diff de snapshots -----------------------
+
+    def feed(self, snapshot: Dict[ProcKey, Dict[str, Any]], t: Optional[float] = None) -> List[ProcessEvent]:
+        """
+        Compara 'snapshot' con el anterior y publica los eventos. El primer snapshot
+        solo fija la línea base. Sirve como callback de ProcessSampler.subscribe().
+        """
+        if t is None:
+            t = time.time()
+        # El sampler compartido y el sondeo propio pueden llegar desde hilos distintos
+        with self._feed_lock:
+            old = self._rows
+            self._rows = snapshot
+            if old is None:
+                return []
+            started = snapshot.keys() - old.keys()
+            exited = old.keys() - snapshot.keys()
+            events = [self._event("exit", k, old[k], t) for k in exited]
+            events.extend(self._event("start", k, snapshot[k], t) for k in sorted(started, key=lambda k: k[1]))
+            self._publish(events)
+        return events
+
+    @staticmethod
+    def _event(kind: str, key: ProcKey, row: Dict[str, Any], t: float) -> ProcessEvent:
+        lifetime = max(0.0, t - key[1]) if kind == "exit" and key[1] else None
+        return ProcessEvent(kind, key[0], row.get("name") or "", row.get("ppid") or 0, key[1], t, lifetime)
+
+    # ----------------------- consultas -----------------------
+
+    def recent(self, seconds: float, kind: Optional[str] = None) -> List[ProcessEvent]:
+        """Eventos de los últimos 'seconds' segundos (recorre solo esa cola del buffer)."""
+        cutoff = time.time() - seconds
+        out = []
+        with self._lock:
+            for ev in reversed(self.events):
+                if ev.time < cutoff:
+                    break
+                if kind is None or ev.kind == kind:
+                    out.append(ev)
+        out.reverse()
+        return out
+
+    def rate(self, kind: str = "start", window: float = 10.0) -> float:
+        """Eventos por segundo en la ventana."""
+        return len(self.recent(window, kind)) / window
+
+    def metrics(self) -> Dict[str, float]:
+        """Valores para AlertEngine.evaluate()."""
+        return {"process_spawn_rate": self.rate("start"), "process_exit_rate": self.rate("exit")}
+
+    # ----------------------- hilo -----------------------
+
+    def _on_sample(self, snapshot: Dict[ProcKey, Dict[str, Any]]) -> None:
+        self._sampled_at = time.monotonic()
+        self.feed(snapshot)
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            sampled = self._sampled_at
+            if sampled is None or time.monotonic() - sampled >= self.interval:
+                try:
+                    if self.sampler is not None:
+                        # Publica a todos los suscriptores, esta fuente incluida
+                        self.sampler.snapshot()
+                    else:
+                        self.feed(self.snapshot_fn())
+                except Exception:
+                    pass
+            self._stop.wait(self.interval)
+
+    def _run_connector(self, connector: "ProcConnector") -> None:
+        connector.run_until(self._stop)()
+        if self._stop.is_set():
+            return
+        # El socket netlink falló: los eventos siguen llegando por sondeo
+        connector.close()
+        self.connector = None
+        self._rows = None
+        if self.sampler is not None:
+            self.sampler.subscribe(self._on_sample)
+        self._poll()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self.use_connector:
+            connector = ProcConnector(self._publish)
+            if connector.open():
+                try:
+                    connector.seed(self.snapshot_fn())
+                except Exception:
+                    pass
+                self.connector = connector
+        if self.connector is not None:
+            target, args = self._run_connector, (self.connector,)
+        else:
+            target, args = self._poll, ()
+            if self.sampler is not None:
+                self.sampler.subscribe(self._on_sample)
+        self._thread = threading.Thread(target=target, args=args, name="hw-proc-events", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.sampler is not None:
+            self.sampler.unsubscribe(self._on_sample)
+        if self.connector:
+            self.connector.close()
+            self.connector = None
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+# ----------------------- Linux proc connector -----------------------
+
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_CN_MSG = struct.Struct("=IIIIHH")
+_PROC_EVENT = struct.Struct("=IIQ")
+_FORK = struct.Struct("=IIII")
+_EXEC = struct.Struct("=II")
+_EXIT = struct.Struct("=IIII")
+
+
+def _read_comm(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/comm", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _boot_time() -> float:
+    try:
+        with open("/proc/stat", "r") as f:
+            for line in f:
+                if line.startswith("btime"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
+
+
+class ProcConnector:
+    """
+    Cliente del proc connector de Linux (NETLINK_CONNECTOR). Requiere CAP_NET_ADMIN;
+    open() devuelve False si no está disponible y la fuente vuelve al sondeo.
+    Solo se informan procesos (pid == tgid), no hilos. Tras el fork el hijo todavía
+    lleva el nombre del padre: el inicio se publica con el exec que le sigue, o
+    pasados EXEC_WAIT segundos si el hijo no ejecuta otro programa.
+    """
+
+    EXEC_WAIT = 0.5
+
+    def __init__(self, publish: Callable[[List[ProcessEvent]], None]):
+        self.publish = publish
+        self.sock: Optional[socket.socket] = None
+        self._live: Dict[int, Dict[str, Any]] = {}
+        self._pending: Dict[int, float] = {}    # pid -> hora del fork, inicio sin publicar
+        self._offset = 0.0
+
+    def open(self) -> bool:
+        if not sys.platform.startswith("linux") or not hasattr(socket, "AF_NETLINK"):
+            return False
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+            sock.bind((0, CN_IDX_PROC))
+            payload = struct.pack("=I", PROC_CN_MCAST_LISTEN)
+            cn = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0)
+            hdr = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn) + len(payload), NLMSG_DONE, 0, 0, os.getpid())
+            sock.send(hdr + cn + payload)
+            sock.settimeout(0.5)
+        except OSError:
+            return False
+        self.sock = sock
+        # timestamp_ns del kernel es monotónico desde el arranque
+        self._offset = _boot_time()
+        return True
+
+    def seed(self, snapshot: Dict[ProcKey, Dict[str, Any]]) -> None:
+        """Registra los procesos ya existentes para poder nombrarlos cuando terminen."""
+        for (pid, create_time), row in snapshot.items():
+            self._live[pid] = {"name": row.get("name") or "", "ppid": row.get("ppid") or 0,
+                               "create_time": create_time}
+
+    def close(self) -> None:
+        if self.sock:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def parse(self, data: bytes) -> List[ProcessEvent]:
+        events = []
+        pos = 0
+        while pos + _NLMSGHDR.size <= len(data):
+            length = _NLMSGHDR.unpack_from(data, pos)[0]
+            if length < _NLMSGHDR.size:
+                break
+            base = pos + _NLMSGHDR.size + _CN_MSG.size
+            if base + _PROC_EVENT.size <= pos + length:
+                what, _, ts = _PROC_EVENT.unpack_from(data, base)
+                body = base + _PROC_EVENT.size
+                events.extend(self._handle(what, ts / 1e9 + self._offset, data, body))
+            pos += (length + 3) & ~3
+        events.extend(self.flush())
+        return events
+
+    def _start(self, pid: int, now: float) -> ProcessEvent:
+        row = self._live[pid]
+        return ProcessEvent("start", pid, row["name"], row["ppid"], row["create_time"], now, None)
+
+    def flush(self, now: Optional[float] = None) -> List[ProcessEvent]:
+        """Publica el inicio de los hijos que no hicieron exec dentro de EXEC_WAIT."""
+        if not self._pending:
+            return []
+        if now is None:
+            now = time.time()
+        due = [pid for pid, forked in self._pending.items() if now - forked >= self.EXEC_WAIT]
+        for pid in due:
+            del self._pending[pid]
+        return [self._start(pid, now) for pid in due]
+
+    def _handle(self, what: int, t: float, data: bytes, body: int) -> List[ProcessEvent]:
+        now = time.time()
+        if what == PROC_EVENT_FORK:
+            # parent_pid es el hilo que hizo el fork; el padre es su grupo (parent_tgid)
+            _, ppid, pid, tgid = _FORK.unpack_from(data, body)
+            if pid != tgid:
+                return []
+            self._live[pid] = {"name": _read_comm(pid), "ppid": ppid, "create_time": t}
+            self._pending[pid] = now
+            return []
+        if what == PROC_EVENT_EXEC:
+            pid, tgid = _EXEC.unpack_from(data, body)
+            if pid != tgid:
+                return []
+            row = self._live.get(pid)
+            if row is None:
+                # Proceso anterior a la suscripción: solo se actualiza el nombre
+                self._live[pid] = {"name": _read_comm(pid), "ppid": 0, "create_time": 0.0}
+                return []
+            row["name"] = _read_comm(pid) or row["name"]
+            if self._pending.pop(pid, None) is None:
+                return []
+            return [self._start(pid, now)]
+        if what == PROC_EVENT_EXIT:
+            pid, tgid, _, _ = _EXIT.unpack_from(data, body)
+            if pid != tgid:
+                return []
+            events = [self._start(pid, now)] if self._pending.pop(pid, None) is not None else []
+            row = self._live.pop(pid, None) or {"name": "", "ppid": 0, "create_time": 0.0}
+            lifetime = max(0.0, t - row["create_time"]) if row["create_time"] else None
+            events.append(ProcessEvent("exit", pid, row["name"], row["ppid"], row["create_time"], now, lifetime))
+            return events
+        return []
+
+    def run_until(self, stop: threading.Event) -> Callable[[], None]:
+        def run():
+            while not stop.is_set() and self.sock is not None:
+                try:
+                    data = self.sock.recv(65536)
+                except socket.timeout:
+                    self.publish(self.flush())
+                    continue
+                except OSError:
+                    break
+                self.publish(self.parse(data))
+        return run
+
+
+_event_source: Optional[ProcessEventSource] = None
+_event_source_lock = threading.Lock()
+
+
+def get_event_source() -> ProcessEventSource:
+    """
+    Fuente de eventos compartida (se inicia al primer uso). Sin proc connector toma
+    los snapshots del ProcessSampler compartido y le pide uno cuando ninguna vista
+    lo está refrescando.
+    """
+    global _event_source
+    with _event_source_lock:
+        if _event_source is None:
+            _event_source = ProcessEventSource(sampler=get_process_sampler())
+            _event_source.start()
+        return _event_source
@@ -0,0 +1,202 @@
+import heapq
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional
+from core.processes import ProcKey
+from core.process_snapshot import get_process_sampler
+
+METRICS = ("cpu", "rss", "io")
+
+
+class Offender(NamedTuple):
+    key: ProcKey
+    name: str
+    score: float        # promedio sobre la ventana (CPU %, bytes de RSS o bytes/s de E/S)
+    alive: bool
+
+
+class _Series:
+    """Historia compacta de un proceso: un array('f') intercalado [cpu, rss, io] por tick."""
+
+    __slots__ = ("name", "start", "values", "sums", "last_io", "last_t")
+
+    def __init__(self, name: str, start: int, capacity: int):
+        self.name = name
+        self.start = start
+        self.values = array("f", bytes(4 * len(METRICS) * capacity))
+        self.sums = [0.0] * len(METRICS)
+        self.last_io: Optional[float] = None
+        self.last_t = 0.0
+
+
+class ProcessHistory:
+    """
+    Historias cortas de CPU/RSS/E-S por proceso vivo, con ranking de los que más
+    consumieron en la ventana (capacity ticks de 'period' segundos; por defecto 5 min).
+    Cada proceso guarda un buffer circular float32 y sumas corrientes por métrica, así
+    el promedio de la ventana se actualiza en O(1) por tick. En la misma pasada que
+    actualiza las sumas se mantiene, por métrica, un min-heap acotado a N candidatos:
+    cada proceso cuesta una comparación contra el mínimo (y O(log N) solo si entra), sin
+    una segunda recorrida de la tabla para rankear. Al terminar un proceso su
+    historia se libera; solo su puntaje queda en un heap acotado de N terminados por
+    métrica hasta que sale de la ventana.
+    """
+
+    def __init__(self, capacity: int = 30, period: float = 10.0, top_n: int = 10,
+                 max_processes: int = 8192):
+        self.capacity = capacity
+        self.period = period
+        self.top_n = top_n
+        self.max_processes = max_processes
+        self.seq = 0
+        self.times = array("d", bytes(8 * capacity))
+        self._series: Dict[ProcKey, _Series] = {}
+        self._tops: Dict[str, List[Offender]] = {m: [] for m in METRICS}
+        # Por métrica: min-heap de (puntaje, seq de salida, clave, nombre) de procesos terminados
+        self._exited: Dict[str, List] = {m: [] for m in METRICS}
+        self._last_tick = -float("inf")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def _window(self) -> int:
+        return max(1, min(self.seq, self.capacity))
+
+    def update(self, snapshot: Dict[ProcKey, Dict[str, Any]], t: Optional[float] = None) -> bool:
+        """
+        Registra un tick con el snapshot (callback válido para ProcessSampler.subscribe).
+        Los snapshots que llegan antes de 'period' se ignoran: el ritmo de las vistas
+        no acorta la ventana. Devuelve True si se registró.
+        """
+        if t is None:
+            t = time.monotonic()
+        if t - self._last_tick < self.period * 0.9:
+            return False
+        with self._lock:
+            self._last_tick = t
+            cap = self.capacity
+            slot = self.seq % cap
+            self.times[slot] = time.time()
+            n = len(METRICS)
+            top_n = self.top_n
+            live: List[List] = [[] for _ in METRICS]
+            # Primero se liberan los que terminaron, así los nuevos entran aunque haya tope
+            for key in self._series.keys() - snapshot.keys():
+                self._evict(key)
+            for key, row in snapshot.items():
+                s = self._series.get(key)
+                if s is None:
+                    if len(self._series) >= self.max_processes:
+                        continue
+                    s = self._series[key] = _Series(row.get("name") or "", self.seq, cap)
+                io_total = None
+                if row.get("io_read") is not None:
+                    io_total = float(row["io_read"] + (row.get("io_write") or 0))
+                io_rate = 0.0
+                if io_total is not None and s.last_io is not None and t > s.last_t:
+                    io_rate = max(0.0, (io_total - s.last_io) / (t - s.last_t))
+                s.last_io, s.last_t = io_total, t
+                new = (float(row.get("cpu") or 0.0), float(row.get("rss") or 0), io_rate)
+                base = slot * n
+                full = self.seq - s.start >= cap
+                for i in range(n):
+                    if full:
+                        s.sums[i] -= s.values[base + i]
+                    s.values[base + i] = new[i]
+                    s.sums[i] += new[i]
+                    heap = live[i]
+                    if len(heap) < top_n:
+                        heapq.heappush(heap, (s.sums[i], key))
+                    elif s.sums[i] > heap[0][0]:
+                        heapq.heapreplace(heap, (s.sums[i], key))
+            self.seq += 1
+            self._rank(live)
+            return True
+
+    def _evict(self, key: ProcKey) -> None:
+        s = self._series.pop(key)
+        window = self._window()
+        for i, metric in enumerate(METRICS):
+            heap = self._exited[metric]
+            item = (s.sums[i] / window, self.seq, key, s.name)
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    def _rank(self, live: List[List]) -> None:
+        """Combina los candidatos vivos de cada métrica con los terminados en la ventana."""
+        window = self._window()
+        for i, metric in enumerate(METRICS):
+            # Los terminados salen del ranking cuando su último tick deja la ventana
+            exited = [e for e in self._exited[metric] if self.seq - e[1] < self.capacity]
+            if len(exited) != len(self._exited[metric]):
+                heapq.heapify(exited)
+                self._exited[metric] = exited
+            merged = [Offender(k, self._series[k].name, total / window, True) for total, k in live[i]]
+            merged.extend(Offender(k, name, score, False) for score, _, k, name in exited)
+            self._tops[metric] = heapq.nlargest(self.top_n, merged, key=lambda o: o.score)
+
+    def top(self, metric: str = "cpu", n: Optional[int] = None) -> List[Offender]:
+        """Los que más consumieron en la ventana (incluye procesos ya terminados)."""
+        if metric not in METRICS:
+            raise ValueError(f"métrica desconocida: {metric}")
+        tops = self._tops[metric]
+        return tops if n is None else tops[:n]
+
+    def history(self, key: ProcKey, metric: str = "cpu") -> List[float]:
+        """Valores de la métrica para el proceso, del más viejo al más nuevo."""
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                return []
+            i = METRICS.index(metric)
+            n = len(METRICS)
+            count = min(self.seq - s.start, self.capacity)
+            first = self.seq - count
+            return [s.values[(j % self.capacity) * n + i] for j in range(first, self.seq)]
+
+    # ----------------------- hilo -----------------------
+
+    def _run(self) -> None:
+        sampler = get_process_sampler()
+        while not self._stop.is_set():
+            # Si una vista ya tomó un snapshot reciente, no hace falta otro
+            if time.monotonic() - self._last_tick >= self.period:
+                try:
+                    sampler.snapshot()
+                except Exception:
+                    pass
+            self._stop.wait(self.period / 2)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hw-proc-history", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+_history: Optional[ProcessHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_process_history() -> ProcessHistory:
+    """Historial compartido, alimentado por el ProcessSampler compartido (se inicia al primer uso)."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = ProcessHistory()
+            get_process_sampler().subscribe(_history.update)
+            _history.start()
+        return _history
@@ -0,0 +1,211 @@
+import bisect
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+from core.processes import ProcKey, diff_snapshots, snapshot_processes
+from core.process_snapshot import get_process_sampler
+
+FILTER_MODES = ("substring", "prefix", "regex")
+
+
+def normalize(name: str) -> str:
+    return (name or "").strip().lower()
+
+
+def stem(name: str) -> str:
+    """Nombre normalizado sin la extensión .exe ('Chrome.EXE' -> 'chrome')."""
+    n = normalize(name)
+    return n[:-4] if n.endswith(".exe") else n
+
+
+class ProcessIndex:
+    """
+    Índice nombre/ejecutable -> procesos, mantenido en forma incremental a partir de
+    los snapshots (solo se re-indexan los procesos agregados, eliminados o cuyo nombre
+    cambió). Las búsquedas exactas son O(1) y los filtros recorren los nombres
+    distintos (unos cientos) en lugar de todas las filas.
+    """
+
+    def __init__(self):
+        self.rows: Dict[ProcKey, Dict[str, Any]] = {}
+        self._by_name: Dict[str, Set[ProcKey]] = {}
+        self._by_exe: Dict[str, Set[ProcKey]] = {}
+        # Nombre completo normalizado ('chrome.exe') -> procesos, para los filtros de texto
+        self._by_full: Dict[str, Set[ProcKey]] = {}
+        self._sorted: Optional[List[str]] = None
+        self._sorted_full: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        self.updated_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _add(self, key: ProcKey, row: Dict[str, Any]) -> None:
+        self.rows[key] = row
+        name = stem(row.get("name", ""))
+        if name not in self._by_name:
+            self._sorted = None
+        self._by_name.setdefault(name, set()).add(key)
+        full = normalize(row.get("name", ""))
+        if full not in self._by_full:
+            self._sorted_full = None
+        self._by_full.setdefault(full, set()).add(key)
+        exe = normalize(row.get("exe", ""))
+        if exe:
+            self._by_exe.setdefault(exe, set()).add(key)
+
+    def _discard(self, key: ProcKey) -> None:
+        row = self.rows.pop(key)
+        name = stem(row.get("name", ""))
+        keys = self._by_name.get(name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_name[name]
+                self._sorted = None
+        full = normalize(row.get("name", ""))
+        keys = self._by_full.get(full)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_full[full]
+                self._sorted_full = None
+        exe = normalize(row.get("exe", ""))
+        keys = self._by_exe.get(exe)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_exe[exe]
+
+    def apply(self, snapshot: Dict[ProcKey, Dict[str, Any]]) -> None:
+        """Actualiza el índice con un snapshot completo (callback válido para ProcessSampler)."""
+        with self._lock:
+            added, removed, changed = diff_snapshots(self.rows, snapshot)
+            for k in removed:
+                self._discard(k)
+            for k in added:
+                self._add(k, snapshot[k])
+            for k in changed:
+                old, new = self.rows[k], snapshot[k]
+                if old.get("name") != new.get("name") or old.get("exe") != new.get("exe"):
+                    self._discard(k)
+                    self._add(k, new)
+                else:
+                    self.rows[k] = new
+            self.updated_at = time.monotonic()
+
+    def apply_names(self, snapshot: Dict[ProcKey, Dict[str, Any]]) -> None:
+        """
+        Actualiza el índice con un snapshot liviano (solo nombre y ejecutable, ver
+        snapshot_processes(exe=True)): agrega y quita procesos y re-indexa los que
+        cambiaron de nombre, pero conserva las filas completas de los que siguen vivos.
+        """
+        with self._lock:
+            rows = self.rows
+            for k in [k for k in rows if k not in snapshot]:
+                self._discard(k)
+            for k, new in snapshot.items():
+                old = rows.get(k)
+                if old is None:
+                    self._add(k, new)
+                elif old.get("name") != new.get("name") or (new.get("exe") and old.get("exe") != new.get("exe")):
+                    self._discard(k)
+                    self._add(k, {**old, **new})
+            self.updated_at = time.monotonic()
+
+    def age(self) -> Optional[float]:
+        return None if self.updated_at is None else time.monotonic() - self.updated_at
+
+    def lookup(self, name_or_exe: str) -> Set[ProcKey]:
+        """Procesos con ese nombre ('chrome', 'chrome.exe') o ruta de ejecutable, en O(1)."""
+        n = normalize(name_or_exe)
+        with self._lock:
+            if "\\" in n or "/" in n:
+                return set(self._by_exe.get(n, ()))
+            return set(self._by_name.get(stem(n), ()))
+
+    def lookup_under(self, folder: str) -> Set[ProcKey]:
+        """Procesos cuyo ejecutable está dentro de 'folder' (recorre los ejecutables distintos)."""
+        prefix = normalize(folder).rstrip("\\/")
+        if not prefix:
+            return set()
+        out: Set[ProcKey] = set()
+        with self._lock:
+            for exe, keys in self._by_exe.items():
+                if exe.startswith(prefix) and exe[len(prefix):len(prefix) + 1] in ("\\", "/"):
+                    out |= keys
+        return out
+
+    def pids(self, name_or_exe: str) -> Set[int]:
+        return {k[0] for k in self.lookup(name_or_exe)}
+
+    def names(self) -> List[str]:
+        """Nombres distintos ordenados (se reordena solo cuando aparece o desaparece uno)."""
+        if self._sorted is None:
+            self._sorted = sorted(self._by_name)
+        return self._sorted
+
+    def filter(self, pattern: str, mode: str = "substring") -> Set[ProcKey]:
+        """
+        Procesos cuyo nombre coincide con 'pattern' ('substring', 'prefix' o 'regex').
+        Se compara contra el nombre completo que muestra la tabla ('chrome.exe'), sin
+        distinguir mayúsculas. Sin patrón devuelve todos. Una regex inválida no
+        coincide con nada.
+        """
+        if mode not in FILTER_MODES:
+            raise ValueError(f"modo de filtro desconocido: {mode}")
+        with self._lock:
+            if not pattern:
+                return set(self.rows)
+            if self._sorted_full is None:
+                self._sorted_full = sorted(self._by_full)
+            names = self._sorted_full
+            if mode == "prefix":
+                p = normalize(pattern)
+                start = bisect.bisect_left(names, p)
+                end = bisect.bisect_left(names, p + "\uffff", lo=start)
+                matched = names[start:end]
+            elif mode == "substring":
+                p = normalize(pattern)
+                matched = [n for n in names if p in n]
+            else:
+                try:
+                    rx = re.compile(pattern, re.IGNORECASE)
+                except re.error:
+                    return set()
+                matched = [n for n in names if rx.search(n)]
+            out: Set[ProcKey] = set()
+            for n in matched:
+                out |= self._by_full[n]
+            return out
+
+
+_process_index: Optional[ProcessIndex] = None
+_process_index_lock = threading.Lock()
+
+
+def get_process_index() -> ProcessIndex:
+    """
+    Índice compartido, alimentado por cada snapshot del ProcessSampler compartido
+    (las vistas de procesos con auto-refresco lo mantienen al día sin costo extra).
+    """
+    global _process_index
+    with _process_index_lock:
+        if _process_index is None:
+            _process_index = ProcessIndex()
+            get_process_sampler().subscribe(_process_index.apply)
+        return _process_index
+
+
+def fresh_process_index(max_age: float = 2.0) -> ProcessIndex:
+    """
+    Índice compartido, refrescado si es más viejo que 'max_age'. El refresco lee solo
+    nombre y ejecutable de cada proceso (no las métricas del ProcessSampler), así
+    una búsqueda puntual no paga un snapshot completo.
+    """
+    index = get_process_index()
+    age = index.age()
+    if age is None or age > max_age:
+        index.apply_names(snapshot_processes(exe=True))
+    return index
@@ -0,0 +1,139 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import psutil
+from core.processes import ProcKey
+
+
+class ProcessSampler:
+    """
+    Motor de snapshots de procesos con métricas completas (CPU, RSS/USS, hilos,
+    handles/fds, E/S, usuario, create_time). Lee cada proceso dentro de
+    Process.oneshot() y reparte los PIDs en lotes sobre un pool de hilos.
+    Conserva los objetos psutil.Process entre snapshots para que cpu_percent
+    mida el delta desde la muestra anterior.
+    """
+
+    def __init__(self, workers: int = 4, chunk: int = 128, uss: bool = False):
+        self.workers = workers
+        self.chunk = chunk
+        self.uss = uss
+        self._ncpu = psutil.cpu_count() or 1
+        self._cache: Dict[int, Tuple[ProcKey, Any]] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hw-procs")
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Dict[ProcKey, Dict[str, Any]]], None]] = []
+        self.last: Dict[ProcKey, Dict[str, Any]] = {}
+
+    def subscribe(self, callback: Callable[[Dict[ProcKey, Dict[str, Any]]], None]) -> None:
+        """Registra un callback que recibe cada snapshot (desde el hilo que lo tomó)."""
+        if callback not in self._subscribers:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback) -> None:
+        self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def _process(self, pid: int):
+        item = self._cache.get(pid)
+        if item is not None:
+            key, proc = item
+            if proc.is_running():
+                return key, proc
+        proc = psutil.Process(pid)
+        key = (pid, proc.create_time())
+        # La primera llamada fija la referencia; devuelve 0.0
+        proc.cpu_percent(interval=None)
+        return key, proc
+
+    def _read(self, pid: int) -> Optional[Tuple[ProcKey, Any, Dict[str, Any]]]:
+        try:
+            key, proc = self._process(pid)
+            with proc.oneshot():
+                row: Dict[str, Any] = {
+                    "pid": pid,
+                    "name": proc.name(),
+                    "create_time": key[1],
+                    "cpu": proc.cpu_percent(interval=None) / self._ncpu,
+                }
+                try:
+                    row["ppid"] = proc.ppid()
+                except Exception:
+                    row["ppid"] = 0
+                mem = proc.memory_info()
+                row["rss"] = mem.rss
+                row["uss"] = None
+                if self.uss:
+                    try:
+                        row["uss"] = proc.memory_full_info().uss
+                    except (psutil.AccessDenied, AttributeError):
+                        pass
+                row["threads"] = proc.num_threads()
+                try:
+                    row["handles"] = proc.num_handles() if os.name == "nt" else proc.num_fds()
+                except (psutil.AccessDenied, AttributeError):
+                    row["handles"] = None
+                try:
+                    io = proc.io_counters()
+                    row["io_read"], row["io_write"] = io.read_bytes, io.write_bytes
+                except (psutil.AccessDenied, AttributeError):
+                    row["io_read"] = row["io_write"] = None
+                try:
+                    row["user"] = proc.username()
+                except (psutil.AccessDenied, KeyError):
+                    row["user"] = ""
+                try:
+                    row["exe"] = proc.exe()
+                except (psutil.AccessDenied, OSError):
+                    row["exe"] = ""
+            return key, proc, row
+        except Exception:
+            # NoSuchProcess (incluye ZombieProcess) o AccessDenied: el proceso se omite
+            return None
+
+    def _read_chunk(self, pids: List[int]):
+        return [self._read(pid) for pid in pids]
+
+    def snapshot(self) -> Dict[ProcKey, Dict[str, Any]]:
+        """Snapshot completo indexado por (pid, create_time)."""
+        with self._lock:
+            pids = psutil.pids()
+            chunks = [pids[i:i + self.chunk] for i in range(0, len(pids), self.chunk)]
+            if len(chunks) > 1:
+                results = self._pool.map(self._read_chunk, chunks)
+            else:
+                results = [self._read_chunk(c) for c in chunks]
+            out: Dict[ProcKey, Dict[str, Any]] = {}
+            cache: Dict[int, Tuple[ProcKey, Any]] = {}
+            for chunk in results:
+                for item in chunk:
+                    if item is None:
+                        continue
+                    key, proc, row = item
+                    out[key] = row
+                    cache[key[0]] = (key, proc)
+            # Los procesos que terminaron salen del cache
+            self._cache = cache
+            self.last = out
+            for callback in self._subscribers:
+                try:
+                    callback(out)
+                except Exception:
+                    pass
+            return out
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+_process_sampler: Optional[ProcessSampler] = None
+_process_sampler_lock = threading.Lock()
+
+
+def get_process_sampler() -> ProcessSampler:
+    """ProcessSampler compartido del proceso (conserva el estado de cpu_percent entre vistas)."""
+    global _process_sampler
+    with _process_sampler_lock:
+        if _process_sampler is None:
+            _process_sampler = ProcessSampler()
+        return _process_sampler
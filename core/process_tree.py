@@ -0,0 +1,145 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from core.processes import ProcKey, diff_snapshots
+
+
+class ProcessTree:
+    """
+    Índice padre/hijo de procesos construido a partir de 'ppid'. Se actualiza en forma
+    incremental con cada snapshot (solo se tocan los procesos agregados, eliminados o
+    re-emparentados). Un padre solo se acepta si es más antiguo que el hijo, así un PID
+    reutilizado no adopta procesos ajenos. Los huérfanos quedan como raíces.
+    """
+
+    def __init__(self):
+        self.rows: Dict[ProcKey, Dict[str, Any]] = {}
+        self._by_pid: Dict[int, ProcKey] = {}
+        self._parent: Dict[ProcKey, Optional[ProcKey]] = {}
+        self._children: Dict[Optional[ProcKey], List[ProcKey]] = {None: []}
+        self._totals: Dict[Tuple[ProcKey, Tuple[str, ...]], Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key) -> bool:
+        return key in self.rows
+
+    # ----------------------- consultas -----------------------
+
+    def key_of(self, pid: int) -> Optional[ProcKey]:
+        return self._by_pid.get(pid)
+
+    def parent(self, key: ProcKey) -> Optional[ProcKey]:
+        return self._parent.get(key)
+
+    def children(self, key: Optional[ProcKey] = None) -> List[ProcKey]:
+        """Hijos directos de 'key' (None = raíces), en orden de llegada."""
+        return self._children.get(key, [])
+
+    def roots(self) -> List[ProcKey]:
+        return self._children[None]
+
+    def row_of(self, key: ProcKey) -> int:
+        """Posición de 'key' entre sus hermanos."""
+        return self._children[self._parent[key]].index(key)
+
+    def descendants(self, key: ProcKey) -> Iterator[ProcKey]:
+        """Recorre el subárbol de 'key' (sin incluirlo), padres antes que hijos."""
+        stack = list(reversed(self._children.get(key, [])))
+        while stack:
+            k = stack.pop()
+            yield k
+            stack.extend(reversed(self._children.get(k, [])))
+
+    def aggregate(self, key: ProcKey, fields: Sequence[str] = ("cpu", "rss")) -> Dict[str, float]:
+        """
+        Suma de 'fields' sobre el subárbol de 'key' (incluido), en O(subárbol).
+        El resultado se memoriza hasta el próximo cambio del árbol.
+        """
+        cache_key = (key, tuple(fields))
+        cached = self._totals.get(cache_key)
+        if cached is not None:
+            return cached
+        totals = dict.fromkeys(fields, 0.0)
+        for k in (key, *self.descendants(key)):
+            row = self.rows[k]
+            for f in fields:
+                v = row.get(f)
+                if v is not None:
+                    totals[f] += v
+        self._totals[cache_key] = totals
+        return totals
+
+    # ----------------------- mutaciones -----------------------
+
+    def parent_for(self, key: ProcKey, row: Dict[str, Any]) -> Optional[ProcKey]:
+        """Padre que le corresponde a 'row' según su ppid (None si queda como raíz)."""
+        ppid = row.get("ppid")
+        if not ppid or ppid == key[0]:
+            return None
+        parent = self._by_pid.get(ppid)
+        if parent is None or parent[1] > key[1]:
+            return None
+        return parent
+
+    def _link(self, key: ProcKey, parent: Optional[ProcKey]) -> None:
+        self._parent[key] = parent
+        self._children.setdefault(parent, []).append(key)
+
+    def _unlink(self, key: ProcKey) -> None:
+        siblings = self._children[self._parent.pop(key)]
+        siblings.remove(key)
+
+    def add(self, key: ProcKey, row: Dict[str, Any]) -> Optional[ProcKey]:
+        """Agrega un proceso; devuelve la clave del padre (None si queda como raíz)."""
+        self.rows[key] = row
+        self._by_pid[key[0]] = key
+        parent = self.parent_for(key, row)
+        self._link(key, parent)
+        self._totals.clear()
+        return parent
+
+    def remove(self, key: ProcKey) -> List[ProcKey]:
+        """Quita un proceso; sus hijos pasan a ser raíces. Devuelve esos hijos."""
+        orphans = self._children.pop(key, [])
+        self._unlink(key)
+        for child in orphans:
+            self._link(child, None)
+        del self.rows[key]
+        if self._by_pid.get(key[0]) == key:
+            del self._by_pid[key[0]]
+        self._totals.clear()
+        return orphans
+
+    def update(self, key: ProcKey, row: Dict[str, Any]) -> bool:
+        """Actualiza los datos; re-emparenta si cambió el padre. Devuelve True si se movió."""
+        self.rows[key] = row
+        self._totals.clear()
+        parent = self.parent_for(key, row)
+        if parent == self._parent[key]:
+            return False
+        self._unlink(key)
+        self._link(key, parent)
+        return True
+
+    def needs_move(self, key: ProcKey, row: Dict[str, Any]) -> bool:
+        return self.parent_for(key, row) != self._parent.get(key)
+
+    def ancestors(self, key: ProcKey) -> Iterator[ProcKey]:
+        p = self._parent.get(key)
+        while p is not None:
+            yield p
+            p = self._parent.get(p)
+
+    def apply(self, snapshot: Dict[ProcKey, Dict[str, Any]]
+              ) -> Tuple[List[ProcKey], List[ProcKey], List[ProcKey]]:
+        """Aplica un snapshot completo; devuelve (agregados, eliminados, modificados)."""
+        added, removed, changed = diff_snapshots(self.rows, snapshot)
+        for k in removed:
+            self.remove(k)
+        # Por antigüedad: el padre siempre se indexa antes que sus hijos
+        added.sort(key=lambda k: k[1])
+        for k in added:
+            self.add(k, snapshot[k])
+        for k in changed:
+            self.update(k, snapshot[k])
+        return added, removed, changed
@@ -0,0 +1,218 @@
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+import psutil
+from core.processes import ERR_DENIED, ERR_GONE, ProcKey
+from core.process_index import normalize, stem
+from core.process_snapshot import get_process_sampler
+
+# Nivel -> (clase de prioridad de Windows, valor nice en POSIX)
+PRIORITY_LEVELS = {
+    "idle": ("IDLE_PRIORITY_CLASS", 19),
+    "below_normal": ("BELOW_NORMAL_PRIORITY_CLASS", 10),
+    "normal": ("NORMAL_PRIORITY_CLASS", 0),
+    "above_normal": ("ABOVE_NORMAL_PRIORITY_CLASS", -5),
+    "high": ("HIGH_PRIORITY_CLASS", -10),
+    "realtime": ("REALTIME_PRIORITY_CLASS", -20),
+}
+
+# Nivel -> (constante de Windows, (clase, valor) de ionice en Linux)
+IO_LEVELS = {
+    "very_low": ("IOPRIO_VERYLOW", ("IOPRIO_CLASS_IDLE", 0)),
+    "low": ("IOPRIO_LOW", ("IOPRIO_CLASS_BE", 7)),
+    "normal": ("IOPRIO_NORMAL", ("IOPRIO_CLASS_BE", 4)),
+    "high": ("IOPRIO_HIGH", ("IOPRIO_CLASS_BE", 0)),
+}
+
+ERR_UNSUPPORTED = "No soportado en este sistema"
+
+
+def _is_windows() -> bool:
+    return os.name == "nt"
+
+
+class Profile(NamedTuple):
+    name: str
+    priority: Optional[str] = None          # clave de PRIORITY_LEVELS
+    affinity: Optional[Sequence[int]] = None
+    io: Optional[str] = None                # clave de IO_LEVELS
+
+
+DEFAULT_PROFILES = {
+    "background": Profile("background", priority="below_normal", io="very_low"),
+    "realtime-ish": Profile("realtime-ish", priority="high", io="high"),
+    "normal": Profile("normal", priority="normal", io="normal"),
+}
+
+
+def _priority_value(level: str):
+    win, nice = PRIORITY_LEVELS[level]
+    return getattr(psutil, win) if _is_windows() else nice
+
+
+def _io_args(level: str):
+    win, (cls, value) = IO_LEVELS[level]
+    if _is_windows():
+        return (getattr(psutil, win),)
+    return (getattr(psutil, cls), value)
+
+
+def _apply(pids: Iterable[int], action) -> Dict[int, Optional[str]]:
+    """Aplica 'action(proc)' a cada pid; {pid: None si se aplicó, o mensaje de error}."""
+    results: Dict[int, Optional[str]] = {}
+    for pid in pids:
+        try:
+            action(psutil.Process(pid))
+            results[pid] = None
+        except psutil.NoSuchProcess:
+            results[pid] = ERR_GONE
+        except psutil.AccessDenied:
+            results[pid] = ERR_DENIED
+        except (AttributeError, NotImplementedError):
+            results[pid] = ERR_UNSUPPORTED
+        except Exception as e:
+            results[pid] = f"Error: {e}"
+    return results
+
+
+def set_priority(pids: Iterable[int], level: str) -> Dict[int, Optional[str]]:
+    """Clase de prioridad (Windows) o nice (POSIX) para uno o varios procesos."""
+    if level not in PRIORITY_LEVELS:
+        raise ValueError(f"prioridad desconocida: {level}")
+    return _apply(pids, lambda p: p.nice(_priority_value(level)))
+
+
+def set_affinity(pids: Iterable[int], cpus: Sequence[int]) -> Dict[int, Optional[str]]:
+    """Restringe los procesos a los núcleos indicados (lista vacía = todos)."""
+    return _apply(pids, lambda p: p.cpu_affinity(list(cpus)))
+
+
+def set_io_priority(pids: Iterable[int], level: str) -> Dict[int, Optional[str]]:
+    if level not in IO_LEVELS:
+        raise ValueError(f"prioridad de E/S desconocida: {level}")
+    return _apply(pids, lambda p: p.ionice(*_io_args(level)))
+
+
+def apply_profile(pids: Iterable[int], profile: Profile) -> Dict[int, Optional[str]]:
+    """Aplica prioridad, afinidad y E/S del perfil; el primer error de cada pid se informa."""
+    pids = list(pids)
+    results: Dict[int, Optional[str]] = dict.fromkeys(pids)
+    steps = []
+    if profile.priority:
+        steps.append(lambda: set_priority(pids, profile.priority))
+    if profile.affinity is not None:
+        steps.append(lambda: set_affinity(pids, profile.affinity))
+    if profile.io:
+        steps.append(lambda: set_io_priority(pids, profile.io))
+    for step in steps:
+        for pid, err in step().items():
+            if err and results[pid] is None:
+                results[pid] = err
+    return results
+
+
+class TuningRule(NamedTuple):
+    pattern: str
+    profile: str
+    mode: str = "exact"      # "exact", "prefix", "substring" o "regex" (sobre el nombre sin .exe)
+
+    def matches(self, name: str) -> bool:
+        n = stem(name)
+        if self.mode == "exact":
+            return n == stem(self.pattern)
+        if self.mode == "prefix":
+            return n.startswith(normalize(self.pattern))
+        if self.mode == "substring":
+            return normalize(self.pattern) in n
+        try:
+            return re.search(self.pattern, n, re.IGNORECASE) is not None
+        except re.error:
+            return False
+
+
+class ProfileManager:
+    """
+    Perfiles con nombre y reglas por nombre de proceso. apply_rules() aplica las
+    reglas a un snapshot completo; on_snapshot() (callback de ProcessSampler) aplica
+    solo a los procesos nuevos, así los que arrancan después reciben su perfil.
+    La primera regla que coincide gana.
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, Profile]] = None,
+                 rules: Optional[List[TuningRule]] = None, auto: bool = False):
+        self.profiles: Dict[str, Profile] = dict(DEFAULT_PROFILES if profiles is None else profiles)
+        self.rules: List[TuningRule] = list(rules or [])
+        self.auto = auto
+        self._seen: Optional[set] = None
+        self._lock = threading.Lock()
+
+    def add_rule(self, rule: TuningRule) -> None:
+        if rule.profile not in self.profiles:
+            raise ValueError(f"perfil desconocido: {rule.profile}")
+        with self._lock:
+            self.rules.append(rule)
+
+    def remove_rule(self, index: int) -> None:
+        with self._lock:
+            del self.rules[index]
+
+    def match(self, name: str) -> Optional[Profile]:
+        for rule in self.rules:
+            if rule.matches(name):
+                return self.profiles[rule.profile]
+        return None
+
+    def _apply_keys(self, snapshot: Dict[ProcKey, Dict[str, Any]], keys) -> Dict[int, Optional[str]]:
+        by_profile: Dict[str, List[int]] = {}
+        for k in keys:
+            profile = self.match(snapshot[k].get("name") or "")
+            if profile is not None:
+                by_profile.setdefault(profile.name, []).append(k[0])
+        results: Dict[int, Optional[str]] = {}
+        for name, pids in by_profile.items():
+            results.update(apply_profile(pids, self.profiles[name]))
+        return results
+
+    def apply_rules(self, snapshot: Dict[ProcKey, Dict[str, Any]]) -> Dict[int, Optional[str]]:
+        with self._lock:
+            self._seen = set(snapshot)
+            return self._apply_keys(snapshot, snapshot)
+
+    def apply_rule(self, rule: TuningRule, snapshot: Dict[ProcKey, Dict[str, Any]]) -> Dict[int, Optional[str]]:
+        """
+        Aplica una sola regla (recién agregada) a los procesos del snapshot para los
+        que es la primera que coincide; las demás reglas no se vuelven a aplicar.
+        """
+        with self._lock:
+            by_name: Dict[str, List[int]] = {}
+            for (pid, _), row in snapshot.items():
+                by_name.setdefault(row.get("name") or "", []).append(pid)
+            pids: List[int] = []
+            for name, group in by_name.items():
+                if rule.matches(name) and next(r for r in self.rules if r.matches(name)) is rule:
+                    pids.extend(group)
+            return apply_profile(pids, self.profiles[rule.profile]) if pids else {}
+
+    def on_snapshot(self, snapshot: Dict[ProcKey, Dict[str, Any]]) -> None:
+        with self._lock:
+            seen, self._seen = self._seen, set(snapshot)
+            if not self.auto or not self.rules or seen is None:
+                return
+            new = snapshot.keys() - seen
+            if new:
+                self._apply_keys(snapshot, new)
+
+
+_manager: Optional[ProfileManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_profile_manager() -> ProfileManager:
+    """Administrador compartido; recibe los snapshots del ProcessSampler compartido."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ProfileManager()
+            get_process_sampler().subscribe(_manager.on_snapshot)
+        return _manager
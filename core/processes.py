@@ -1,5 +1,7 @@
 import psutil
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+
+ProcKey = Tuple[int, float]
 
 def list_processes() -> List[Dict[str, Any]]:
     out = []
@@ -11,18 +13,150 @@ def list_processes() -> List[Dict[str, Any]]:
             continue
     return sorted(out, key=lambda p: p["pid"])
 
+def snapshot_processes(exe: bool = False) -> Dict[ProcKey, Dict[str, Any]]:
+    """
+    Snapshot de procesos indexado por (pid, create_time): la clave distingue un PID
+    reutilizado por un proceso nuevo. exe=True agrega la ruta del ejecutable ("" si
+    no hay permiso), lo justo para las búsquedas del índice de procesos.
+    """
+    attrs = ["pid", "name", "create_time", "ppid"] + (["exe"] if exe else [])
+    out: Dict[ProcKey, Dict[str, Any]] = {}
+    for proc in psutil.process_iter(attrs=attrs, ad_value=""):
+        try:
+            info = proc.info
+            key = (info["pid"], info.get("create_time") or 0.0)
+            row = {"pid": info["pid"], "name": info.get("name") or "",
+                   "create_time": info.get("create_time") or 0.0,
+                   "ppid": info.get("ppid") or 0}
+            if exe:
+                row["exe"] = info.get("exe") or ""
+            out[key] = row
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return out
+
+def diff_snapshots(old: Dict[ProcKey, Dict[str, Any]],
+                   new: Dict[ProcKey, Dict[str, Any]]) -> Tuple[List[ProcKey], List[ProcKey], List[ProcKey]]:
+    """Devuelve (agregados, eliminados, modificados) entre dos snapshots."""
+    added = [k for k in new if k not in old]
+    removed = [k for k in old if k not in new]
+    changed = [k for k, row in new.items() if k in old and old[k] != row]
+    return added, removed, changed
+
+ERR_GONE = "Proceso inexistente"
+ERR_DENIED = "Acceso denegado. Ejecutar como administrador"
+ERR_ALIVE = "El proceso no respondió"
+
 def kill_process(pid: int) -> Optional[str]:
+    return terminate_many([pid])[pid]
+
+def _collect(pids: Iterable[int], tree: bool, report) -> List[Any]:
+    """Objetos Process a señalizar; con tree=True agrega los descendientes (hojas primero)."""
+    procs: List[Any] = []
+    seen = set()
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            group = [proc]
+            if tree:
+                group = proc.children(recursive=True)
+                group.reverse()
+                group.append(proc)
+        except psutil.NoSuchProcess:
+            report(pid, ERR_GONE)
+            continue
+        except psutil.AccessDenied:
+            report(pid, ERR_DENIED)
+            continue
+        except Exception as e:
+            report(pid, f"Error: {e}")
+            continue
+        for p in group:
+            if p.pid not in seen:
+                seen.add(p.pid)
+                procs.append(p)
+    return procs
+
+def terminate_many(pids: Iterable[int], tree: bool = False, timeout: float = 3.0,
+                   kill_timeout: float = 1.0,
+                   callback: Optional[Callable[[int, Optional[str]], None]] = None
+                   ) -> Dict[int, Optional[str]]:
+    """
+    Termina muchos procesos a la vez: envía terminate a todos, espera en conjunto con
+    psutil.wait_procs y, vencido el plazo, mata a los que sigan vivos. El costo total
+    es un plazo de gracia, no uno por proceso.
+    Devuelve {pid: None si terminó, o mensaje de error}. 'callback(pid, error)' se
+    llama apenas se conoce el resultado de cada pid (desde el hilo que llama).
+    Con tree=True también se terminan los descendientes de cada pid.
+    """
+    results: Dict[int, Optional[str]] = {}
+
+    def report(pid: int, err: Optional[str]) -> None:
+        if pid in results:
+            return
+        results[pid] = err
+        if callback is not None:
+            try:
+                callback(pid, err)
+            except Exception:
+                pass
+
+    def gone(proc) -> None:
+        report(proc.pid, None)
+
+    pending = []
+    for proc in _collect(pids, tree, report):
+        try:
+            proc.terminate()
+            pending.append(proc)
+        except psutil.NoSuchProcess:
+            report(proc.pid, None)
+        except psutil.AccessDenied:
+            report(proc.pid, ERR_DENIED)
+        except Exception as e:
+            report(proc.pid, f"Error: {e}")
+    if not pending:
+        return results
     try:
-        proc = psutil.Process(pid)
-        proc.terminate()
+        _, alive = psutil.wait_procs(pending, timeout=timeout, callback=gone)
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                report(proc.pid, None)
+            except psutil.AccessDenied:
+                report(proc.pid, ERR_DENIED)
+        alive = [p for p in alive if p.pid not in results]
+        if alive:
+            _, alive = psutil.wait_procs(alive, timeout=kill_timeout, callback=gone)
+            for proc in alive:
+                report(proc.pid, ERR_ALIVE)
+    except Exception as e:
+        for proc in pending:
+            report(proc.pid, f"Error: {e}")
+    return results
+
+def terminate_tree(pid: int, include_parent: bool = True, timeout: float = 3.0) -> Optional[str]:
+    """
+    Termina un proceso y todos sus descendientes. La señal se envía a todo el árbol
+    de una vez (hojas primero, para que nada se re-emparente a mitad de camino);
+    ver terminate_many.
+    """
+    if include_parent:
+        results = terminate_many([pid], tree=True, timeout=timeout)
+    else:
         try:
-            proc.wait(timeout=3)
-        except psutil.TimeoutExpired:
-            proc.kill()
+            children = [p.pid for p in psutil.Process(pid).children()]
+        except psutil.NoSuchProcess:
+            return ERR_GONE
+        except psutil.AccessDenied:
+            return ERR_DENIED
+        results = terminate_many(children, tree=True, timeout=timeout)
+    if results.get(pid) == ERR_GONE:
+        return ERR_GONE
+    failed = [e for e in results.values() if e]
+    if not failed:
         return None
-    except psutil.NoSuchProcess:
-        return "Proceso inexistente"
-    except psutil.AccessDenied:
-        return "Acceso denegado. Ejecutar como administrador"
-    except Exception as e:
-        return f"Error: {e}"
+    if len(failed) == 1:
+        return failed[0]
+    return f"{len(failed)} procesos siguen activos" + (" (acceso denegado)" if ERR_DENIED in failed else "")
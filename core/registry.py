@@ -0,0 +1,81 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+HIVES = ("HKLM", "HKCU", "HKU")
+
+
+class RegistryBackend:
+    """
+    Acceso de solo lectura al registro, con las raíces nombradas por su abreviatura
+    ("HKLM", "HKCU", "HKU"). Todas las operaciones devuelven un valor vacío (o None)
+    si la clave no existe o no hay permiso, así quien las usa no necesita try/except.
+    """
+
+    def subkeys(self, hive: str, path: str) -> List[str]:
+        """Nombres de las subclaves directas."""
+        raise NotImplementedError
+
+    def last_write(self, hive: str, path: str) -> Optional[int]:
+        """Marca de última escritura de la clave (QueryInfoKey) o None si no existe."""
+        raise NotImplementedError
+
+    def values(self, hive: str, path: str, names: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        Lee los valores pedidos con una sola apertura de la clave; los que faltan no
+        aparecen en el resultado. None si la clave no existe.
+        """
+        raise NotImplementedError
+
+
+class WinregBackend(RegistryBackend):
+    """
+    Backend sobre el módulo winreg. 'module' permite pasar otro objeto con la misma
+    API (en los tests, el registro en memoria tests.fakes.FakeWinreg).
+    """
+
+    def __init__(self, module=None):
+        if module is None:
+            import winreg as module
+        self.winreg = module
+        self._roots = {
+            "HKLM": module.HKEY_LOCAL_MACHINE,
+            "HKCU": module.HKEY_CURRENT_USER,
+            "HKU": module.HKEY_USERS,
+        }
+
+    def _open(self, hive: str, path: str):
+        return self.winreg.OpenKey(self._roots[hive], path)
+
+    def subkeys(self, hive: str, path: str) -> List[str]:
+        out: List[str] = []
+        try:
+            with self._open(hive, path) as key:
+                i = 0
+                while True:
+                    try:
+                        out.append(self.winreg.EnumKey(key, i))
+                    except OSError:
+                        break
+                    i += 1
+        except Exception:
+            pass
+        return out
+
+    def last_write(self, hive: str, path: str) -> Optional[int]:
+        try:
+            with self._open(hive, path) as key:
+                return self.winreg.QueryInfoKey(key)[2]
+        except Exception:
+            return None
+
+    def values(self, hive: str, path: str, names: Iterable[str]) -> Optional[Dict[str, Any]]:
+        try:
+            with self._open(hive, path) as key:
+                out: Dict[str, Any] = {}
+                for name in names:
+                    try:
+                        out[name] = self.winreg.QueryValueEx(key, name)[0]
+                    except OSError:
+                        pass
+                return out
+        except Exception:
+            return None
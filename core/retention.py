@@ -0,0 +1,95 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+from core.ring_buffer import RingBuffer
+
+# (resolución en segundos, cantidad de buckets): 3 h a 10 s y 24 h a 1 min
+DEFAULT_TIERS: Tuple[Tuple[float, int], ...] = ((10.0, 1080), (60.0, 1440))
+
+STATS = ("min", "max", "avg")
+
+
+class RollupTier:
+    """
+    Nivel de retención tipo RRD: agrega muestras en buckets de 'resolution' segundos
+    guardando min/max/avg por métrica. Se actualiza de forma incremental (O(métricas)
+    por muestra) y solo escribe en el RingBuffer al cerrar cada bucket.
+    """
+
+    def __init__(self, metrics: Sequence[str], resolution: float, capacity: int):
+        self.metrics = tuple(metrics)
+        self.resolution = resolution
+        columns = ["time"] + [f"{m}_{s}" for m in self.metrics for s in STATS]
+        self.buffer = RingBuffer(columns, capacity, slack=max(16, capacity // 8))
+        self._bucket: Optional[float] = None
+        self._acc: Dict[str, List[float]] = {}
+
+    def add(self, t: float, values: Dict[str, float]) -> None:
+        bucket = math.floor(t / self.resolution) * self.resolution
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        for m in self.metrics:
+            v = values.get(m)
+            if v is None or v != v:  # ausente o NaN (hueco)
+                continue
+            acc = self._acc.get(m)
+            if acc is None:
+                self._acc[m] = [v, v, v, 1]
+            else:
+                if v < acc[0]:
+                    acc[0] = v
+                if v > acc[1]:
+                    acc[1] = v
+                acc[2] += v
+                acc[3] += 1
+
+    def flush(self) -> None:
+        """Cierra el bucket en curso (si tiene datos) y lo agrega al historial."""
+        if self._bucket is None or not self._acc:
+            self._acc = {}
+            return
+        row = {"time": self._bucket}
+        for m in self.metrics:
+            acc = self._acc.get(m)
+            if acc is None:
+                row[f"{m}_min"] = row[f"{m}_max"] = row[f"{m}_avg"] = float("nan")
+            else:
+                row[f"{m}_min"], row[f"{m}_max"] = acc[0], acc[1]
+                row[f"{m}_avg"] = acc[2] / acc[3]
+        self.buffer.append(**row)
+        self._acc = {}
+
+    def oldest(self) -> Optional[float]:
+        times = self.buffer.view("time")
+        return times[0] if len(times) else None
+
+    def query(self, metric: str, t0: float, t1: float, stat: str = "avg") -> Tuple[memoryview, memoryview]:
+        times = self.buffer.view("time")
+        values = self.buffer.view(f"{metric}_{stat}")
+        i = bisect_left(times, t0)
+        j = bisect_right(times, t1)
+        return times[i:j], values[i:j]
+
+
+class TieredHistory:
+    """
+    Conjunto de RollupTier de resolución creciente alimentados desde la misma muestra.
+    Memoria constante: cada nivel es un RingBuffer preasignado.
+    """
+
+    def __init__(self, metrics: Sequence[str], tiers: Sequence[Tuple[float, int]] = DEFAULT_TIERS):
+        self.metrics = tuple(metrics)
+        self.tiers = [RollupTier(self.metrics, res, cap) for res, cap in tiers]
+
+    def add(self, t: float, values: Dict[str, float]) -> None:
+        for tier in self.tiers:
+            tier.add(t, values)
+
+    def pick(self, t0: float) -> Optional[RollupTier]:
+        """El nivel más fino cuyo dato más antiguo cubre t0; si ninguno, el más grueso."""
+        for tier in self.tiers:
+            oldest = tier.oldest()
+            if oldest is not None and oldest <= t0:
+                return tier
+        return self.tiers[-1] if self.tiers else None
@@ -0,0 +1,115 @@
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class RingBuffer:
+    """
+    Buffer circular columnar preasignado (array.array de doubles, una columna por métrica).
+    Cada valor se escribe dos veces (posición j y j + R), así las últimas N muestras
+    siempre son contiguas y view() devuelve un memoryview de solo lectura sin copiar.
+    Con 'slack' filas extra, una vista ya entregada sigue siendo válida durante al menos
+    'slack' escrituras posteriores (permite leer desde otro hilo sin bloquear).
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int, slack: Optional[int] = None):
+        if capacity <= 0:
+            raise ValueError("capacity debe ser > 0")
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._size = capacity + (capacity if slack is None else max(1, slack))
+        self._data: Dict[str, array] = {
+            c: array("d", bytes(8 * 2 * self._size)) for c in self.columns
+        }
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Cantidad de filas escritas desde la creación."""
+        return self._count
+
+    def append(self, **values: float) -> None:
+        """Agrega una fila; las columnas omitidas quedan en 0.0."""
+        j = self._count % self._size
+        k = j + self._size
+        for c, buf in self._data.items():
+            v = float(values.get(c, 0.0))
+            buf[j] = v
+            buf[k] = v
+        self._count += 1
+
+    def _bounds(self, n: Optional[int] = None):
+        count = self._count         # una sola lectura: el hilo que escribe puede avanzarlo
+        length = min(count, self.capacity)
+        if n is not None:
+            length = min(length, max(0, n))
+        end = (count - 1) % self._size + self._size + 1 if count else self._size
+        return end - length, end
+
+    def view(self, column: str, n: Optional[int] = None) -> memoryview:
+        """Vista contigua de solo lectura de las últimas n filas (todas si n es None)."""
+        start, end = self._bounds(n)
+        return memoryview(self._data[column])[start:end].toreadonly()
+
+    def views(self, columns: Sequence[str], n: Optional[int] = None) -> Tuple[memoryview, ...]:
+        """Vistas de varias columnas sobre las mismas filas (mismo largo aunque se escriba en medio)."""
+        start, end = self._bounds(n)
+        return tuple(memoryview(self._data[c])[start:end].toreadonly() for c in columns)
+
+    def last(self, column: str, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        return self._data[column][(self._count - 1) % self._size]
+
+    def clear(self) -> None:
+        self._count = 0
+
+
+class MatrixRing:
+    """
+    Variante 2-D de RingBuffer (tiempo x dispositivo) para métricas por núcleo/disco/interfaz.
+    Usa la misma doble escritura: view() devuelve un memoryview de forma (n, width)
+    contiguo y de solo lectura, que numpy puede envolver sin copiar (np.asarray).
+    """
+
+    def __init__(self, capacity: int, width: int, slack: Optional[int] = None):
+        if capacity <= 0 or width <= 0:
+            raise ValueError("capacity y width deben ser > 0")
+        self.capacity = capacity
+        self.width = width
+        self._size = capacity + (capacity if slack is None else max(1, slack))
+        self._data = array("d", bytes(8 * 2 * self._size * width))
+        self._count = 0
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, row: Sequence[float]) -> None:
+        """Agrega una fila; se recorta o rellena con 0.0 hasta 'width'."""
+        w = self.width
+        row = list(row[:w]) + [0.0] * (w - len(row)) if len(row) != w else row
+        j = (self._count % self._size) * w
+        k = j + self._size * w
+        self._data[j:j + w] = array("d", row)
+        self._data[k:k + w] = self._data[j:j + w]
+        self._count += 1
+
+    def view(self, n: Optional[int] = None) -> memoryview:
+        length = len(self)
+        if n is not None:
+            length = min(length, max(0, n))
+        end = (self._count - 1) % self._size + self._size + 1 if self._count else self._size
+        w = self.width
+        flat = memoryview(self._data)[(end - length) * w:end * w].toreadonly()
+        if not length:
+            # memoryview no admite formas con ceros: vista vacía 1-D
+            return flat
+        return flat.cast("B").cast("d", [length, w])
+
+    def last(self) -> List[float]:
+        if not self._count:
+            return [0.0] * self.width
+        j = ((self._count - 1) % self._size) * self.width
+        return self._data[j:j + self.width].tolist()
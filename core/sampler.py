@@ -0,0 +1,262 @@
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from core.monitor import METRICS, Monitor
+from core.metrics_store import MetricsStore, default_store_dir
+
+Snapshot = Mapping[str, Any]
+
+
+class Sampler:
+    """
+    Servicio único de muestreo en segundo plano.
+    Un hilo propio llama a Monitor.sample() una vez por intervalo, de modo que cada
+    métrica de psutil se consulta una sola vez por tick sin importar cuántas vistas
+    estén abiertas. Publica snapshots inmutables (MappingProxyType) a los suscriptores.
+
+    El intervalo se adapta a la demanda: las vistas visibles piden un período con
+    set_demand() y lo liberan al ocultarse; sin demanda se usa 'background_interval'
+    (o se pausa). Con batería o con el equipo inactivo el período se alarga, y si
+    entre dos muestras pasa mucho más tiempo del previsto se marca un hueco (NaN).
+    """
+
+    IDLE_CPU = 5.0
+
+    def __init__(self, interval: float = 1.0, history_max: int = 180,
+                 store: Optional[MetricsStore] = None,
+                 background_interval: Optional[float] = None,
+                 pause_in_background: bool = False,
+                 max_interval: float = 30.0):
+        self.interval = interval
+        self.background_interval = interval if background_interval is None else background_interval
+        self.pause_in_background = pause_in_background
+        self.max_interval = max_interval
+        self.monitor = Monitor(history_max=history_max)
+        self.store = store
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Snapshot], None]] = []
+        self._snapshot: Snapshot = self._freeze(0, self.monitor.snapshot())
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._demands: Dict[str, float] = {}
+        self._on_battery = False
+        self._last_tick: Optional[float] = None
+        self._last_interval: Optional[float] = None
+
+    @staticmethod
+    def _freeze(seq: int, values: Dict[str, Any]) -> Snapshot:
+        data = dict(values)
+        data["seq"] = seq
+        data["time"] = time.time()
+        return MappingProxyType(data)
+
+    def subscribe(self, callback: Callable[[Snapshot], None]) -> None:
+        """Registra un callback. Se invoca desde el hilo de muestreo."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[Snapshot], None]) -> None:
+        with self._lock:
+            self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def latest(self) -> Snapshot:
+        """Último snapshot publicado (lectura sin bloqueo, el objeto es inmutable)."""
+        return self._snapshot
+
+    def history(self, metric: str) -> memoryview:
+        """
+        Vista de solo lectura del historial de una métrica ('time', 'cpu', 'ram', 'disk',
+        'net_sent', 'net_recv'). No copia: el RingBuffer reserva holgura para que la vista
+        siga siendo válida aunque el hilo de muestreo escriba mientras se lee.
+        """
+        return self.monitor.history.view(metric)
+
+    def history_pair(self, metric: str) -> Tuple[memoryview, memoryview]:
+        """
+        (tiempos, valores) de una métrica sobre las mismas filas: a diferencia de dos
+        llamadas a history(), tienen el mismo largo aunque el hilo de muestreo escriba
+        entre una lectura y otra.
+        """
+        return self.monitor.history.views(("time", metric))
+
+    def device_history(self, name: str) -> memoryview:
+        """Vista (tiempo x dispositivo) de 'cpu_core', 'disk_read', 'nic_recv', etc."""
+        return self.monitor.device_history(name)
+
+    def source(self, name: str):
+        """(último valor, antigüedad en s) de una fuente del Collector ('partitions', 'battery', ...)."""
+        return self.monitor.collector.get(name)
+
+    def query_last(self, metric: str, seconds: float):
+        """(tiempos, valores) de los últimos 'seconds' segundos usando el nivel de retención adecuado."""
+        return self.monitor.query_last(metric, seconds)
+
+    # ----------------------- planificación -----------------------
+
+    def set_demand(self, key: str, interval: float) -> None:
+        """Una vista visible pide muestras cada 'interval' segundos. Despierta al hilo."""
+        with self._lock:
+            self._demands[key] = interval
+        self._wake.set()
+
+    def release(self, key: str) -> None:
+        """La vista 'key' ya no necesita muestras (oculta o minimizada)."""
+        with self._lock:
+            self._demands.pop(key, None)
+
+    def _check_battery(self) -> None:
+        # La fuente "battery" del Collector se refresca cada pocos minutos
+        battery = self.monitor.collector.value("battery")
+        self._on_battery = bool(battery is not None and not battery["plugged"])
+
+    def _host_idle(self) -> bool:
+        cpu = self.monitor.history.view("cpu", 10)
+        if len(cpu) < 10:
+            return False
+        values = [v for v in cpu if v == v]
+        return bool(values) and sum(values) / len(values) < self.IDLE_CPU
+
+    def effective_interval(self) -> Optional[float]:
+        """Período actual en segundos, o None si el muestreo está en pausa."""
+        with self._lock:
+            demands = list(self._demands.values())
+        if demands:
+            interval = min(demands)
+        elif self.pause_in_background:
+            return None
+        else:
+            interval = self.background_interval
+            if self._host_idle():
+                interval *= 2
+        if self._on_battery:
+            interval *= 2
+        return min(interval, self.max_interval)
+
+    def tick(self) -> Snapshot:
+        """Toma una muestra y la publica. Se puede llamar a mano (tests) sin hilo."""
+        now = time.monotonic()
+        with self._lock:
+            last, expected = self._last_tick, self._last_interval
+            if last is not None and expected is not None and now - last > 2 * expected + 0.5:
+                # Hubo una pausa (ventana oculta, suspensión): cortar la serie
+                self.monitor.mark_gap(last + expected)
+            self._last_tick = now
+            self.monitor.sample()
+            self._check_battery()
+            snap = self._freeze(self._snapshot["seq"] + 1, self.monitor.snapshot())
+            self._snapshot = snap
+            subscribers = self._subscribers
+        if self.store is not None:
+            h = self.monitor.history
+            try:
+                self.store.append(snap["time"], {m: h.last(m) for m in METRICS})
+            except Exception:
+                pass
+        for callback in subscribers:
+            try:
+                callback(snap)
+            except Exception:
+                pass
+        return snap
+
+    def backfill(self, seconds: float = 24 * 3600) -> None:
+        """
+        Recupera el historial persistido de las últimas 'seconds' para que los gráficos
+        no arranquen vacíos. Debe correr antes del primer tick: start(backfill=...) la
+        ejecuta en el hilo de muestreo, fuera de la GUI. Lee del store en pasos
+        gruesos para el tramo viejo y a resolución completa para el historial de 1 s.
+        """
+        if self.store is None:
+            return
+        wall_now = time.time()
+        offset = wall_now - time.monotonic()
+        start = wall_now - seconds
+        raw_from = wall_now - self.monitor.history_max
+        tiers = self.monitor.rollups.tiers
+        if tiers:
+            fine = tiers[0]
+            fine_from = max(start, wall_now - fine.buffer.capacity * fine.resolution)
+            queries = ((start, fine_from, tiers[-1].resolution),
+                       (fine_from, raw_from, fine.resolution),
+                       (raw_from, wall_now, None))
+        else:
+            queries = ((raw_from, wall_now, None),)
+        with self._lock:
+            for t0, t1, step in queries:
+                if t1 <= t0:
+                    continue
+                # Intervalos semiabiertos salvo el último
+                end = t1 if step is None else t1 - 1e-6
+                times, columns = self.store.query_columns(METRICS, t0, end, step)
+                rows = ((t - offset, {m: columns[m][i] for m in METRICS}) for i, t in enumerate(times))
+                self.monitor.backfill(rows)
+
+    def _run(self, backfill: Optional[float] = None) -> None:
+        if backfill:
+            try:
+                self.backfill(backfill)
+            except Exception:
+                pass
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            self.tick()
+            interval = self.effective_interval()
+            self._last_interval = interval
+            if interval is None:
+                # En pausa hasta que alguna vista pida datos; al volver se marca el hueco
+                self._last_interval = 0.0
+                self._wake.wait()
+                self._wake.clear()
+                next_at = time.monotonic()
+                continue
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay < 0:
+                # Si nos atrasamos no se acumulan ticks pendientes
+                next_at = time.monotonic()
+                delay = 0
+            if self._wake.wait(delay):
+                # Una vista se hizo visible: muestrear ya
+                self._wake.clear()
+                next_at = time.monotonic()
+
+    def start(self, backfill: Optional[float] = None) -> None:
+        """Inicia el hilo de muestreo; con 'backfill' (segundos) antes recupera el historial."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(backfill,), name="hw-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+
+_sampler: Optional[Sampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> Sampler:
+    """Devuelve el Sampler compartido del proceso, iniciándolo la primera vez."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            try:
+                store = MetricsStore(default_store_dir(), METRICS)
+            except Exception:
+                store = None
+            # Sin vistas visibles se sigue muestreando lento para el historial persistido
+            _sampler = Sampler(store=store, background_interval=5.0)
+            # El historial persistido se lee en el hilo de muestreo, no en el que pide el sampler
+            _sampler.start(backfill=24 * 3600)
+        return _sampler
@@ -3,6 +3,9 @@ import psutil
 import subprocess
 import os
 from typing import Dict, Any, List, Optional
+from core.processes import terminate_many
+from core.process_index import fresh_process_index
+from core.app_inventory import AppEntry, get_app_inventory
 
 def get_system_info() -> Dict[str, Any]:
     uname = platform.uname()
@@ -18,84 +21,25 @@ def get_system_info() -> Dict[str, Any]:
     }
     return info
 
-def list_installed_apps() -> List[Dict[str, str]]:
+def installed_app_entries(deep: bool = False) -> List[AppEntry]:
     """
-    Intenta obtener aplicaciones instaladas leyendo claves de registro Uninstall (Windows).
+    Aplicaciones instaladas según las claves de registro Uninstall (Windows), como
+    registros AppEntry. Usa el inventario compartido: solo se releen las subclaves
+    nuevas o modificadas ('deep=True' re-enumera además todas las raíces).
     Si falla devuelve lista vacía.
     """
-    apps = []
-    if os.name != "nt":
-        return apps
+    if not _is_windows():
+        return []
     try:
-        import winreg
-        def _read_key(root, path):
-            try:
-                with winreg.OpenKey(root, path) as key:
-                    i = 0
-                    while True:
-                        try:
-                            subkey_name = winreg.EnumKey(key, i)
-                        except OSError:
-                            break
-                        subpath = path + "\\" + subkey_name
-                        try:
-                            with winreg.OpenKey(root, subpath) as sk:
-                                try:
-                                    display_name, _ = winreg.QueryValueEx(sk, "DisplayName")
-                                except OSError:
-                                    display_name = None
-                                try:
-                                    display_version, _ = winreg.QueryValueEx(sk, "DisplayVersion")
-                                except OSError:
-                                    display_version = None
-                                try:
-                                    install_location, _ = winreg.QueryValueEx(sk, "InstallLocation")
-                                except OSError:
-                                    install_location = None
-                                try:
-                                    display_icon, _ = winreg.QueryValueEx(sk, "DisplayIcon")
-                                except OSError:
-                                    display_icon = None
-                                try:
-                                    uninstall_string, _ = winreg.QueryValueEx(sk, "UninstallString")
-                                except OSError:
-                                    uninstall_string = None
-                                if display_name:
-                                    path_guess = ""
-                                    if display_icon and os.path.exists(display_icon.split(",")[0].strip('"')):
-                                        path_guess = display_icon.split(",")[0].strip('"')
-                                    elif install_location and os.path.isdir(install_location):
-                                        path_guess = install_location
-                                    apps.append({
-                                        "name": display_name,
-                                        "version": display_version or "",
-                                        "path": path_guess,
-                                        "uninstall": uninstall_string or "",
-                                    })
-                        except Exception:
-                            pass
-                        i += 1
-            except Exception:
-                pass
-
-        paths = [
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-            (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-        ]
-        for root, path in paths:
-            _read_key(root, path)
+        inventory = get_app_inventory()
+        inventory.refresh(deep=deep)
+        return inventory.apps()
     except Exception:
-        pass
+        return []
 
-    seen = set()
-    filtered = []
-    for a in apps:
-        key = (a.get("name", ""), a.get("version", ""))
-        if key not in seen:
-            seen.add(key)
-            filtered.append(a)
-    return filtered
+def list_installed_apps(deep: bool = False) -> List[Dict[str, str]]:
+    """Igual que installed_app_entries() pero como dicts name/version/path/uninstall."""
+    return [a.as_dict() for a in installed_app_entries(deep)]
 
 
 
@@ -105,7 +49,8 @@ def _is_windows() -> bool:
 def open_application(target: str) -> bool:
     """
     Abre una aplicación. Si 'target' es una ruta a un .exe la abre directamente.
-    Si es un nombre, intenta buscar en PATH o en Program Files.
+    Si es el nombre visible de una aplicación instalada usa su ejecutable; si no,
+    intenta buscar en PATH o en Program Files.
     """
     if not _is_windows():
         return False
@@ -115,10 +60,10 @@ def open_application(target: str) -> bool:
             os.startfile(target) 
             return True
 
-        if "|" in target:
-            maybe_path = target.split("|")[-1].strip()
-            if os.path.isfile(maybe_path):
-                os.startfile(maybe_path) 
+        # Nombre de una aplicación instalada: su ejecutable (DisplayIcon) o carpeta
+        for entry in _find_app(target):
+            if entry.path and os.path.exists(entry.path):
+                os.startfile(entry.path)
                 return True
 
         subprocess.Popen(["cmd", "/c", "start", "", target], shell=True)
@@ -126,102 +71,92 @@ def open_application(target: str) -> bool:
     except Exception:
         return False
 
+def _close_keys(index, keys) -> bool:
+    """Termina los árboles de nivel superior entre 'keys': un hijo que coincide ya cae en el de su padre."""
+    matches = {k[0]: index.rows[k].get("ppid") for k in keys if k in index.rows}
+    # Todos los árboles se señalizan juntos y comparten un único plazo de gracia
+    tops = [pid for pid, ppid in matches.items() if ppid not in matches]
+    results = terminate_many(tops, tree=True, timeout=2)
+    return any(results.get(pid, "") is None for pid in tops)
+
+def _entry_keys(index, entry: AppEntry):
+    """Procesos de una aplicación instalada: su ejecutable, o los que corren desde su carpeta."""
+    if entry.path.lower().endswith(".exe"):
+        return index.lookup(entry.path) or index.lookup(os.path.basename(entry.path))
+    folder = entry.install_location or entry.path
+    return index.lookup_under(folder) if folder else set()
+
 def close_application(name_or_exe: str) -> bool:
     """
-    Cierra una aplicación por nombre de proceso (sin ruta) o ejecutable.
-    1) Intenta con taskkill /IM.
-    2) Si falla, hace fallback buscando procesos con psutil por nombre y termina.
+    Cierra una aplicación por nombre de proceso (sin ruta), ejecutable, ruta completa
+    o nombre visible de una aplicación instalada, junto con todos sus procesos hijos
+    (equivalente a taskkill /T, sin lanzar un proceso externo). Los PIDs salen del
+    índice nombre -> procesos (búsqueda O(1)); solo se terminan los árboles de nivel
+    superior: un hijo que coincide con el nombre ya cae dentro del árbol de su padre.
     """
     if not _is_windows():
         return False
     try:
-        exe = name_or_exe.strip().lower()
-        if exe.endswith(".exe"):
-            image = exe
-        else:
-            image = exe + ".exe"
-
-        # Intento 1: taskkill por imagen
-        result = subprocess.run(["taskkill", "/IM", image, "/F", "/T"], capture_output=True, text=True)
-        if result.returncode == 0:
-            return True
+        index = fresh_process_index()
+        keys = index.lookup(name_or_exe)
+        if not keys:
+            # Nombre de una aplicación instalada: cerrar por su ejecutable
+            for entry in _find_app(name_or_exe):
+                keys = _entry_keys(index, entry)
+                if keys:
+                    break
+        return _close_keys(index, keys)
+    except Exception:
+        return False
 
-        # Intento 2: psutil – matar por coincidencia de nombre
-        killed_any = False
-        for proc in psutil.process_iter(attrs=["pid", "name"]):
-            try:
-                pname = (proc.info.get("name") or "").strip().lower()
-                if pname == image or pname == exe or pname.endswith("\\" + image):
-                    try:
-                        proc.terminate()
-                        try:
-                            proc.wait(timeout=2)
-                        except psutil.TimeoutExpired:
-                            proc.kill()
-                        killed_any = True
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return killed_any
+def close_entry(entry: AppEntry) -> bool:
+    """Cierra la aplicación de esa entrada del inventario por su ejecutable o carpeta."""
+    if not _is_windows():
+        return False
+    try:
+        index = fresh_process_index()
+        return _close_keys(index, _entry_keys(index, entry))
     except Exception:
         return False
 
+def _find_app(display_name: str) -> List[AppEntry]:
+    """
+    Entradas del inventario con ese nombre visible: refresco de las raíces, índice
+    O(1) y, para las encontradas, la versión actual de su subclave (un desinstalador
+    actualizado en el lugar no cambia la marca de la raíz).
+    """
+    inventory = get_app_inventory()
+    inventory.refresh(subkeys=False)
+    out = []
+    for entry in inventory.find(display_name):
+        entry = inventory.current(entry)
+        if entry is not None:
+            out.append(entry)
+    return out
+
 def uninstall_application(display_name: str) -> bool:
     """
     Intenta iniciar el desinstalador usando claves de registro Uninstall (Quiet/UninstallString).
+    La entrada se resuelve con el índice por nombre del inventario compartido.
     """
     if not _is_windows():
         return False
     try:
-        import winreg
-
-        def _iter_uninstall_entries():
-            paths = [
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-                (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-            ]
-            for root, path in paths:
-                try:
-                    with winreg.OpenKey(root, path) as key:
-                        i = 0
-                        while True:
-                            try:
-                                subkey_name = winreg.EnumKey(key, i)
-                            except OSError:
-                                break
-                            i += 1
-                            subpath = path + "\\" + subkey_name
-                            yield root, subpath
-                except Exception:
-                    continue
-
-        target_lower = display_name.strip().lower()
-        for root, subpath in _iter_uninstall_entries():
-            try:
-                with winreg.OpenKey(root, subpath) as sk:
-                    try:
-                        dname, _ = winreg.QueryValueEx(sk, "DisplayName")
-                    except OSError:
-                        continue
-                    if dname.strip().lower() != target_lower:
-                        continue
-                    uninstall_cmd = None
-                    for key_name in ("QuietUninstallString", "UninstallString"):
-                        try:
-                            uninstall_cmd, _ = winreg.QueryValueEx(sk, key_name)
-                            if uninstall_cmd:
-                                break
-                        except OSError:
-                            continue
-                    if not uninstall_cmd:
-                        continue
-
-                    subprocess.Popen(["cmd", "/c", uninstall_cmd], shell=True)
-                    return True
-            except Exception:
-                continue
+        return any(uninstall_entry(entry) for entry in _find_app(display_name))
+    except Exception:
+        return False
+
+def uninstall_entry(entry: AppEntry) -> bool:
+    """Inicia el desinstalador de esa entrada (QuietUninstallString o UninstallString)."""
+    if not _is_windows():
         return False
+    try:
+        # La entrada pudo leerse antes de una actualización que cambió el desinstalador
+        entry = get_app_inventory().current(entry)
+        uninstall_cmd = entry.uninstall_command if entry is not None else ""
+        if not uninstall_cmd:
+            return False
+        subprocess.Popen(["cmd", "/c", uninstall_cmd], shell=True)
+        return True
     except Exception:
         return False
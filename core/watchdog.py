@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import psutil
+from core.processes import ERR_DENIED, ERR_GONE, ProcKey, terminate_many
+from core.process_snapshot import get_process_sampler
+from core.process_tuning import TuningRule, set_priority
+
+logger = logging.getLogger("hardwindows.watchdog")
+
+ACTIONS = ("lower_priority", "suspend", "terminate")
+
+
+class WatchRule(NamedTuple):
+    name: str
+    pattern: str                # nombre de proceso; "*" = todos
+    metric: str                 # "rss" (bytes) o "cpu" (%)
+    threshold: float
+    duration: float = 0.0       # segundos sostenidos sobre el umbral
+    action: str = "lower_priority"
+    cooldown: float = 300.0     # entre acciones sobre el mismo proceso
+    mode: str = "exact"         # como TuningRule: "exact", "prefix", "substring" o "regex"
+    dry_run: bool = False
+
+    def matches(self, name: str) -> bool:
+        return self.pattern == "*" or TuningRule(self.pattern, "", self.mode).matches(name)
+
+
+class AuditEntry(NamedTuple):
+    time: float
+    rule: str
+    pid: int
+    create_time: float          # junto con pid identifica al proceso (el PID se reutiliza)
+    name: str
+    action: str
+    value: float
+    dry_run: bool
+    result: Optional[str]       # None = aplicado; mensaje de error si falló
+
+
+class _State:
+    """Estado por (regla, proceso): desde cuándo supera el umbral y cuándo se actuó."""
+    __slots__ = ("since", "last_action")
+
+    def __init__(self):
+        self.since: Optional[float] = None
+        self.last_action = -float("inf")
+
+
+class Watchdog:
+    """
+    Vigila procesos con reglas del tipo "si el nombre coincide y RSS > N durante T
+    segundos, bajar prioridad / suspender / terminar". Se evalúa en cada snapshot del
+    ProcessSampler: qué reglas aplican a cada proceso se calcula una sola vez (el
+    nombre no cambia) y luego cada tick es una comparación por par regla-proceso.
+    Las acciones se ejecutan en un hilo aparte para no frenar el muestreo, y todo
+    queda en el registro de auditoría (también en modo simulación).
+    """
+
+    def __init__(self, rules: Optional[List[WatchRule]] = None, dry_run: bool = False,
+                 audit_size: int = 1000, audit_path: Optional[str] = None):
+        for r in rules or []:
+            self._validate(r)
+        self.rules: List[WatchRule] = list(rules or [])
+        self.dry_run = dry_run
+        self.audit: deque = deque(maxlen=audit_size)
+        self.audit_path = audit_path
+        self._matches: Dict[ProcKey, Tuple[int, ...]] = {}
+        self._state: Dict[Tuple[int, ProcKey], _State] = {}
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hw-watchdog")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _validate(rule: WatchRule) -> None:
+        if rule.action not in ACTIONS:
+            raise ValueError(f"acción desconocida: {rule.action}")
+        if rule.metric not in ("rss", "cpu"):
+            raise ValueError(f"métrica desconocida: {rule.metric}")
+
+    def add_rule(self, rule: WatchRule) -> None:
+        self._validate(rule)
+        with self._lock:
+            self.rules.append(rule)
+            self._matches.clear()
+
+    def evaluate(self, snapshot: Dict[ProcKey, Dict[str, Any]], t: Optional[float] = None) -> List[AuditEntry]:
+        """Evalúa un tick; devuelve las acciones disparadas (callback de ProcessSampler)."""
+        if t is None:
+            t = time.monotonic()
+        fired: List[AuditEntry] = []
+        with self._lock:
+            if not self.rules:
+                return fired
+            rules = self.rules
+            matches = self._matches
+            state = self._state
+            for key, row in snapshot.items():
+                idx = matches.get(key)
+                if idx is None:
+                    name = row.get("name") or ""
+                    idx = matches[key] = tuple(i for i, r in enumerate(rules) if r.matches(name))
+                for i in idx:
+                    rule = rules[i]
+                    value = row.get(rule.metric)
+                    skey = (i, key)
+                    st = state.get(skey)
+                    if value is None or value < rule.threshold:
+                        if st is not None:
+                            st.since = None
+                        continue
+                    if st is None:
+                        st = state[skey] = _State()
+                    if st.since is None:
+                        st.since = t
+                    if t - st.since >= rule.duration and t - st.last_action >= rule.cooldown:
+                        st.last_action = t
+                        fired.append(self._fire(rule, key, row, float(value)))
+            # Los procesos que terminaron liberan su estado
+            if len(matches) > len(snapshot):
+                gone = matches.keys() - snapshot.keys()
+                for key in gone:
+                    for i in matches.pop(key):
+                        state.pop((i, key), None)
+        return fired
+
+    def _fire(self, rule: WatchRule, key: ProcKey, row: Dict[str, Any], value: float) -> AuditEntry:
+        dry = self.dry_run or rule.dry_run
+        entry = AuditEntry(time.time(), rule.name, key[0], key[1], row.get("name") or "", rule.action,
+                           value, dry, None)
+        if dry:
+            self._record(entry)
+        else:
+            self._pool.submit(self._act, entry)
+        return entry
+
+    def _act(self, entry: AuditEntry) -> None:
+        pid = entry.pid
+        try:
+            # La acción corre después del tick: si el PID ya es de otro proceso, no se toca
+            proc = psutil.Process(pid)
+            if proc.create_time() != entry.create_time:
+                result = ERR_GONE
+            elif entry.action == "lower_priority":
+                result = set_priority([pid], "idle")[pid]
+            elif entry.action == "suspend":
+                proc.suspend()
+                result = None
+            else:
+                result = terminate_many([pid])[pid]
+        except psutil.NoSuchProcess:
+            result = ERR_GONE
+        except psutil.AccessDenied:
+            result = ERR_DENIED
+        except Exception as e:
+            result = f"Error: {e}"
+        self._record(entry._replace(result=result))
+
+    def _record(self, entry: AuditEntry) -> None:
+        self.audit.append(entry)
+        logger.warning("[%s] %s %s (%s), valor %.1f%s%s", entry.rule, entry.action, entry.name,
+                       entry.pid, entry.value, " [simulación]" if entry.dry_run else "",
+                       f" -> {entry.result}" if entry.result else "")
+        if self.audit_path:
+            try:
+                with open(self.audit_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry._asdict(), ensure_ascii=False) + "\n")
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+
+def load_rules(path: str) -> List[WatchRule]:
+    """Lee reglas de un JSON: lista de objetos con los campos de WatchRule."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [WatchRule(**item) for item in json.load(f)]
+
+
+def default_config_dir() -> str:
+    """%LOCALAPPDATA%\\HardWindows o ~/.hardwindows."""
+    base = os.getenv("LOCALAPPDATA")
+    if base:
+        return os.path.join(base, "HardWindows")
+    return os.path.join(os.path.expanduser("~"), ".hardwindows")
+
+
+_watchdog: Optional[Watchdog] = None
+_watchdog_lock = threading.Lock()
+
+
+def get_watchdog() -> Watchdog:
+    """
+    Watchdog compartido, suscripto al ProcessSampler compartido. Carga las reglas de
+    watchdog.json en la carpeta de configuración si existe; la auditoría va a
+    watchdog-audit.jsonl en la misma carpeta.
+    """
+    global _watchdog
+    with _watchdog_lock:
+        if _watchdog is None:
+            base = default_config_dir()
+            rules: List[WatchRule] = []
+            path = os.path.join(base, "watchdog.json")
+            if os.path.exists(path):
+                try:
+                    rules = load_rules(path)
+                except Exception:
+                    logger.exception("No se pudieron leer las reglas de %s", path)
+            audit_path = os.path.join(base, "watchdog-audit.jsonl") if os.path.isdir(base) else None
+            _watchdog = Watchdog(rules, audit_path=audit_path)
+            get_process_sampler().subscribe(_watchdog.evaluate)
+        return _watchdog
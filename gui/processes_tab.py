@@ -1,6 +1,10 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from core.processes import list_processes, kill_process
+from core.processes import snapshot_processes, terminate_many
+from core.process_tree import ProcessTree
+from core.process_index import ProcessIndex
 
 class ProcessesTab(ttk.Frame):
     def __init__(self, parent):
@@ -11,33 +15,98 @@ class ProcessesTab(ttk.Frame):
 
         btn_refresh = ttk.Button(toolbar, text="Actualizar", command=self.load)
         btn_kill = ttk.Button(toolbar, text="Finalizar proceso", command=self.kill_selected)
+        btn_kill_tree = ttk.Button(toolbar, text="Finalizar árbol", command=self.kill_tree_selected)
         btn_refresh.pack(side="left", padx=5)
         btn_kill.pack(side="left", padx=5)
+        btn_kill_tree.pack(side="left", padx=5)
 
-        self.tree = ttk.Treeview(self, columns=("pid", "name"), show="headings", height=18)
+        # Filtro por nombre (contiene); con filtro activo se muestra la lista plana de coincidencias
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *a: self.render())
+        ttk.Entry(toolbar, textvariable=self.filter_var, width=30).pack(side="right", padx=5)
+        ttk.Label(toolbar, text="Filtrar:").pack(side="right")
+
+        # Árbol padre/hijos: la columna #0 muestra el nombre con su jerarquía
+        self.tree = ttk.Treeview(self, columns=("pid",), show="tree headings", height=18,
+                                 selectmode="extended")
+        self.tree.heading("#0", text="Nombre")
         self.tree.heading("pid", text="PID")
-        self.tree.heading("name", text="Nombre")
+        self.tree.column("#0", width=500, anchor="w")
         self.tree.column("pid", width=100, anchor="center")
-        self.tree.column("name", width=500, anchor="w")
         self.tree.pack(fill="both", expand=True, padx=10, pady=10)
 
+        self.proc_tree = ProcessTree()
+        self.proc_index = ProcessIndex()
+        self._results = queue.Queue()
+        self._busy = False
         self.load()
 
     def load(self):
+        snapshot = snapshot_processes()
+        self.proc_tree.apply(snapshot)
+        self.proc_index.apply(snapshot)
+        self.render()
+
+    def render(self):
+        opened = {iid for iid in self._all_items() if self.tree.item(iid, "open")}
         for row in self.tree.get_children():
             self.tree.delete(row)
-        for p in list_processes():
-            self.tree.insert("", "end", values=(p["pid"], p["name"]))
+        pattern = self.filter_var.get().strip()
+        if pattern:
+            for key in sorted(self.proc_index.filter(pattern)):
+                row = self.proc_tree.rows[key]
+                self.tree.insert("", "end", iid=f"{key[0]}-{key[1]}", text=row["name"], values=(row["pid"],))
+            return
+        stack = [("", k) for k in reversed(self.proc_tree.roots())]
+        while stack:
+            parent_iid, key = stack.pop()
+            row = self.proc_tree.rows[key]
+            iid = f"{key[0]}-{key[1]}"
+            self.tree.insert(parent_iid, "end", iid=iid, text=row["name"], values=(row["pid"],),
+                             open=iid in opened)
+            stack.extend((iid, c) for c in reversed(self.proc_tree.children(key)))
 
-    def kill_selected(self):
+    def _all_items(self, parent=""):
+        for iid in self.tree.get_children(parent):
+            yield iid
+            yield from self._all_items(iid)
+
+    def _selected_pids(self):
         sel = self.tree.selection()
         if not sel:
-            messagebox.showwarning("Aviso", "Seleccione un proceso")
+            messagebox.showwarning("Aviso", "Seleccione uno o más procesos")
+            return None
+        return [int(self.tree.item(iid, "values")[0]) for iid in sel]
+
+    def _terminate(self, tree):
+        pids = self._selected_pids()
+        if not pids or self._busy:
+            return
+        self._busy = True
+
+        # Tk no es seguro entre hilos: el resultado vuelve por una cola que se sondea con after()
+        def run():
+            self._results.put(terminate_many(pids, tree=tree))
+
+        threading.Thread(target=run, name="hw-terminate", daemon=True).start()
+        self.after(100, self._poll_results)
+
+    def _poll_results(self):
+        try:
+            results = self._results.get_nowait()
+        except queue.Empty:
+            self.after(100, self._poll_results)
             return
-        pid = int(self.tree.item(sel[0], "values")[0])
-        err = kill_process(pid)
-        if err:
-            messagebox.showerror("Error", err)
+        self._busy = False
+        failed = {pid: err for pid, err in results.items() if err}
+        if failed:
+            messagebox.showerror("Error", "\n".join(f"{pid}: {err}" for pid, err in sorted(failed.items())[:20]))
         else:
-            messagebox.showinfo("Listo", f"Proceso {pid} finalizado")
-            self.load()
+            messagebox.showinfo("Listo", f"{len(results)} procesos finalizados")
+        self.load()
+
+    def kill_selected(self):
+        self._terminate(tree=False)
+
+    def kill_tree_selected(self):
+        self._terminate(tree=True)
@@ -0,0 +1,60 @@
+"""
+Recolector sin interfaz gráfica (no importa PyQt5).
+Ejecuta el Sampler y publica las métricas en http://127.0.0.1:9108/metrics (OpenMetrics).
+"""
+import argparse
+import signal
+import threading
+from core.sampler import Sampler
+from core.metrics_store import MetricsStore, default_store_dir
+from core.monitor import METRICS
+from core.exporter import MetricsExporter
+from core.process_snapshot import get_process_sampler
+from core.watchdog import Watchdog, load_rules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HardWindows - recolector de métricas sin GUI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9108)
+    parser.add_argument("--interval", type=float, default=1.0, help="segundos entre muestras")
+    parser.add_argument("--disks", action="store_true", help="exponer E/S por disco")
+    parser.add_argument("--processes", action="store_true", help="exponer cantidad de procesos")
+    parser.add_argument("--no-store", action="store_true", help="no persistir el historial en disco")
+    parser.add_argument("--watchdog", metavar="REGLAS.json", help="vigilar procesos con estas reglas")
+    parser.add_argument("--watchdog-interval", type=float, default=5.0, help="segundos entre evaluaciones")
+    parser.add_argument("--dry-run", action="store_true", help="el watchdog solo registra, no actúa")
+    parser.add_argument("--audit", metavar="ARCHIVO.jsonl", help="registro de auditoría del watchdog")
+    args = parser.parse_args(argv)
+
+    store = None if args.no_store else MetricsStore(default_store_dir(), METRICS)
+    sampler = Sampler(interval=args.interval, store=store)
+    exporter = MetricsExporter(sampler, args.host, args.port, disks=args.disks, processes=args.processes)
+    exporter.start()
+    sampler.start()
+    print(f"Exponiendo métricas en http://{args.host}:{exporter.port}/metrics")
+
+    watchdog = None
+    if args.watchdog:
+        watchdog = Watchdog(load_rules(args.watchdog), dry_run=args.dry_run, audit_path=args.audit)
+        get_process_sampler().subscribe(watchdog.evaluate)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    if watchdog is not None:
+        while not stop.is_set():
+            get_process_sampler().snapshot()
+            stop.wait(args.watchdog_interval)
+        watchdog.close()
+    while not stop.is_set():
+        stop.wait(1.0)
+
+    sampler.stop()
+    exporter.stop()
+    if store is not None:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,10 @@ from PyQt5 import QtWidgets, QtGui
 from ui.main_window import MainWindow
 from core.permissions import is_admin
 from core.policies import reset_all_to_allowed
+from core.sampler import get_sampler
+from core.process_events import get_event_source
+from core.process_history import get_process_history
+from core.watchdog import get_watchdog
 
 def load_qss(path):
     try:
@@ -27,6 +31,11 @@ def main():
     except Exception:
         pass
 
+    app.aboutToQuit.connect(get_sampler().stop)
+    app.aboutToQuit.connect(get_event_source().stop)
+    app.aboutToQuit.connect(get_process_history().stop)
+    app.aboutToQuit.connect(get_watchdog().close)
+
     win = MainWindow()
     win.show()
     sys.exit(app.exec_())
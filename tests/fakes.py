@@ -0,0 +1,527 @@
+"""
+Backends deterministas en memoria para tests y benchmarks en Linux:
+FakePsutil (métricas y tabla de procesos), FakeWinreg (registro) y FakeSubprocess.
+patch_backends() los instala en los módulos de core y restaura todo al salir.
+"""
+import contextlib
+import sys
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+VirtualMemory = namedtuple("VirtualMemory", "total available percent used free")
+DiskUsage = namedtuple("DiskUsage", "total used free percent")
+NetIO = namedtuple("NetIO", "bytes_sent bytes_recv packets_sent packets_recv")
+DiskIO = namedtuple("DiskIO", "read_count write_count read_bytes write_bytes")
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+MemInfo = namedtuple("MemInfo", "rss vms")
+MemFullInfo = namedtuple("MemFullInfo", "rss vms uss")
+ProcIO = namedtuple("ProcIO", "read_count write_count read_bytes write_bytes")
+
+
+class NoSuchProcess(Exception):
+    def __init__(self, pid=None, name=None, msg=None):
+        super().__init__(msg or f"process {pid} not found")
+        self.pid = pid
+
+
+class AccessDenied(Exception):
+    def __init__(self, pid=None, name=None, msg=None):
+        super().__init__(msg or f"access denied ({pid})")
+        self.pid = pid
+
+
+class TimeoutExpired(Exception):
+    def __init__(self, seconds=None, pid=None, name=None):
+        super().__init__(f"timeout after {seconds} seconds")
+        self.pid = pid
+
+
+class FakeProcess:
+    def __init__(self, table: "FakePsutil", pid: int, name: str, ppid: int = 0,
+                 create_time: float = 1000.0, rss: int = 10 * 1024 * 1024):
+        self._table = table
+        self.pid = pid
+        self._name = name
+        self._ppid = ppid
+        self._create_time = create_time
+        self._rss = rss
+        self.info: Dict = {}
+        self.terminated = False
+        self.killed = False
+        self.stubborn = False   # ignora terminate(); solo kill() lo termina
+        self.protected = False  # nice/afinidad/ionice/suspend devuelven AccessDenied
+        self._nice = 0
+        self._affinity: List[int] = []
+        self._ionice = None
+        self.suspended = False
+
+    def _check(self):
+        if self.pid not in self._table.procs:
+            raise NoSuchProcess(self.pid)
+
+    def name(self):
+        self._check()
+        return self._name
+
+    def ppid(self):
+        self._check()
+        return self._ppid
+
+    def create_time(self):
+        self._check()
+        return self._create_time
+
+    def is_running(self):
+        return self.pid in self._table.procs
+
+    @contextlib.contextmanager
+    def oneshot(self):
+        yield
+
+    def exe(self):
+        self._check()
+        return "C:\\Program Files\\" + self._name
+
+    def username(self):
+        self._check()
+        return "usuario"
+
+    def status(self):
+        self._check()
+        return "running"
+
+    def cpu_percent(self, interval=None):
+        self._check()
+        return float(self.pid % 50)
+
+    def memory_info(self):
+        self._check()
+        return MemInfo(self._rss, 2 * self._rss)
+
+    def memory_full_info(self):
+        self._check()
+        return MemFullInfo(self._rss, 2 * self._rss, self._rss // 2)
+
+    def num_threads(self):
+        self._check()
+        return 4
+
+    def num_handles(self):
+        self._check()
+        return 100
+
+    def num_fds(self):
+        self._check()
+        return 10
+
+    def io_counters(self):
+        self._check()
+        return ProcIO(self.pid, self.pid, self.pid * 1024, self.pid * 512)
+
+    def terminate(self):
+        self._check()
+        self.terminated = True
+        if not self.stubborn:
+            self._table.procs.pop(self.pid, None)
+
+    def kill(self):
+        self._check()
+        self.killed = True
+        self._table.procs.pop(self.pid, None)
+
+    def wait(self, timeout=None):
+        if self.pid in self._table.procs:
+            raise TimeoutExpired(timeout, self.pid)
+        return 0
+
+    def _check_write(self):
+        self._check()
+        if self.protected:
+            raise AccessDenied(self.pid)
+
+    def nice(self, value=None):
+        if value is None:
+            self._check()
+            return self._nice
+        self._check_write()
+        self._nice = value
+
+    def cpu_affinity(self, cpus=None):
+        if cpus is None:
+            self._check()
+            return list(self._affinity or range(self._table.cpus))
+        self._check_write()
+        self._affinity = list(cpus)
+
+    def ionice(self, ioclass=None, value=None):
+        if ioclass is None:
+            self._check()
+            return self._ionice
+        self._check_write()
+        self._ionice = (ioclass, value)
+
+    def suspend(self):
+        self._check_write()
+        self.suspended = True
+
+    def resume(self):
+        self._check_write()
+        self.suspended = False
+
+    def children(self, recursive=False):
+        self._check()
+        out = []
+        stack = [self.pid]
+        while stack:
+            ppid = stack.pop()
+            for p in self._table.procs.values():
+                if p._ppid == ppid and p.pid != ppid:
+                    out.append(p)
+                    if recursive:
+                        stack.append(p.pid)
+        return out
+
+
+class FakePsutil:
+    """
+    Sustituto determinista del módulo psutil. Cada llamada a los contadores avanza
+    cantidades fijas, así las tasas calculadas son reproducibles.
+    """
+    NoSuchProcess = NoSuchProcess
+    AccessDenied = AccessDenied
+    TimeoutExpired = TimeoutExpired
+    IDLE_PRIORITY_CLASS, BELOW_NORMAL_PRIORITY_CLASS, NORMAL_PRIORITY_CLASS = 64, 16384, 32
+    ABOVE_NORMAL_PRIORITY_CLASS, HIGH_PRIORITY_CLASS, REALTIME_PRIORITY_CLASS = 32768, 128, 256
+    IOPRIO_VERYLOW, IOPRIO_LOW, IOPRIO_NORMAL, IOPRIO_HIGH = 0, 1, 2, 3
+    IOPRIO_CLASS_NONE, IOPRIO_CLASS_RT, IOPRIO_CLASS_BE, IOPRIO_CLASS_IDLE = 0, 1, 2, 3
+
+    def __init__(self, cpus: int = 8, disks: int = 2, nics: int = 2, processes: int = 0):
+        self.cpus = cpus
+        self.disk_names = [f"disk{i}" for i in range(disks)]
+        self.nic_names = [f"eth{i}" for i in range(nics)]
+        self.calls = 0
+        self.procs: Dict[int, FakeProcess] = {}
+        self._net = 0
+        self._disk = 0
+        for i in range(processes):
+            self.add_process(1000 + i, f"proc{i % 200}.exe", ppid=4 if i else 0)
+
+    # ----------------------- métricas -----------------------
+
+    def cpu_percent(self, interval=None, percpu=False):
+        self.calls += 1
+        if percpu:
+            return [float((i * 7 + self.calls) % 100) for i in range(self.cpus)]
+        return float(self.calls % 100)
+
+    def cpu_count(self, logical=True):
+        return self.cpus if logical else max(1, self.cpus // 2)
+
+    def virtual_memory(self):
+        return VirtualMemory(16 * 1024 ** 3, 8 * 1024 ** 3, 50.0, 8 * 1024 ** 3, 8 * 1024 ** 3)
+
+    def disk_usage(self, path):
+        return DiskUsage(500 * 1024 ** 3, 200 * 1024 ** 3, 300 * 1024 ** 3, 40.0)
+
+    def disk_partitions(self, all=False):
+        return [Partition("C:\\", "C:\\", "NTFS", "rw"), Partition("D:\\", "D:\\", "NTFS", "rw")]
+
+    def net_io_counters(self, pernic=False):
+        self._net += 1
+        n = self._net * 1024
+        if pernic:
+            return {name: NetIO(n, 2 * n, self._net, self._net) for name in self.nic_names}
+        return NetIO(n * len(self.nic_names), 2 * n * len(self.nic_names), self._net, self._net)
+
+    def disk_io_counters(self, perdisk=False):
+        self._disk += 1
+        d = self._disk
+        if perdisk:
+            return {name: DiskIO(d * 10, d * 5, d * 4096, d * 2048) for name in self.disk_names}
+        return DiskIO(d * 10, d * 5, d * 4096, d * 2048)
+
+    def sensors_battery(self):
+        return None
+
+    # ----------------------- procesos -----------------------
+
+    def add_process(self, pid: int, name: str, ppid: int = 0, create_time: float = 1000.0) -> FakeProcess:
+        proc = FakeProcess(self, pid, name, ppid, create_time + pid)
+        self.procs[pid] = proc
+        return proc
+
+    def pids(self) -> List[int]:
+        return sorted(self.procs)
+
+    def pid_exists(self, pid: int) -> bool:
+        return pid in self.procs
+
+    def Process(self, pid: int) -> FakeProcess:
+        proc = self.procs.get(pid)
+        if proc is None:
+            raise NoSuchProcess(pid)
+        return proc
+
+    def wait_procs(self, procs, timeout=None, callback=None):
+        gone, alive = [], []
+        for proc in procs:
+            if proc.pid in self.procs:
+                alive.append(proc)
+            else:
+                proc.returncode = 0
+                gone.append(proc)
+                if callback is not None:
+                    callback(proc)
+        return gone, alive
+
+    def process_iter(self, attrs=None, ad_value=None):
+        for proc in list(self.procs.values()):
+            if attrs:
+                info = {}
+                for a in attrs:
+                    if a == "pid":
+                        info[a] = proc.pid
+                    elif hasattr(proc, a) and callable(getattr(proc, a)):
+                        info[a] = getattr(proc, a)()
+                    else:
+                        info[a] = ad_value
+                proc.info = info
+            yield proc
+
+
+class _Key:
+    def __init__(self, path: str):
+        self.path = path
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+    def Close(self):
+        self.closed = True
+
+
+class FakeWinreg:
+    """
+    Registro en memoria con la API de winreg que usa core (OpenKey, EnumKey,
+    QueryValueEx, QueryInfoKey, CreateKeyEx, SetValueEx). Las rutas no distinguen
+    mayúsculas, igual que en Windows.
+    """
+    HKEY_LOCAL_MACHINE = 0x80000002
+    HKEY_CURRENT_USER = 0x80000001
+    HKEY_USERS = 0x80000003
+    KEY_READ = 0x20019
+    KEY_QUERY_VALUE = 0x0001
+    KEY_SET_VALUE = 0x0002
+    KEY_WOW64_64KEY = 0x0100
+    KEY_WOW64_32KEY = 0x0200
+    REG_SZ = 1
+    REG_EXPAND_SZ = 2
+    REG_DWORD = 4
+
+    def __init__(self):
+        # {ruta_normalizada: {"name": ruta, "values": {}, "subkeys": [], "mtime": int}}
+        self.keys: Dict[str, Dict] = {}
+        self.clock = 1
+        self.calls = 0
+
+    @staticmethod
+    def _norm(path: str) -> str:
+        return "\\".join(p for p in path.replace("\\\\", "\\").split("\\") if p).lower()
+
+    def _full(self, root, path: str) -> str:
+        if isinstance(root, _Key):
+            return root.path + "\\" + path if path else root.path
+        return f"{root:x}\\{path}" if path else f"{root:x}"
+
+    def _ensure(self, full: str) -> Dict:
+        norm = self._norm(full)
+        node = self.keys.get(norm)
+        if node is None:
+            node = {"name": full, "values": {}, "subkeys": [], "mtime": self.clock}
+            self.keys[norm] = node
+            parent, _, leaf = full.rstrip("\\").rpartition("\\")
+            if parent:
+                pnode = self._ensure(parent)
+                pnode["subkeys"].append(leaf)
+                pnode["mtime"] = self.clock
+        return node
+
+    def add_key(self, root, path: str, values: Optional[Dict] = None) -> None:
+        """Helper de tests: crea la clave con sus valores."""
+        self.clock += 1
+        node = self._ensure(self._full(root, path))
+        for name, value in (values or {}).items():
+            node["values"][name.lower()] = (value, self.REG_DWORD if isinstance(value, int) else self.REG_SZ)
+        node["mtime"] = self.clock
+
+    def delete_key(self, root, path: str) -> None:
+        full = self._full(root, path)
+        norm = self._norm(full)
+        self.keys.pop(norm, None)
+        parent, _, leaf = full.rstrip("\\").rpartition("\\")
+        pnode = self.keys.get(self._norm(parent))
+        if pnode:
+            self.clock += 1
+            pnode["subkeys"] = [k for k in pnode["subkeys"] if k.lower() != leaf.lower()]
+            pnode["mtime"] = self.clock
+
+    # ----------------------- API winreg -----------------------
+
+    def OpenKey(self, root, path, reserved=0, access=0):
+        self.calls += 1
+        full = self._full(root, path)
+        if self._norm(full) not in self.keys:
+            raise OSError(2, "El sistema no puede encontrar el archivo especificado")
+        return _Key(full)
+
+    OpenKeyEx = OpenKey
+
+    def CreateKeyEx(self, root, path, reserved=0, access=0):
+        self.calls += 1
+        self.add_key(root, path)
+        return _Key(self._full(root, path))
+
+    def CloseKey(self, key):
+        key.Close()
+
+    def EnumKey(self, key, index):
+        self.calls += 1
+        subkeys = self.keys[self._norm(key.path)]["subkeys"]
+        if index >= len(subkeys):
+            raise OSError(259, "No hay más datos disponibles")
+        return subkeys[index]
+
+    def QueryValueEx(self, key, name):
+        self.calls += 1
+        node = self.keys.get(self._norm(key.path))
+        if node is None or name.lower() not in node["values"]:
+            raise OSError(2, "El sistema no puede encontrar el archivo especificado")
+        return node["values"][name.lower()]
+
+    def QueryInfoKey(self, key):
+        self.calls += 1
+        node = self.keys[self._norm(key.path)]
+        return len(node["subkeys"]), len(node["values"]), node["mtime"]
+
+    def SetValueEx(self, key, name, reserved, type_, value):
+        self.calls += 1
+        self.clock += 1
+        node = self._ensure(key.path)
+        node["values"][name.lower()] = (value, type_)
+        node["mtime"] = self.clock
+
+
+UNINSTALL_PATHS = (
+    (FakeWinreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    (FakeWinreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    (FakeWinreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+)
+
+
+def make_uninstall_registry(per_hive: int = 1000) -> FakeWinreg:
+    """Registro con 'per_hive' aplicaciones en cada una de las tres raíces Uninstall."""
+    reg = FakeWinreg()
+    for h, (root, path) in enumerate(UNINSTALL_PATHS):
+        reg.add_key(root, path)
+        for i in range(per_hive):
+            reg.add_key(root, f"{path}\\App{h}_{i}", {
+                "DisplayName": f"Aplicación {h}-{i}",
+                "DisplayVersion": f"1.{i}",
+                "InstallLocation": f"C:\\Program Files\\App{h}_{i}",
+                "UninstallString": f"C:\\Program Files\\App{h}_{i}\\uninstall.exe",
+                "EstimatedSize": 1024 + i,
+            })
+    return reg
+
+
+class FakeSubprocess:
+    """Registra los comandos en lugar de ejecutarlos."""
+    DEVNULL = -3
+    PIPE = -1
+    CalledProcessError = __import__("subprocess").CalledProcessError
+
+    def __init__(self, outputs: Optional[Dict[str, str]] = None):
+        self.commands: List = []
+        self.outputs = outputs or {}
+
+    def _out(self, cmd) -> str:
+        key = cmd if isinstance(cmd, str) else " ".join(cmd)
+        for prefix, out in self.outputs.items():
+            if key.startswith(prefix):
+                return out
+        return ""
+
+    def check_output(self, cmd, **kw):
+        self.commands.append(cmd)
+        return self._out(cmd)
+
+    def check_call(self, cmd, **kw):
+        self.commands.append(cmd)
+        return 0
+
+    def run(self, cmd, **kw):
+        self.commands.append(cmd)
+        return __import__("subprocess").CompletedProcess(cmd, 0, self._out(cmd), "")
+
+    def Popen(self, cmd, **kw):
+        self.commands.append(cmd)
+        return None
+
+
+@contextlib.contextmanager
+def patch_backends(psutil=None, winreg=None, subprocess=None, windows: bool = False):
+    """
+    Instala los fakes en los módulos de core que los importan y restaura al salir.
+    'windows=True' fuerza las ramas Windows (_is_windows) para usar el registro falso.
+    """
+    import core.monitor
+    import core.processes
+    import core.process_snapshot
+    import core.process_index
+    import core.process_tuning
+    import core.watchdog
+    import core.app_inventory
+    import core.system_utils
+    import core.policies
+    import core.system_info
+    saved = []
+
+    def _set(obj, name, value):
+        saved.append((obj, name, getattr(obj, name)))
+        setattr(obj, name, value)
+
+    modules_with_psutil = (core.monitor, core.processes, core.process_snapshot,
+                           core.process_tuning, core.watchdog, core.system_utils, core.system_info)
+    if psutil is not None:
+        for mod in modules_with_psutil:
+            _set(mod, "psutil", psutil)
+        # Los singletons de procesos guardan objetos del backend anterior
+        _set(core.process_snapshot, "_process_sampler", None)
+        _set(core.process_index, "_process_index", None)
+    if subprocess is not None:
+        for mod in (core.system_utils, core.policies):
+            _set(mod, "subprocess", subprocess)
+    if windows:
+        _set(core.system_utils, "_is_windows", lambda: True)
+        _set(core.policies, "_is_windows", lambda: True)
+        _set(core.process_tuning, "_is_windows", lambda: True)
+    old_winreg = sys.modules.get("winreg")
+    if winreg is not None:
+        sys.modules["winreg"] = winreg
+        # El inventario compartido cachea lo leído del registro anterior
+        _set(core.app_inventory, "_inventory", None)
+    try:
+        yield
+    finally:
+        for obj, name, value in reversed(saved):
+            setattr(obj, name, value)
+        if winreg is not None:
+            if old_winreg is None:
+                sys.modules.pop("winreg", None)
+            else:
+                sys.modules["winreg"] = old_winreg
@@ -0,0 +1,35 @@
+from core.alerts import AlertEngine, RateOfChangeRule, RollingAverageRule, ThresholdRule
+
+def test_threshold_rule_sustained_with_hysteresis():
+    events = []
+    engine = AlertEngine([ThresholdRule("ram", "ram", 95.0, duration=10, clear=90.0)],
+                         sinks=[events.append])
+    for t in range(0, 10):
+        engine.evaluate({"ram": 96.0}, float(t))
+    assert events == []
+    engine.evaluate({"ram": 96.0}, 10.0)
+    assert [e.state for e in events] == ["firing"]
+    engine.evaluate({"ram": 92.0}, 11.0)
+    assert len(events) == 1
+    engine.evaluate({"ram": 89.0}, 12.0)
+    assert [e.state for e in events] == ["firing", "resolved"]
+
+def test_rule_cooldown_suppresses_repeats():
+    events = []
+    engine = AlertEngine([ThresholdRule("cpu", "cpu", 90.0, cooldown=60)], sinks=[events.append])
+    engine.evaluate({"cpu": 95.0}, 0.0)
+    engine.evaluate({"cpu": 10.0}, 1.0)
+    engine.evaluate({"cpu": 95.0}, 2.0)
+    assert [e.state for e in events] == ["firing", "resolved"]
+    engine.evaluate({"cpu": 10.0}, 70.0)
+    engine.evaluate({"cpu": 95.0}, 71.0)
+    assert events[-1].state == "firing"
+
+def test_rolling_average_and_rate_rules():
+    avg = RollingAverageRule("avg", "cpu", 50.0, window=10)
+    rate = RateOfChangeRule("rate", "ram", 1.0, window=10)
+    engine = AlertEngine([avg, rate])
+    for t in range(0, 12):
+        engine.evaluate({"cpu": 60.0, "ram": 10.0 + 2 * t}, float(t))
+    assert avg.active
+    assert rate.active
@@ -0,0 +1,96 @@
+from core.app_inventory import AppInventory
+from core.registry import WinregBackend
+from tests.fakes import UNINSTALL_PATHS, make_uninstall_registry
+
+def test_unchanged_refresh_only_queries_root_info():
+    reg = make_uninstall_registry(200)
+    inventory = AppInventory(WinregBackend(reg))
+    assert inventory.refresh()
+    assert len(inventory.apps()) == 600
+    reg.calls = 0
+    assert not inventory.refresh()
+    # Abrir + QueryInfoKey por raíz y por subclave, ninguna lectura de valores
+    assert reg.calls == 2 * (3 + 600)
+
+def test_refresh_reads_only_added_removed_and_modified_keys():
+    reg = make_uninstall_registry(50)
+    inventory = AppInventory(WinregBackend(reg))
+    inventory.refresh()
+    root, path = UNINSTALL_PATHS[2]
+    reg.add_key(root, path + "\\Nueva", {"DisplayName": "Nueva", "DisplayVersion": "2.0"})
+    reg.delete_key(root, path + "\\App2_0")
+    read = []
+    backend_values = inventory.backend.values
+    inventory.backend.values = lambda hive, key, names: read.append(key) or backend_values(hive, key, names)
+    assert inventory.refresh()
+    names = {a.name for a in inventory.apps()}
+    assert "Nueva" in names and "Aplicación 2-0" not in names
+    # Se re-enumera la raíz que cambió, pero solo se leen los valores de la subclave nueva
+    assert read == [path + "\\Nueva"]
+    # Un cambio de valores dentro de la subclave no cambia la marca de la raíz,
+    # pero sí la de la subclave: el refresh común lo detecta
+    reg.add_key(root, path + "\\App2_1", {"DisplayVersion": "9.9"})
+    assert inventory.refresh()
+    assert any(a.name == "Aplicación 2-1" and a.version == "9.9" for a in inventory.apps())
+    assert not inventory.refresh(deep=True)
+
+def test_find_by_display_name_prefers_quiet_uninstall():
+    reg = make_uninstall_registry(20)
+    root, path = UNINSTALL_PATHS[1]
+    reg.add_key(root, path + "\\Editor", {"DisplayName": " Editor | Pro ", "UninstallString": "u.exe",
+                                           "QuietUninstallString": "u.exe /S"})
+    inventory = AppInventory(WinregBackend(reg))
+    inventory.refresh()
+    (entry,) = inventory.find("editor | pro")
+    assert entry.uninstall_command == "u.exe /S"
+    assert len(inventory.find("Aplicación 0-3")) == 1
+    assert inventory.find("no existe") == []
+
+def test_uninstall_application_uses_index():
+    from core.system_utils import uninstall_application
+    from tests.fakes import FakeSubprocess, patch_backends
+    sub = FakeSubprocess()
+    with patch_backends(winreg=make_uninstall_registry(100), subprocess=sub, windows=True):
+        assert uninstall_application("APLICACIÓN 2-7")
+        assert not uninstall_application("otra")
+    assert sub.commands[-1][-1].endswith("App2_7\\uninstall.exe")
+
+def test_app_filter_narrows_incrementally():
+    from core.app_inventory import AppFilter
+    inventory = AppInventory(WinregBackend(make_uninstall_registry(100)))
+    inventory.refresh()
+    f = AppFilter(inventory.apps())
+    assert f.match("") is None
+    assert len(f.match("aplicación 1-")) == 100
+    assert len(f.match("aplicación 1-5")) == 11
+    assert len(f.match("aplicación 1-")) == 100     # al borrar se vuelve a buscar en todas
+    assert f.match("zzz") == set()
+
+def test_uninstall_entry_runs_the_selected_duplicate():
+    from core.system_utils import installed_app_entries, uninstall_entry
+    from tests.fakes import FakeSubprocess, patch_backends
+    reg = make_uninstall_registry(0)
+    for i, (root, path) in enumerate(UNINSTALL_PATHS[:2]):
+        reg.add_key(root, path + "\\Tool", {"DisplayName": "Tool", "DisplayVersion": f"{i}.0",
+                                             "UninstallString": f"u{i}.exe"})
+    sub = FakeSubprocess()
+    with patch_backends(winreg=reg, subprocess=sub, windows=True):
+        first, second = installed_app_entries()
+        assert uninstall_entry(second)
+    assert sub.commands[-1][-1] == "u1.exe"
+
+def test_uninstall_uses_the_command_after_an_in_place_update():
+    from core.system_utils import installed_app_entries, uninstall_application, uninstall_entry
+    from tests.fakes import FakeSubprocess, patch_backends
+    reg = make_uninstall_registry(10)
+    root, path = UNINSTALL_PATHS[0]
+    sub = FakeSubprocess()
+    with patch_backends(winreg=reg, subprocess=sub, windows=True):
+        entry = next(e for e in installed_app_entries() if e.name == "Aplicación 0-3")
+        # Una actualización reescribe el desinstalador sin tocar la marca de la raíz
+        reg.add_key(root, path + "\\App0_3", {"UninstallString": "nuevo.exe"})
+        assert uninstall_entry(entry)
+        assert sub.commands[-1][-1] == "nuevo.exe"
+        reg.add_key(root, path + "\\App0_4", {"UninstallString": "otro.exe"})
+        assert uninstall_application("Aplicación 0-4")
+        assert sub.commands[-1][-1] == "otro.exe"
@@ -0,0 +1,90 @@
+import os
+import pytest
+import core.cache_utils as cache_utils
+from core.cache_utils import clean_paths
+
+def _tree(root, dirs=4, files=5, loose=700):
+    for d in range(dirs):
+        sub = root / f"d{d}" / "a" / "b"
+        sub.mkdir(parents=True)
+        for i in range(files):
+            (sub / f"f{i}.tmp").write_bytes(b"x" * 10)
+    for i in range(loose):
+        (root / f"s{i}.tmp").write_bytes(b"y")
+
+@pytest.mark.parametrize("dir_fd", [True, False])
+def test_clean_paths_empties_roots_with_breakdown(tmp_path, monkeypatch, dir_fd):
+    monkeypatch.setattr(cache_utils, "_DIR_FD", dir_fd and cache_utils._DIR_FD)
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.mkdir()
+    b.mkdir()
+    _tree(a)
+    _tree(b, dirs=1, loose=3)
+    outside = tmp_path / "fuera"
+    outside.mkdir()
+    (outside / "keep.txt").write_bytes(b"z")
+    os.symlink(outside, a / "link")
+    results = clean_paths([str(a), str(b), str(tmp_path / "no-existe")], workers=3)
+    assert results[str(a)][1:] == (4 * 5 + 700 + 1, 4 * 5 * 10 + 700 + len(str(outside)), 0)
+    assert results[str(b)].deleted == 5 + 3
+    assert os.listdir(a) == [] and os.listdir(b) == []
+    # El enlace se borró sin tocar su destino
+    assert (outside / "keep.txt").exists()
+
+def test_scan_then_apply_deletes_only_previewed(tmp_path):
+    from core.cache_utils import CleanPlan, apply_plan, scan_paths
+    _tree(tmp_path, dirs=2, loose=10)
+    plan = CleanPlan([str(tmp_path)])
+    scans = list(scan_paths(plan.roots, plan))
+    assert plan.complete and len(scans) == 1 + 2 * 3
+    assert (plan.files, plan.size) == (2 * 5 + 10, 2 * 5 * 10 + 10)
+    # Lo creado después de la vista previa se conserva, aunque traiga un mtime viejo
+    # (copias y archivos extraídos de un comprimido)
+    late = tmp_path / "d0" / "a" / "nuevo.tmp"
+    late.write_bytes(b"n")
+    os.utime(late, (plan.started - 3600, plan.started - 3600))
+    (tmp_path / "d9").mkdir()
+    results = apply_plan(plan, workers=2)
+    assert results[str(tmp_path)][1:3] == (20, 110)
+    assert sorted(os.listdir(tmp_path)) == ["d0", "d9"]
+    assert late.exists()
+
+def test_scan_cancellation_stops_halfway_through_a_folder(tmp_path, monkeypatch):
+    import threading
+    from core.cache_utils import CANCEL_CHECK, CleanPlan, scan_paths
+    big = tmp_path / "grande"
+    big.mkdir()
+    for i in range(3000):
+        (big / f"f{i}.tmp").write_bytes(b"x")
+    cancel = threading.Event()
+    seen = [0]
+    entry_size = cache_utils._entry_size
+
+    def counting(entry):
+        # Se cancela a mitad del listado de la carpeta grande
+        seen[0] += 1
+        if seen[0] == 1000:
+            cancel.set()
+        return entry_size(entry)
+
+    monkeypatch.setattr(cache_utils, "_entry_size", counting)
+    plan = CleanPlan([str(tmp_path)])
+    scans = []
+    for scan in scan_paths(plan.roots, plan, cancel):
+        scans.append(scan.path)
+    assert scans == [str(tmp_path)]
+    assert seen[0] < 1000 + CANCEL_CHECK
+    assert not plan.complete
+
+def test_junctions_are_unlinked_without_following(tmp_path, monkeypatch):
+    # Sin Windows se simula el punto de unión: una carpeta con contenido que el
+    # limpiador solo puede intentar quitar con rmdir, nunca vaciar
+    monkeypatch.setattr(cache_utils, "_DIR_FD", False)
+    monkeypatch.setattr(cache_utils, "is_junction", lambda entry: entry.name == "union")
+    target = tmp_path / "temp" / "sub" / "union"
+    target.mkdir(parents=True)
+    (target / "ajeno.txt").write_bytes(b"z")
+    (tmp_path / "temp" / "a.tmp").write_bytes(b"y")
+    result = clean_paths([str(tmp_path / "temp")])[str(tmp_path / "temp")]
+    assert (target / "ajeno.txt").exists()
+    assert result.deleted == 1 and result.errors >= 1
@@ -0,0 +1,44 @@
+from core.collector import Collector, Source
+
+def test_collector_runs_only_due_sources():
+    calls = {"fast": 0, "slow": 0}
+
+    def fast():
+        calls["fast"] += 1
+        return calls["fast"]
+
+    def slow():
+        calls["slow"] += 1
+        return "x"
+
+    c = Collector([Source("fast", fast), Source("slow", slow, cost="medium")])
+    for t in range(0, 61):
+        c.collect(float(t))
+    assert calls["fast"] == 61
+    assert calls["slow"] == 3
+    value, age = c.get("fast")
+    assert value == 61
+    assert age is not None
+
+def test_collector_skips_failing_source():
+    def boom():
+        raise OSError("sin permiso")
+
+    c = Collector([Source("boom", boom)])
+    assert c.collect(0.0) == []
+    assert c.get("boom") == (None, None)
+
+def test_collector_invalidate_reads_on_next_collect():
+    calls = []
+    c = Collector([Source("parts", lambda: calls.append(1) or len(calls), cost="expensive")])
+    assert c.collect(0.0) == ["parts"]
+    assert c.collect(10.0) == []
+    c.invalidate("parts")
+    assert len(calls) == 1          # invalidate no lee en el hilo que llama
+    assert c.collect(11.0) == ["parts"]
+    assert c.value("parts") == 2 and c.collected_at("parts") == 11.0
+
+def test_collector_collect_limited_to_cost_classes():
+    c = Collector([Source("cpu", lambda: 1), Source("parts", lambda: 2, cost="expensive")])
+    assert c.collect(0.0, costs=("cheap",)) == ["cpu"]
+    assert c.collect(0.5) == ["cpu", "parts"]
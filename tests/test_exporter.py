@@ -0,0 +1,37 @@
+import urllib.request
+from core.sampler import Sampler
+from core.exporter import MetricsExporter, render_openmetrics
+
+def test_render_openmetrics_format():
+    snap = {"cpu": 1.5, "ram": 2.0, "disk": 3.0, "net_sent_kb": 0.0, "net_recv_kb": 0.0,
+            "cpu_cores": (1.0, 2.0), "seq": 7}
+    text = render_openmetrics(snap)
+    assert "hardwindows_cpu_percent 1.5" in text
+    assert 'hardwindows_cpu_core_percent{core="1"} 2.0' in text
+    assert "hardwindows_samples_total 7.0" in text
+    assert text.endswith("# EOF\n")
+
+def test_render_openmetrics_non_finite_values():
+    # Tras una pausa el Sampler marca el hueco con NaN
+    snap = {"cpu": float("nan"), "ram": float("inf"), "disk": float("-inf"), "net_sent_kb": 0.0,
+            "net_recv_kb": 0.0, "seq": 1}
+    text = render_openmetrics(snap)
+    assert "hardwindows_cpu_percent NaN\n" in text
+    assert "hardwindows_memory_percent +Inf\n" in text
+    assert "hardwindows_disk_usage_percent -Inf\n" in text
+    assert " nan" not in text and " inf" not in text
+
+def test_exporter_serves_cached_text():
+    sampler = Sampler(history_max=5)
+    exporter = MetricsExporter(sampler, port=0)
+    exporter.start()
+    try:
+        sampler.tick()
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            body = resp.read()
+            assert resp.headers["Content-Type"].startswith("application/openmetrics-text")
+        assert body == exporter.body
+        assert b"hardwindows_memory_percent" in body
+    finally:
+        exporter.stop()
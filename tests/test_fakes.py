@@ -0,0 +1,22 @@
+from tests.fakes import FakePsutil, make_uninstall_registry, patch_backends
+from benchmarks.runner import regressions
+
+def test_monitor_with_fake_psutil_is_deterministic():
+    from core.monitor import Monitor
+    with patch_backends(psutil=FakePsutil(cpus=4)):
+        m = Monitor(history_max=5)
+        m.sample()
+        assert m.devices["cpu_core"].width == 4
+        assert m.net_sent_hist[-1] > 0
+
+def test_list_installed_apps_with_fake_registry():
+    from core.system_utils import list_installed_apps
+    with patch_backends(winreg=make_uninstall_registry(10), windows=True):
+        apps = list_installed_apps()
+    assert len(apps) == 30
+    assert apps[0]["uninstall"].endswith("uninstall.exe")
+
+def test_regressions_against_baseline():
+    base = {"a": {"p50_ms": 1.0}}
+    assert regressions({"a": {"p50_ms": 1.2}}, base, 0.25) == []
+    assert len(regressions({"a": {"p50_ms": 1.3}}, base, 0.25)) == 1
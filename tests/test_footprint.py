@@ -0,0 +1,59 @@
+import os
+from core.footprint import FootprintAnalyzer, install_dir
+
+def _tree(root, dirs=3, files=4):
+    for d in range(dirs):
+        sub = root / f"d{d}" / "inner"
+        sub.mkdir(parents=True)
+        for i in range(files):
+            (sub / f"f{i}.bin").write_bytes(b"x" * 100)
+    (root / "app.exe").write_bytes(b"x" * 50)
+
+def test_measure_and_reuse_unchanged_directories(tmp_path):
+    _tree(tmp_path)
+    analyzer = FootprintAnalyzer(workers=2, io_limit=1)
+    fp = analyzer.analyze([str(tmp_path)])[str(tmp_path)]
+    assert (fp.size, fp.files, fp.dirs) == (3 * 4 * 100 + 50, 13, 7)
+    listed = analyzer.listed
+    (tmp_path / "d1" / "inner" / "nuevo.bin").write_bytes(b"y" * 10)
+    fp = analyzer.measure(str(tmp_path))
+    assert fp.size == 3 * 4 * 100 + 60
+    # Solo se volvió a listar la carpeta que cambió
+    assert analyzer.listed == listed + 1
+
+def test_cancel_and_install_dir(tmp_path):
+    _tree(tmp_path)
+    analyzer = FootprintAnalyzer()
+    seen = []
+    analyzer.analyze([str(tmp_path / "d0"), str(tmp_path / "d1")],
+                     progress=lambda done, total, fp: seen.append((done, total)))
+    assert sorted(seen) == [(1, 2), (2, 2)]
+    analyzer.cancel()
+    assert analyzer.measure(str(tmp_path)) is None
+    exe = str(tmp_path / "app.exe")
+    assert install_dir(exe) == str(tmp_path)
+    assert install_dir(exe, str(tmp_path / "d2")) == str(tmp_path / "d2")
+    assert install_dir(os.sep) == ""
+
+def test_cancel_before_analyze_is_kept_without_reset(tmp_path):
+    _tree(tmp_path)
+    analyzer = FootprintAnalyzer()
+    analyzer.cancel()
+    analyzer.reset()
+    analyzer.cancel()       # llega mientras arranca el hilo del análisis
+    assert analyzer.analyze([str(tmp_path)], reset=False) == {}
+    assert analyzer.analyze([str(tmp_path)])[str(tmp_path)].files > 0
+
+def test_junctions_are_counted_without_following(tmp_path, monkeypatch):
+    # Sin Windows se simula el punto de unión: una carpeta que el análisis no recorre
+    import core.footprint
+    monkeypatch.setattr(core.footprint, "is_junction", lambda entry: entry.name == "union")
+    _tree(tmp_path, dirs=1)
+    union = tmp_path / "d0" / "union"
+    union.mkdir()
+    (union / "ajeno.bin").write_bytes(b"z" * 1000)
+    analyzer = FootprintAnalyzer()
+    fp = analyzer.measure(str(tmp_path))
+    assert fp.size == 4 * 100 + 50
+    assert fp.files == 4 + 1 + 1 and fp.dirs == 3
+    assert str(union) not in analyzer._cache
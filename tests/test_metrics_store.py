@@ -0,0 +1,39 @@
+import os
+from core.metrics_store import MetricsStore
+
+def test_store_append_and_query(tmp_path):
+    store = MetricsStore(str(tmp_path), ("cpu", "ram"))
+    for i in range(100):
+        store.append(1000.0 + i, {"cpu": float(i), "ram": 50.0})
+    store.close()
+    times, values = store.query("cpu", 1010.0, 1019.0)
+    assert list(times) == [1000.0 + i for i in range(10, 20)]
+    assert list(values) == [float(i) for i in range(10, 20)]
+    times, values = store.query("cpu", 1000.0, 1099.0, step=10)
+    assert len(times) == 10
+    assert values[0] == 4.5
+
+def test_store_ignores_torn_last_record(tmp_path):
+    store = MetricsStore(str(tmp_path), ("cpu",))
+    for i in range(5):
+        store.append(float(i), {"cpu": 1.0})
+    store.close()
+    seg = os.path.join(str(tmp_path), os.listdir(str(tmp_path))[0])
+    with open(seg, "r+b") as f:
+        f.seek(-12, os.SEEK_END)
+        f.write(b"\xff\xff\xff\xff")
+    with open(seg, "ab") as f:
+        f.write(b"\x01\x02")
+    times, _ = store.query("cpu", 0.0, 10.0)
+    assert list(times) == [0.0, 1.0, 2.0, 3.0]
+
+def test_store_rotates_and_bounds_disk_usage(tmp_path):
+    store = MetricsStore(str(tmp_path), ("cpu",), max_segment_bytes=1024,
+                         max_total_bytes=4096)
+    for i in range(2000):
+        store.append(float(i), {"cpu": 1.0})
+    store.close()
+    assert len(os.listdir(str(tmp_path))) > 1
+    assert store.disk_usage() <= 4096 + 1024
+    times, _ = store.query("cpu", 0.0, 3000.0)
+    assert times[-1] == 1999.0
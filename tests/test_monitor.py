@@ -5,3 +5,39 @@ def test_monitor_sample():
     m.sample()
     assert len(m.cpu_hist) > 0
     assert len(m.ram_hist) > 0
+
+def test_monitor_history_is_timestamped_view():
+    m = Monitor(history_max=3)
+    for _ in range(5):
+        m.sample()
+    assert len(m.cpu_hist) == 3
+    assert len(m.times) == 3
+    assert m.times[0] <= m.times[-1]
+    assert m.net_sent_hist[-1] >= 0.0
+
+def test_monitor_query_falls_back_to_raw_history():
+    m = Monitor(history_max=10)
+    m.sample()
+    m.sample()
+    times, values = m.query_last("cpu", 60)
+    assert len(times) == len(values) == 2
+
+def test_monitor_device_matrices():
+    m = Monitor(history_max=5)
+    m.sample()
+    m.sample()
+    cores = m.device_history("cpu_core")
+    assert cores.shape == (2, m.devices["cpu_core"].width)
+    assert len(m.snapshot()["cpu_cores"]) == m.devices["cpu_core"].width
+
+def test_monitor_constructor_reads_only_cheap_sources():
+    from core.monitor import default_sources
+    calls = []
+    sources = default_sources()
+    for s in sources:
+        if s.cost != "cheap":
+            s.fn = (lambda name: lambda: calls.append(name) or 0.0)(s.name)
+    m = Monitor(history_max=10, sources=sources)
+    assert calls == []
+    m.sample()
+    assert sorted(calls) == ["battery", "disk", "partitions", "sensors"]
@@ -0,0 +1,118 @@
+import threading
+import time
+import struct
+import core.process_events
+from core.process_events import (ProcConnector, ProcessEventSource, PROC_EVENT_EXEC, PROC_EVENT_EXIT,
+                                 PROC_EVENT_FORK, _CN_MSG, _NLMSGHDR, _PROC_EVENT)
+
+def _row(pid, name, ppid=1):
+    return {"pid": pid, "name": name, "ppid": ppid}
+
+def test_feed_emits_start_and_exit_by_key():
+    src = ProcessEventSource(capacity=3)
+    got = []
+    src.subscribe(got.extend)
+    assert src.feed({(1, 1.0): _row(1, "a"), (2, 2.0): _row(2, "b")}, t=10.0) == []
+    # El PID 2 se reutiliza: cuenta como fin del viejo e inicio del nuevo
+    events = src.feed({(1, 1.0): _row(1, "a"), (2, 9.0): _row(2, "c")}, t=11.0)
+    kinds = sorted((e.kind, e.name) for e in events)
+    assert kinds == [("exit", "b"), ("start", "c")]
+    assert [e for e in events if e.kind == "exit"][0].lifetime == 9.0
+    assert got == events
+    src.feed({(1, 1.0): _row(1, "a")}, t=12.0)
+    src.feed({}, t=13.0)
+    assert len(src.events) == 3
+
+def _message(what, body):
+    payload = _PROC_EVENT.pack(what, 0, 5_000_000_000) + body
+    cn = _CN_MSG.pack(1, 1, 0, 0, len(payload), 0)
+    return _NLMSGHDR.pack(_NLMSGHDR.size + len(cn) + len(payload), 3, 0, 0, 0) + cn + payload
+
+def test_proc_connector_parses_fork_exec_and_exit(monkeypatch):
+    comm = {51: "padre", 52: "padre"}
+    monkeypatch.setattr(core.process_events, "_read_comm", lambda pid: comm.get(pid, ""))
+    conn = ProcConnector(lambda events: None)
+    conn.seed({(50, 1.0): _row(50, "padre")})
+    # El fork lo hace el hilo 60 del proceso 50: el padre es el tgid, no el hilo
+    events = conn.parse(_message(PROC_EVENT_FORK, struct.pack("=IIII", 60, 50, 51, 51))
+                        + _message(PROC_EVENT_FORK, struct.pack("=IIII", 51, 51, 53, 51)))   # hilo
+    assert events == []
+    comm[51] = "hijo"
+    data = (_message(PROC_EVENT_EXEC, struct.pack("=II", 51, 51))
+            + _message(PROC_EVENT_EXIT, struct.pack("=IIII", 50, 50, 0, 0)))
+    events = conn.parse(data)
+    assert [(e.kind, e.pid, e.name) for e in events] == [("start", 51, "hijo"), ("exit", 50, "padre")]
+    assert events[0].ppid == 50
+
+def test_proc_connector_reports_fork_without_exec(monkeypatch):
+    monkeypatch.setattr(core.process_events, "_read_comm", lambda pid: "worker")
+    conn = ProcConnector(lambda events: None)
+    assert conn.parse(_message(PROC_EVENT_FORK, struct.pack("=IIII", 50, 50, 52, 52))) == []
+    events = conn.flush(now=conn._pending[52] + conn.EXEC_WAIT)
+    assert [(e.kind, e.pid, e.name, e.ppid) for e in events] == [("start", 52, "worker", 50)]
+    assert conn.flush() == []
+
+class _Sampler:
+    """Sustituto del ProcessSampler: snapshot() publica 'rows' a los suscriptores."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.subscribers = []
+        self.snapshots = 0
+
+    def subscribe(self, cb):
+        self.subscribers.append(cb)
+
+    def unsubscribe(self, cb):
+        self.subscribers.remove(cb)
+
+    def snapshot(self):
+        self.snapshots += 1
+        for cb in list(self.subscribers):
+            cb(dict(self.rows))
+
+def test_source_feeds_only_from_shared_sampler():
+    base = {(1, 1.0): _row(1, "a")}
+    sampler = _Sampler(base)
+    polled = []
+    src = ProcessEventSource(interval=60, use_connector=False, sampler=sampler,
+                             snapshot_fn=lambda: polled.append(1) or {})
+    src.start()
+    try:
+        assert len(sampler.subscribers) == 1
+        sampler.subscribers[0](dict(base))
+        sampler.subscribers[0]({(1, 1.0): _row(1, "a"), (2, 2.0): _row(2, "b")})
+        assert [(e.kind, e.pid) for e in src.events] == [("start", 2)]
+    finally:
+        src.stop()
+    assert sampler.subscribers == []
+    # El sondeo de respaldo le pide el snapshot al sampler, nunca usa otro origen
+    assert polled == [] and sampler.snapshots <= 1
+
+def test_source_falls_back_to_polling_when_connector_dies():
+    class DeadConnector:
+        closed = False
+
+        def run_until(self, stop):
+            return lambda: None     # el hilo del socket terminó por un error
+
+        def close(self):
+            self.closed = True
+
+    sampler = _Sampler({(1, 1.0): _row(1, "a")})
+    src = ProcessEventSource(interval=60, use_connector=False, sampler=sampler)
+    connector = src.connector = DeadConnector()
+    src._thread = threading.Thread(target=src._run_connector, args=(connector,), daemon=True)
+    src._thread.start()
+    try:
+        for _ in range(200):
+            if sampler.snapshots:
+                break
+            time.sleep(0.01)
+        assert connector.closed and src.connector is None
+        assert sampler.snapshots == 1 and len(sampler.subscribers) == 1
+        sampler.rows[(2, 2.0)] = _row(2, "b")
+        sampler.snapshot()
+        assert [(e.kind, e.pid) for e in src.events] == [("start", 2)]
+    finally:
+        src.stop()
@@ -0,0 +1,45 @@
+from core.process_history import ProcessHistory
+
+def _snap(rows):
+    return {(pid, float(pid)): {"pid": pid, "name": f"p{pid}", "cpu": cpu, "rss": rss,
+                                "io_read": io, "io_write": 0}
+            for pid, (cpu, rss, io) in rows.items()}
+
+def test_history_window_and_top_include_exited():
+    h = ProcessHistory(capacity=4, period=1.0, top_n=2)
+    for t in range(4):
+        h.update(_snap({1: (10.0, 100, t * 1000), 2: (50.0, 50, 0), 3: (1.0, 10, 0)}), t=float(t))
+    assert h.history((1, 1.0)) == [10.0] * 4
+    assert h.history((1, 1.0), "io") == [0.0, 1000.0, 1000.0, 1000.0]
+    assert [o.key[0] for o in h.top("cpu")] == [2, 1]
+    # Ignora snapshots que llegan antes del período
+    assert h.update(_snap({1: (99.0, 1, 0)}), t=3.5) is False
+    # El 2 termina: su historia se libera, pero sigue en el ranking de la ventana
+    h.update(_snap({1: (10.0, 100, 0), 3: (1.0, 10, 0)}), t=4.0)
+    assert len(h) == 2 and h.history((2, 2.0)) == []
+    top = h.top("cpu")
+    assert top[0].key == (2, 2.0) and not top[0].alive
+    for t in range(5, 10):
+        h.update(_snap({1: (10.0, 100, 0)}), t=float(t))
+    assert [o.key[0] for o in h.top("cpu")] == [1]
+
+def test_history_memory_bounded_with_churn():
+    h = ProcessHistory(capacity=30, period=1.0, top_n=5, max_processes=1000)
+    for t in range(50):
+        base = t * 700
+        h.update(_snap({pid: (1.0, 1, 0) for pid in range(base, base + 1500)}), t=float(t))
+    assert len(h) == 1000
+    assert all(len(heap) <= 5 for heap in h._exited.values())
+
+def test_history_top_matches_full_ranking():
+    import random
+    rnd = random.Random(7)
+    h = ProcessHistory(capacity=5, period=1.0, top_n=3)
+    sums = {}
+    for t in range(12):
+        rows = {pid: (rnd.uniform(0, 100), rnd.randrange(1, 10**6), 0) for pid in range(1, 40)}
+        h.update(_snap(rows), t=float(t))
+        for pid, row in rows.items():
+            sums.setdefault(pid, []).append(row[0])
+    expected = sorted(range(1, 40), key=lambda pid: sum(sums[pid][-5:]), reverse=True)[:3]
+    assert [o.key[0] for o in h.top("cpu")] == expected
@@ -0,0 +1,50 @@
+from core.process_index import ProcessIndex
+
+def _snap(names):
+    return {(pid, float(pid)): {"pid": pid, "name": n, "exe": "C:\\Apps\\" + n}
+            for pid, n in names.items()}
+
+def test_index_lookup_is_case_and_extension_insensitive():
+    index = ProcessIndex()
+    index.apply(_snap({1: "Chrome.exe", 2: "chrome.exe", 3: "code.exe"}))
+    assert index.pids("CHROME") == {1, 2}
+    assert index.pids("chrome.exe") == {1, 2}
+    assert index.pids("c:\\apps\\code.exe") == {3}
+    index.apply(_snap({2: "chrome.exe", 3: "code.exe", 4: "cmd.exe"}))
+    assert index.pids("chrome") == {2}
+    assert "cmd" in index.names()
+
+def test_index_filter_modes():
+    index = ProcessIndex()
+    index.apply(_snap({1: "chrome.exe", 2: "code.exe", 3: "explorer.exe", 4: "cmd.exe"}))
+    pids = lambda keys: {k[0] for k in keys}
+    assert pids(index.filter("c", "prefix")) == {1, 2, 4}
+    assert pids(index.filter("OR", "substring")) == {3}
+    assert pids(index.filter(r"^c.d", "regex")) == {2, 4}
+    assert index.filter("(", "regex") == set()
+    assert len(index.filter("")) == 4
+
+def test_lookup_under_install_folder():
+    index = ProcessIndex()
+    index.apply(_snap({1: "a.exe", 2: "b.exe"}))
+    index.apply({**index.rows, (3, 3.0): {"pid": 3, "name": "x.exe", "exe": "C:\\Apps2\\x.exe"}})
+    assert {k[0] for k in index.lookup_under("C:\\Apps\\")} == {1, 2}
+
+def test_filter_matches_the_displayed_name_with_extension():
+    index = ProcessIndex()
+    index.apply(_snap({1: "Chrome.exe", 2: "chromedriver", 3: "code.exe"}))
+    pids = lambda keys: {k[0] for k in keys}
+    assert pids(index.filter("chrome.exe", "substring")) == {1}
+    assert pids(index.filter("chrome.e", "prefix")) == {1}
+    assert pids(index.filter(r"\.exe$", "regex")) == {1, 3}
+
+def test_apply_names_keeps_full_rows_of_running_processes():
+    index = ProcessIndex()
+    index.apply({k: {**row, "rss": 100} for k, row in _snap({1: "a.exe", 2: "b.exe"}).items()})
+    light = _snap({1: "a.exe", 3: "c.exe"})
+    light[(1, 1.0)]["exe"] = ""         # sin permiso para leer el ejecutable
+    index.apply_names(light)
+    assert set(index.rows) == {(1, 1.0), (3, 3.0)}
+    assert index.rows[(1, 1.0)]["rss"] == 100
+    assert index.pids("C:\\Apps\\a.exe") == {1}
+    assert index.pids("c") == {3}
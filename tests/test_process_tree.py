@@ -0,0 +1,45 @@
+from core.process_tree import ProcessTree
+from core.processes import terminate_tree
+from core.system_utils import close_application
+from tests.fakes import FakePsutil, patch_backends
+
+def _row(pid, ppid, cpu=1.0, rss=100):
+    return {"pid": pid, "ppid": ppid, "cpu": cpu, "rss": rss}
+
+def test_tree_links_children_and_aggregates_subtree():
+    tree = ProcessTree()
+    snap = {(1, 1.0): _row(1, 0), (2, 2.0): _row(2, 1), (3, 3.0): _row(3, 2), (4, 4.0): _row(4, 1)}
+    tree.apply(snap)
+    assert tree.roots() == [(1, 1.0)]
+    assert tree.children((1, 1.0)) == [(2, 2.0), (4, 4.0)]
+    assert list(tree.descendants((1, 1.0))) == [(2, 2.0), (3, 3.0), (4, 4.0)]
+    assert tree.aggregate((2, 2.0)) == {"cpu": 2.0, "rss": 200}
+    assert tree.aggregate((1, 1.0))["rss"] == 400
+
+def test_tree_incremental_orphans_and_pid_reuse():
+    tree = ProcessTree()
+    tree.apply({(1, 1.0): _row(1, 0), (2, 2.0): _row(2, 1), (3, 3.0): _row(3, 2)})
+    # Muere el 2: su hijo queda como raíz
+    tree.apply({(1, 1.0): _row(1, 0), (3, 3.0): _row(3, 2)})
+    assert (3, 3.0) in tree.roots()
+    # Un proceso nuevo reutiliza el PID 2: no adopta al 3 (es más nuevo que su "hijo")
+    tree.apply({(1, 1.0): _row(1, 0), (2, 9.0): _row(2, 1), (3, 3.0): _row(3, 2)})
+    assert tree.children((2, 9.0)) == []
+    # Re-emparentado al init
+    tree.apply({(1, 1.0): _row(1, 0), (2, 9.0): _row(2, 1), (3, 3.0): _row(3, 1)})
+    assert tree.parent((3, 3.0)) == (1, 1.0)
+
+def test_terminate_tree_and_close_application():
+    fake = FakePsutil(processes=0)
+    fake.add_process(10, "app.exe")
+    fake.add_process(11, "helper.exe", ppid=10)
+    fake.add_process(12, "app.exe", ppid=11)
+    fake.add_process(20, "otro.exe")
+    with patch_backends(psutil=fake, windows=True):
+        assert close_application("app") is True
+    assert sorted(fake.procs) == [20]
+    fake.add_process(30, "a.exe")
+    fake.add_process(31, "b.exe", ppid=30)
+    with patch_backends(psutil=fake):
+        assert terminate_tree(30, include_parent=False) is None
+    assert sorted(fake.procs) == [20, 30]
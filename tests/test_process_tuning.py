@@ -0,0 +1,47 @@
+from core.process_tuning import ProfileManager, TuningRule, apply_profile, Profile
+from tests.fakes import FakePsutil, patch_backends
+
+def _snap(fake):
+    return {(p.pid, p.create_time()): {"pid": p.pid, "name": p.name()} for p in fake.procs.values()}
+
+def test_apply_profile_reports_per_pid():
+    fake = FakePsutil(processes=0)
+    fake.add_process(10, "a.exe")
+    fake.add_process(11, "b.exe").protected = True
+    with patch_backends(psutil=fake, windows=True):
+        results = apply_profile([10, 11, 99], Profile("x", priority="idle", affinity=[0, 1], io="very_low"))
+    assert results[10] is None
+    assert "Acceso denegado" in results[11] and results[99] == "Proceso inexistente"
+    proc = fake.procs[10]
+    assert proc._nice == fake.IDLE_PRIORITY_CLASS and proc._affinity == [0, 1]
+    assert proc._ionice == (fake.IOPRIO_VERYLOW, None)
+
+def test_rules_reapply_to_new_processes():
+    fake = FakePsutil(processes=0)
+    fake.add_process(10, "Updater.exe")
+    fake.add_process(11, "game.exe")
+    with patch_backends(psutil=fake):
+        manager = ProfileManager(rules=[TuningRule("updater", "background")], auto=True)
+        manager.apply_rules(_snap(fake))
+        assert fake.procs[10]._nice == 10 and fake.procs[11]._nice == 0
+        fake.add_process(12, "updater.exe")
+        fake.procs[10]._nice = 0
+        manager.on_snapshot(_snap(fake))
+    # Solo el proceso nuevo recibe el perfil
+    assert fake.procs[12]._nice == 10 and fake.procs[10]._nice == 0
+    assert TuningRule("^up", "background", "regex").matches("UPDATER.EXE")
+
+def test_apply_rule_touches_only_processes_of_the_new_rule():
+    fake = FakePsutil(processes=0)
+    fake.add_process(10, "updater.exe")
+    fake.add_process(11, "game.exe")
+    fake.add_process(12, "gamebar.exe")
+    with patch_backends(psutil=fake):
+        manager = ProfileManager(rules=[TuningRule("updater", "background"),
+                                        TuningRule("gamebar", "background")])
+        rule = TuningRule("game", "background", "prefix")
+        manager.add_rule(rule)
+        results = manager.apply_rule(rule, _snap(fake))
+    # La regla anterior para updater no se reaplica; gamebar sigue con su primera regla
+    assert results == {11: None}
+    assert fake.procs[11]._nice == 10 and fake.procs[10]._nice == 0
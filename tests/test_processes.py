@@ -0,0 +1,51 @@
+from core.processes import ERR_GONE, diff_snapshots, snapshot_processes, terminate_many
+from tests.fakes import FakePsutil, patch_backends
+
+def test_diff_snapshots_by_pid_and_create_time():
+    old = {(1, 10.0): {"pid": 1, "name": "a"}, (2, 20.0): {"pid": 2, "name": "b"},
+           (3, 30.0): {"pid": 3, "name": "c"}}
+    new = {(1, 10.0): {"pid": 1, "name": "a"}, (2, 25.0): {"pid": 2, "name": "b2"},
+           (3, 30.0): {"pid": 3, "name": "c!"}}
+    added, removed, changed = diff_snapshots(old, new)
+    assert added == [(2, 25.0)]
+    assert removed == [(2, 20.0)]
+    assert changed == [(3, 30.0)]
+
+def test_snapshot_processes_with_fake_table():
+    fake = FakePsutil(processes=5)
+    with patch_backends(psutil=fake):
+        snap = snapshot_processes()
+    assert len(snap) == 5
+    assert all(k[0] == row["pid"] for k, row in snap.items())
+
+def test_process_sampler_rich_rows_and_eviction():
+    from core.process_snapshot import ProcessSampler
+    fake = FakePsutil(processes=300)
+    with patch_backends(psutil=fake):
+        sampler = ProcessSampler(workers=2, chunk=64, uss=True)
+        snap = sampler.snapshot()
+        assert len(snap) == 300
+        row = next(iter(snap.values()))
+        for field in ("cpu", "rss", "uss", "threads", "handles", "io_read", "io_write", "user"):
+            assert row[field] is not None
+        victim = next(iter(snap))[0]
+        del fake.procs[victim]
+        snap2 = sampler.snapshot()
+        assert len(snap2) == 299
+        assert victim not in sampler._cache
+        sampler.close()
+
+def test_terminate_many_escalates_and_reports_per_pid():
+    fake = FakePsutil(processes=0)
+    for pid in range(100, 150):
+        fake.add_process(pid, "w.exe")
+    stubborn = fake.procs[120]
+    stubborn.stubborn = True
+    seen = []
+    with patch_backends(psutil=fake):
+        results = terminate_many(list(range(100, 150)) + [999], timeout=0.1,
+                                 callback=lambda pid, err: seen.append(pid))
+    assert not fake.procs and stubborn.killed
+    assert results[999] == ERR_GONE
+    assert all(results[pid] is None for pid in range(100, 150))
+    assert sorted(seen) == sorted(results)
@@ -0,0 +1,19 @@
+from core.retention import RollupTier, TieredHistory
+
+def test_rollup_tier_min_max_avg():
+    tier = RollupTier(("cpu",), resolution=10.0, capacity=5)
+    for t, v in ((0, 10.0), (3, 30.0), (9, 20.0), (10, 50.0)):
+        tier.add(t, {"cpu": v})
+    times, avg = tier.query("cpu", 0, 100)
+    assert times.tolist() == [0.0]
+    assert avg.tolist() == [20.0]
+    _, mx = tier.query("cpu", 0, 100, stat="max")
+    assert mx.tolist() == [30.0]
+
+def test_tiered_history_bounded_and_picks_tier():
+    h = TieredHistory(("cpu",), tiers=((10.0, 6), (60.0, 10)))
+    for t in range(0, 600):
+        h.add(float(t), {"cpu": 1.0})
+    assert len(h.tiers[0].buffer) == 6
+    assert h.pick(550.0) is h.tiers[0]
+    assert h.pick(100.0) is h.tiers[1]
@@ -0,0 +1,31 @@
+from core.ring_buffer import RingBuffer
+
+def test_ring_buffer_keeps_last_values_contiguous():
+    rb = RingBuffer(("time", "cpu"), capacity=4)
+    for i in range(10):
+        rb.append(time=float(i), cpu=i * 10.0)
+    v = rb.view("cpu")
+    assert v.readonly
+    assert v.contiguous
+    assert v.tolist() == [60.0, 70.0, 80.0, 90.0]
+    assert rb.last("time") == 9.0
+    assert rb.view("cpu", 2).tolist() == [80.0, 90.0]
+
+def test_ring_buffer_view_survives_slack_writes():
+    rb = RingBuffer(("cpu",), capacity=3, slack=3)
+    for i in range(5):
+        rb.append(cpu=float(i))
+    v = rb.view("cpu")
+    for i in range(5, 8):
+        rb.append(cpu=float(i))
+    assert v.tolist() == [2.0, 3.0, 4.0]
+
+def test_ring_buffer_views_share_rows():
+    rb = RingBuffer(("time", "cpu"), capacity=4)
+    for i in range(3):
+        rb.append(time=float(i), cpu=float(i * 10))
+    times, cpu = rb.views(("time", "cpu"))
+    rb.append(time=3.0, cpu=30.0)
+    assert list(times) == [0.0, 1.0, 2.0] and list(cpu) == [0.0, 10.0, 20.0]
+    times, cpu = rb.views(("time", "cpu"), n=2)
+    assert list(times) == [2.0, 3.0] and list(cpu) == [20.0, 30.0]
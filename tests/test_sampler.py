@@ -0,0 +1,68 @@
+import threading
+from core.sampler import Sampler
+
+def test_sampler_tick_publishes_snapshot():
+    s = Sampler(history_max=10)
+    got = []
+    s.subscribe(got.append)
+    snap = s.tick()
+    s.tick()
+    assert len(got) == 2
+    assert got[-1]["seq"] == snap["seq"] + 1
+    assert s.latest() is got[-1]
+    assert len(s.history("cpu")) == 2
+
+def test_sampler_snapshot_is_immutable():
+    s = Sampler(history_max=10)
+    snap = s.tick()
+    try:
+        snap["cpu"] = 1.0
+        assert False, "snapshot debe ser de solo lectura"
+    except TypeError:
+        pass
+
+def test_sampler_thread_start_stop():
+    s = Sampler(interval=0.01, history_max=10)
+    s.start()
+    assert s.is_running()
+    s.stop()
+    assert not s.is_running()
+    assert s.latest()["seq"] >= 1
+
+def test_sampler_backfills_on_its_own_thread_before_first_tick():
+    calls = []
+
+    class Store:
+        def query_columns(self, metrics, t0, t1, step=None):
+            calls.append((threading.current_thread().name, s.latest()["seq"]))
+            return [], {m: [] for m in metrics}
+
+        def append(self, t, values):
+            pass
+
+    s = Sampler(interval=0.01, history_max=10, store=Store())
+    s.start(backfill=3600)
+    s.stop()
+    assert calls and all(c == ("hw-sampler", 0) for c in calls)
+
+def test_sampler_interval_follows_demand():
+    s = Sampler(interval=1.0, background_interval=5.0)
+    assert s.effective_interval() == 5.0
+    s.set_demand("home", 1.0)
+    s.set_demand("footer", 2.0)
+    assert s.effective_interval() == 1.0
+    s.release("home")
+    assert s.effective_interval() == 2.0
+    s.release("footer")
+    s.pause_in_background = True
+    assert s.effective_interval() is None
+
+def test_sampler_marks_gap_after_pause():
+    s = Sampler(history_max=10)
+    s.tick()
+    s._last_interval = 0.0
+    s._last_tick -= 5
+    s.tick()
+    cpu = s.history("cpu")
+    assert len(cpu) == 3
+    assert cpu[1] != cpu[1]
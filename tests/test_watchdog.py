@@ -0,0 +1,46 @@
+from core.processes import ERR_GONE
+from core.watchdog import Watchdog, WatchRule
+from tests.fakes import FakePsutil, patch_backends
+
+MB = 1024 * 1024
+
+def _snap(rows):
+    return {(pid, float(pid)): {"pid": pid, "name": name, "rss": rss, "cpu": 0.0}
+            for pid, (name, rss) in rows.items()}
+
+def test_watchdog_duration_cooldown_and_dry_run():
+    dog = Watchdog([WatchRule("fuga", "leaky", "rss", 500 * MB, duration=10, action="terminate",
+                              cooldown=60)], dry_run=True)
+    snap = _snap({1: ("leaky.exe", 600 * MB), 2: ("ok.exe", 900 * MB)})
+    assert dog.evaluate(snap, t=0.0) == []
+    assert dog.evaluate(snap, t=5.0) == []
+    fired = dog.evaluate(snap, t=10.0)
+    assert [(e.pid, e.dry_run) for e in fired] == [(1, True)]
+    assert dog.evaluate(snap, t=20.0) == []          # enfriamiento
+    # Baja del umbral: se reinicia la duración
+    dog.evaluate(_snap({1: ("leaky.exe", 100 * MB)}), t=70.0)
+    assert dog.evaluate(snap, t=75.0) == []
+    assert len(dog.audit) == 1
+    dog.evaluate({}, t=80.0)
+    assert not dog._state and not dog._matches
+
+def test_watchdog_acts_on_process():
+    fake = FakePsutil(processes=0)
+    fake.add_process(7, "spin.exe")
+    with patch_backends(psutil=fake):
+        dog = Watchdog([WatchRule("giro", "spin", "cpu", 90.0, action="suspend")])
+        dog.evaluate({(7, 1007.0): {"pid": 7, "name": "spin.exe", "cpu": 99.0}}, t=0.0)
+        dog._pool.shutdown(wait=True)
+    assert fake.procs[7].suspended
+    assert dog.audit[0].result is None and not dog.audit[0].dry_run
+
+def test_watchdog_skips_reused_pid():
+    fake = FakePsutil(processes=0)
+    fake.add_process(7, "other.exe", create_time=2000.0)   # el PID 7 ya es otro proceso
+    with patch_backends(psutil=fake):
+        dog = Watchdog([WatchRule("giro", "spin", "cpu", 90.0, action="terminate")])
+        dog.evaluate({(7, 1007.0): {"pid": 7, "name": "spin.exe", "cpu": 99.0}}, t=0.0)
+        dog._pool.shutdown(wait=True)
+    assert 7 in fake.procs
+    assert dog.audit[0].create_time == 1007.0
+    assert dog.audit[0].result == ERR_GONE
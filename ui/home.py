@@ -1,7 +1,8 @@
 from PyQt5 import QtWidgets, QtCore
 from widgets.resource_chart import ResourceChart
-from core.monitor import Monitor
-import psutil
+from widgets.core_heatmap import CoreHeatmap
+from widgets.sampler_bridge import get_bridge
+from core.process_history import get_process_history
 
 class HomePage(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -10,10 +11,20 @@ class HomePage(QtWidgets.QWidget):
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(20)
         
+        header_row = QtWidgets.QHBoxLayout()
         header = QtWidgets.QLabel("Monitoreo de recursos")
         header.setObjectName("titleLabel")
         header.setAlignment(QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
-        layout.addWidget(header)
+        header_row.addWidget(header)
+        header_row.addStretch(1)
+
+        # Rango de los graficos; los rangos largos salen de los rollups del Monitor
+        self.range_combo = QtWidgets.QComboBox()
+        for label, seconds in (("Últimos 3 min", 180), ("Última hora", 3600),
+                               ("Últimas 3 h", 3 * 3600), ("Últimas 24 h", 24 * 3600)):
+            self.range_combo.addItem(label, seconds)
+        header_row.addWidget(self.range_combo)
+        layout.addLayout(header_row)
 
         charts_container = QtWidgets.QWidget()
         charts_layout = QtWidgets.QHBoxLayout(charts_container)
@@ -38,6 +49,10 @@ class HomePage(QtWidgets.QWidget):
         
         layout.addWidget(charts_container, 1)
 
+        self.core_heatmap = CoreHeatmap(title="CPU por núcleo")
+        self.core_heatmap.setMinimumHeight(160)
+        layout.addWidget(self.core_heatmap, 0)
+
         report_container = QtWidgets.QWidget()
         report_layout = QtWidgets.QGridLayout(report_container)
         report_layout.setContentsMargins(10, 10, 10, 10)
@@ -47,6 +62,8 @@ class HomePage(QtWidgets.QWidget):
         self.ram_label = QtWidgets.QLabel("RAM: -- %")
         self.disk_label = QtWidgets.QLabel("Disco (root): -- %")
         self.usage_label = QtWidgets.QLabel("Uso disco actual: -- %")
+        self.io_label = QtWidgets.QLabel("E/S disco: -- KB/s")
+        self.top_label = QtWidgets.QLabel("Top procesos (5 min)\n--")
 
         style = """
             QLabel {
@@ -63,33 +80,72 @@ class HomePage(QtWidgets.QWidget):
         self.ram_label.setStyleSheet(style)
         self.disk_label.setStyleSheet(style)
         self.usage_label.setStyleSheet(style)
+        self.io_label.setStyleSheet(style)
+        self.top_label.setStyleSheet(style)
 
         report_layout.addWidget(self.cpu_label, 0, 0)
         report_layout.addWidget(self.ram_label, 0, 1)
         report_layout.addWidget(self.disk_label, 1, 0)
         report_layout.addWidget(self.usage_label, 1, 1)
+        report_layout.addWidget(self.io_label, 0, 2, 2, 1)
+        report_layout.addWidget(self.top_label, 0, 3, 2, 1)
 
         layout.addWidget(report_container, 0)
 
-        self.monitor = Monitor(history_max=180)
-        self.monitor.sample()
+        # El muestreo lo hace el Sampler compartido en su propio hilo
+        self.bridge = get_bridge()
+        self.sampler = self.bridge.sampler
+        self.bridge.updated.connect(self._on_sample)
+        # Procesos que más consumieron en los últimos 5 minutos (incluye los ya terminados)
+        self.process_history = get_process_history()
+        self._top_seq = -1
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(1000) 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Visible: muestreo a 1 s y repintado inmediato con lo acumulado
+        self.sampler.set_demand("home", 1.0)
+        self._on_sample(self.sampler.latest())
 
-    def _tick(self):
-        self.monitor.sample()
-        cpu = self.monitor.cpu_hist[-1]
-        ram = self.monitor.ram_hist[-1]
-        disk = self.monitor.disk_hist[-1]
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Otra pagina del stack o ventana minimizada: sin demanda ni repintado
+        self.sampler.release("home")
 
-        self.cpu_chart.update_data(list(self.monitor.cpu_hist))
-        self.ram_chart.update_data(list(self.monitor.ram_hist))
-        self.disk_chart.update_data(list(self.monitor.disk_hist))
+    def _on_sample(self, snap):
+        if not self.isVisible():
+            return
+        cpu = snap["cpu"]
+        ram = snap["ram"]
+        disk = snap["disk"]
+
+        seconds = self.range_combo.currentData()
+        for metric, chart in (("cpu", self.cpu_chart), ("ram", self.ram_chart), ("disk", self.disk_chart)):
+            if seconds <= self.sampler.monitor.history_max:
+                times, values = self.sampler.history_pair(metric)
+            else:
+                times, values = self.sampler.query_last(metric, seconds)
+            chart.update_data(values, times)
+        self.core_heatmap.update_data(self.sampler.device_history("cpu_core"))
 
-        du = psutil.disk_usage(".")
         self.cpu_label.setText(f"CPU: {cpu:.1f}%")
         self.ram_label.setText(f"RAM: {ram:.1f}%")
         self.disk_label.setText(f"Disco (root): {disk:.1f}%")
-        self.usage_label.setText(f"Uso disco actual: {du.percent:.1f}%")
+        age = snap.get("disk_age")
+        age_text = f" (hace {age:.0f} s)" if age is not None else ""
+        self.usage_label.setText(f"Uso disco actual: {disk:.1f}%{age_text}")
+        self.io_label.setText(
+            f"E/S disco\nLectura: {snap['disk_read_kb']:.0f} KB/s\nEscritura: {snap['disk_write_kb']:.0f} KB/s"
+        )
+        self._update_top()
+
+    def _update_top(self):
+        history = self.process_history
+        if history.seq == self._top_seq:
+            return
+        self._top_seq = history.seq
+        lines = ["Top procesos (5 min)"]
+        for o in history.top("cpu", 3):
+            lines.append(f"CPU {o.score:4.1f}%  {o.name}" + ("" if o.alive else " †"))
+        for o in history.top("rss", 2):
+            lines.append(f"RAM {o.score / (1024 * 1024):.0f} MB  {o.name}" + ("" if o.alive else " †"))
+        self.top_label.setText("\n".join(lines))
@@ -2,6 +2,7 @@ import os
 from PyQt5 import QtWidgets, QtGui, QtCore
 from widgets.navigation_bar import NavigationBar
 from widgets.footer import Footer
+from widgets.notifier import DesktopNotifier
 from ui.home import HomePage
 from ui.manager import ManagerPage
 from ui.register_editor import RegisterEditorPage
@@ -45,6 +46,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         layout.addLayout(vbox, 1)
 
+        self.notifier = DesktopNotifier(self.style().standardIcon(QtWidgets.QStyle.SP_ComputerIcon), self)
+
         self.nav.set_active("home")
         self.stack.setCurrentWidget(self.home)
 
@@ -57,4 +60,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self.stack.setCurrentWidget(self.register_editor)
         elif key == "policies":
             self.stack.setCurrentWidget(self.policies)
-        
\ No newline at end of file
+        
+    def closeEvent(self, event):
+        # Detener hilos de fondo antes de destruir los widgets
+        self.register_editor.proc_feed.stop()
+        super().closeEvent(event)
@@ -1,9 +1,12 @@
 from PyQt5 import QtWidgets, QtCore
 import os
-from core.system_utils import list_installed_apps, get_system_info, open_application, close_application, uninstall_application
-from core.cache_utils import clear_temp
+from core.system_utils import get_system_info, open_application, uninstall_entry
+from core.app_inventory import AppFilter
 from core.permissions import is_admin, get_current_user, lock_screen, logoff
-import psutil
+from widgets.sampler_bridge import get_bridge
+from widgets.apps_model import AppCloser, AppDetailsLoader, AppsLoader, AppTableModel, FootprintWorker
+from widgets.key_filter import KeySetFilterProxy
+from widgets.cleanup import CleanupWorker
 
 class ManagerPage(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -28,37 +31,85 @@ class ManagerPage(QtWidgets.QWidget):
         lbl_apps.setStyleSheet("font-weight: bold; font-size: 14px; color: #00c8ff;")
         apps_layout.addWidget(lbl_apps)
 
-        self.apps_list = QtWidgets.QListWidget()
-        self.apps_list.setStyleSheet("""
-            QListWidget {
+        self.apps_filter = QtWidgets.QLineEdit()
+        self.apps_filter.setPlaceholderText("Filtrar aplicaciones...")
+        self.apps_filter.setClearButtonEnabled(True)
+        self.apps_filter.textChanged.connect(self._on_apps_filter)
+        apps_layout.addWidget(self.apps_filter, 0)
+
+        self.apps_model = AppTableModel(self)
+        self.apps_proxy = KeySetFilterProxy(self)
+        self.apps_proxy.setSourceModel(self.apps_model)
+        self.apps_filter_index = AppFilter()
+
+        self.apps_view = QtWidgets.QTableView()
+        self.apps_view.setModel(self.apps_proxy)
+        self.apps_view.setSortingEnabled(True)
+        self.apps_view.sortByColumn(0, QtCore.Qt.AscendingOrder)
+        self.apps_view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.apps_view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.apps_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.apps_view.setWordWrap(False)
+        self.apps_view.verticalHeader().setVisible(False)
+        # Alto de fila fijo: la vista no mide cada fila al desplazarse
+        self.apps_view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.apps_view.verticalHeader().setDefaultSectionSize(24)
+        self.apps_view.horizontalHeader().setStretchLastSection(True)
+        self.apps_view.setColumnWidth(0, 320)
+        self.apps_view.setStyleSheet("""
+            QTableView {
                 background-color: #1a1a2e;
                 color: #ffffff;
                 border: 1px solid #2e2e3e;
                 border-radius: 6px;
                 padding: 6px;
             }
-            QListWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #00c8ff;
                 color: #000000;
             }
         """)
-        self.apps_list.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-        apps_layout.addWidget(self.apps_list, 1)
+        self.apps_view.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        apps_layout.addWidget(self.apps_view, 1)
+
+        self.apps_status = QtWidgets.QLabel("")
+        apps_layout.addWidget(self.apps_status, 0)
+
+        # Tamaños e íconos solo de las filas visibles, pedidos tras una pausa en el scroll
+        self.apps_details = AppDetailsLoader(self)
+        self.apps_details.loaded.connect(self.apps_model.set_details)
+        self._visible_timer = QtCore.QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(60)
+        self._visible_timer.timeout.connect(self._request_visible_details)
+        self.apps_view.verticalScrollBar().valueChanged.connect(self._visible_timer.start)
+        self.apps_proxy.layoutChanged.connect(self._visible_timer.start)
+        self.apps_proxy.modelReset.connect(self._visible_timer.start)
 
         btns_apps = QtWidgets.QHBoxLayout()
         self.btn_refresh = QtWidgets.QPushButton("Actualizar")
         self.btn_open = QtWidgets.QPushButton("Abrir")
         self.btn_close = QtWidgets.QPushButton("Cerrar")
         self.btn_uninstall = QtWidgets.QPushButton("Desinstalar")
-        for b in (self.btn_refresh, self.btn_open, self.btn_close, self.btn_uninstall):
+        self.btn_footprint = QtWidgets.QPushButton("Analizar espacio")
+        for b in (self.btn_refresh, self.btn_open, self.btn_close, self.btn_uninstall, self.btn_footprint):
             b.setStyleSheet("padding: 6px; font-weight: bold;")
             btns_apps.addWidget(b)
         apps_layout.addLayout(btns_apps, 0)
 
-        self.btn_refresh.clicked.connect(self.load_apps)
+        self.btn_refresh.clicked.connect(lambda: self.load_apps(deep=True))
         self.btn_open.clicked.connect(self.on_open_app)
         self.btn_close.clicked.connect(self.on_close_app)
         self.btn_uninstall.clicked.connect(self.on_uninstall_app)
+        self.btn_footprint.clicked.connect(self.on_footprint)
+
+        self.footprint = FootprintWorker(self)
+        self.footprint.result.connect(lambda ident, fp: self.apps_model.set_usage(ident, fp))
+        self.footprint.progress.connect(self._on_footprint_progress)
+        self.footprint.finished.connect(self._on_footprint_finished)
+        # Cerrar termina árboles de procesos con plazo de gracia: fuera del hilo de la GUI
+        self.closer = AppCloser(self)
+        self.closer.finished.connect(self._on_app_closed)
 
         main_splitter.addWidget(apps_panel)
 
@@ -89,10 +140,19 @@ class ManagerPage(QtWidgets.QWidget):
         self.storage_info.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         storage_layout.addWidget(self.storage_info, 1)
 
-        btn_clear_cache = QtWidgets.QPushButton("Borrar caché (temp)")
-        btn_clear_cache.setStyleSheet("padding: 8px; font-weight: bold;")
-        btn_clear_cache.clicked.connect(self.on_clear_cache)
-        storage_layout.addWidget(btn_clear_cache, 0)
+        self.cache_status = QtWidgets.QLabel("")
+        storage_layout.addWidget(self.cache_status, 0)
+
+        self.btn_clear_cache = QtWidgets.QPushButton("Borrar caché (temp)")
+        self.btn_clear_cache.setStyleSheet("padding: 8px; font-weight: bold;")
+        self.btn_clear_cache.clicked.connect(self.on_clear_cache)
+        storage_layout.addWidget(self.btn_clear_cache, 0)
+
+        # Vista previa y borrado en un hilo aparte; el mismo botón cancela
+        self.cleanup = CleanupWorker(self)
+        self.cleanup.progress.connect(self._on_cleanup_progress)
+        self.cleanup.scanned.connect(self._on_cleanup_scanned)
+        self.cleanup.applied.connect(self._on_cleanup_applied)
 
         security_card = QtWidgets.QFrame()
         security_card.setFrameShape(QtWidgets.QFrame.NoFrame)
@@ -140,36 +200,83 @@ class ManagerPage(QtWidgets.QWidget):
 
         main.addWidget(main_splitter)
 
+        # Particiones desde la fuente "partitions" del Sampler (se refresca cada pocos minutos)
+        self.bridge = get_bridge()
+        self._partitions_at = None
+        self.bridge.updated.connect(self._on_sample)
+
+        # El inventario se lee fuera del hilo de la GUI; la lista se llena al llegar
+        self.apps_loader = AppsLoader(self)
+        self.apps_loader.loaded.connect(self._on_apps_loaded)
+        self._cleanup_phase = ""
+
         self.load_system()
         self.load_apps()
 
-    def load_apps(self):
-        self.apps_list.clear()
-        apps = list_installed_apps()
+    def load_apps(self, deep=False):
+        if self.apps_loader.load(deep=deep):
+            self.btn_refresh.setEnabled(False)
+            self.apps_status.setText("Cargando aplicaciones instaladas...")
+
+    def _on_apps_loaded(self, apps):
+        self.btn_refresh.setEnabled(True)
+        self.apps_model.set_apps(apps)
+        self.apps_filter_index.set_entries(apps)
+        self._on_apps_filter(self.apps_filter.text())
         if not apps:
-            self.apps_list.addItem("No se encontraron aplicaciones instaladas (o falta permiso).")
+            self.apps_status.setText("No se encontraron aplicaciones instaladas (o falta permiso).")
+
+    def _on_apps_filter(self, text):
+        self.apps_proxy.set_allowed(self.apps_filter_index.match(text))
+        shown, total = self.apps_proxy.rowCount(), self.apps_model.rowCount()
+        self.apps_status.setText(f"{shown} de {total} aplicaciones" if text else f"{total} aplicaciones")
+        self._visible_timer.start()
+
+    def _request_visible_details(self):
+        view = self.apps_view
+        first = view.rowAt(0)
+        if first < 0:
+            return
+        last = view.rowAt(view.viewport().height() - 1)
+        if last < 0:
+            last = self.apps_proxy.rowCount() - 1
+        entries = []
+        for row in range(first, last + 1):
+            source = self.apps_proxy.mapToSource(self.apps_proxy.index(row, 0))
+            entry = self.apps_model.entry_at(source.row())
+            if self.apps_model.needs_details(entry):
+                entries.append(entry)
+        self.apps_details.request(entries)
+
+    def _selected_app(self):
+        rows = self.apps_view.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.apps_model.entry_at(self.apps_proxy.mapToSource(rows[0]).row())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._visible_timer.start()
+
+    def _on_sample(self, snap):
+        if not self.isVisible():
             return
-        for a in apps:
-            name = a.get("name", "Sin nombre")
-            version = a.get("version", "")
-            path = a.get("path", "")
-            self.apps_list.addItem(f"{name} | {version} | {path}")
+        collector = self.bridge.sampler.monitor.collector
+        if collector.collected_at("partitions") != self._partitions_at:
+            self.load_system()
 
     def load_system(self):
         info = get_system_info()
         text = ""
         for k, v in info.items():
             text += f"{k}: {v}\n"
-        try:
-            parts = psutil.disk_partitions()
-            for p in parts:
-                try:
-                    u = psutil.disk_usage(p.mountpoint)
-                    text += f"Partición {p.device} ({p.mountpoint}): {u.percent}%\n"
-                except Exception:
-                    continue
-        except Exception:
-            pass
+        collector = self.bridge.sampler.monitor.collector
+        self._partitions_at = collector.collected_at("partitions")
+        parts, age = collector.get("partitions")
+        for p in parts or []:
+            text += f"Partición {p['device']} ({p['mountpoint']}): {p['percent']}%\n"
+        if age is not None:
+            text += f"(actualizado hace {age:.0f} s)\n"
         self.storage_info.setPlainText(text)
 
         user = get_current_user()
@@ -177,55 +284,101 @@ class ManagerPage(QtWidgets.QWidget):
         self.security_info.setText(f"Usuario actual: {user}\nPermisos de administrador: {admin}")
 
     def on_clear_cache(self):
+        if self.cleanup.busy():
+            self.cleanup.cancel()
+            return
         if not is_admin():
             QtWidgets.QMessageBox.warning(self, "Permisos insuficientes", "Se requieren permisos de administrador...")
             return
-        deleted, freed = clear_temp()
-        msg = f"Archivos eliminados: {deleted}\nEspacio liberado: {freed / (1024**2):.2f} MB"
+        if self.cleanup.scan():
+            self._cleanup_phase = "Analizando"
+            self.btn_clear_cache.setText("Cancelar")
+
+    def _on_cleanup_progress(self, files, size, path):
+        text = f"{self._cleanup_phase}: {files} archivos, {size / (1024**2):.2f} MB"
+        if path:
+            text += f"\n{path}"
+        self.cache_status.setText(text)
+
+    def _on_cleanup_scanned(self, plan, cancelled):
+        self.btn_clear_cache.setText("Borrar caché (temp)")
+        if cancelled:
+            self.cache_status.setText("Análisis cancelado")
+            return
+        msg = f"Se eliminarán {plan.files} archivos ({plan.size / (1024**2):.2f} MB):\n"
+        for root, (files, size) in plan.totals.items():
+            msg += f"\n{root}: {files} archivos, {size / (1024**2):.2f} MB"
+        confirm = QtWidgets.QMessageBox.question(self, "Confirmar limpieza", msg)
+        if confirm != QtWidgets.QMessageBox.Yes:
+            self.cache_status.setText("")
+            return
+        if self.cleanup.apply(plan):
+            self._cleanup_phase = "Eliminando"
+            self.btn_clear_cache.setText("Cancelar")
+
+    def _on_cleanup_applied(self, results, cancelled):
+        self.btn_clear_cache.setText("Borrar caché (temp)")
+        self.cache_status.setText("Limpieza cancelada" if cancelled else "")
+        deleted = sum(r.deleted for r in results.values())
+        freed = sum(r.freed for r in results.values())
+        msg = f"Archivos eliminados: {deleted}\nEspacio liberado: {freed / (1024**2):.2f} MB\n"
+        for r in results.values():
+            msg += f"\n{r.root}: {r.deleted} archivos, {r.freed / (1024**2):.2f} MB"
+            if r.errors:
+                msg += f" ({r.errors} en uso o sin permiso)"
         QtWidgets.QMessageBox.information(self, "Cache limpiada", msg)
-        self.load_system()
+        # El espacio cambió: el hilo del muestreo relee las particiones en el próximo
+        # tick (en lugar de esperar el período) y _on_sample actualiza el texto
+        self.bridge.sampler.monitor.collector.invalidate("partitions")
 
     def on_open_app(self):
-        item = self.apps_list.currentItem()
-        if not item:
+        app = self._selected_app()
+        if app is None:
             return
-        parts = [p.strip() for p in item.text().split("|")]
-        path = parts[2] if len(parts) > 2 else ""
-        target = path or parts[0]
-        if not open_application(target):
+        if not open_application(app.path or app.name):
             QtWidgets.QMessageBox.warning(self, "Error", "No se pudo abrir la aplicación seleccionada.")
 
     def on_close_app(self):
-        item = self.apps_list.currentItem()
-        if not item:
+        app = self._selected_app()
+        if app is None:
             return
-        parts = [p.strip() for p in item.text().split("|")]
-        # Intentar obtener un ejecutable fiable desde el path mostrado
-        name = parts[0]
-        path = parts[2] if len(parts) > 2 else ""
-        target = name
-        if path:
-            maybe_path = path.strip('"')
-            if os.path.isfile(maybe_path):
-                # Usar el nombre del ejecutable (p.ej. chrome.exe) para cerrar por imagen
-                target = os.path.basename(maybe_path)
-        if not close_application(target):
-            QtWidgets.QMessageBox.warning(self, "Error", "No se pudo cerrar la aplicación seleccionada.")
+        if self.closer.start(app):
+            self.apps_status.setText(f"Cerrando {app.name}...")
+
+    def _on_app_closed(self, app, ok):
+        if ok:
+            self.apps_status.setText(f"{app.name} cerrada")
+        else:
+            self.apps_status.setText(f"No se pudo cerrar {app.name}")
 
     def on_uninstall_app(self):
-        item = self.apps_list.currentItem()
-        if not item:
+        app = self._selected_app()
+        if app is None:
             return
-        parts = [p.strip() for p in item.text().split("|")]
-        name = parts[0]
         confirm = QtWidgets.QMessageBox.question(self, "Confirmar desinstalación", 
-                                                 f"¿Seguro que deseas desinstalar {name}?")
+                                                 f"¿Seguro que deseas desinstalar {app.name}?")
         if confirm == QtWidgets.QMessageBox.Yes:
-            if not uninstall_application(name):
+            if not uninstall_entry(app):
                 QtWidgets.QMessageBox.warning(self, "Error", "No se pudo desinstalar la aplicación seleccionada.")
             else:
                 self.load_apps()
 
+    def on_footprint(self):
+        if self.footprint.busy():
+            self.footprint.cancel()
+            return
+        apps = [self.apps_model.entry_at(r) for r in range(self.apps_model.rowCount())]
+        if self.footprint.start(apps):
+            self.btn_footprint.setText("Cancelar análisis")
+            self.apps_status.setText("Analizando espacio en disco...")
+
+    def _on_footprint_progress(self, done, total):
+        self.apps_status.setText(f"Analizando espacio en disco: {done} de {total} carpetas")
+
+    def _on_footprint_finished(self, cancelled):
+        self.btn_footprint.setText("Analizar espacio")
+        self.apps_status.setText("Análisis cancelado" if cancelled else "Análisis de espacio completo")
+
     def on_lock(self):
         if not lock_screen():
             QtWidgets.QMessageBox.warning(self, "Error", "No se pudo bloquear la pantalla.")
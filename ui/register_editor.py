@@ -4,7 +4,14 @@ from core.user_utils import list_local_users, create_user, delete_user, change_p
 from core.permissions import is_admin
 from core.policies import get_all_policies, set_policy_value
 from widgets import message_box
-import psutil
+from widgets.key_filter import KeySetFilterProxy
+from widgets.process_model import (ProcessFeed, ProcessTableModel,
+                                   ProcessTerminator, ProcessTreeModel, ProfileApplier)
+import threading
+from core.process_index import get_process_index
+from core.process_snapshot import get_process_sampler
+from core.process_tuning import TuningRule, get_profile_manager
+from widgets.sampler_bridge import get_bridge
 
 class RegisterEditorPage(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -52,11 +59,35 @@ class RegisterEditorPage(QtWidgets.QWidget):
         proc_layout = QtWidgets.QVBoxLayout(grp_proc)
         proc_layout.setContentsMargins(12, 12, 12, 12)
 
-        self.proc_table = QtWidgets.QTableWidget(0, 2)
-        self.proc_table.setHorizontalHeaderLabels(["Nombre", "PID"])
+        # Filtro por nombre resuelto sobre el índice (no recorre las filas de la vista)
+        filter_row = QtWidgets.QHBoxLayout()
+        self.proc_filter = QtWidgets.QLineEdit()
+        self.proc_filter.setPlaceholderText("Filtrar por nombre…")
+        self.proc_filter.textChanged.connect(self._apply_proc_filter)
+        filter_row.addWidget(self.proc_filter, 1)
+        self.proc_filter_mode = QtWidgets.QComboBox()
+        for label, mode in (("Contiene", "substring"), ("Empieza con", "prefix"), ("Regex", "regex")):
+            self.proc_filter_mode.addItem(label, mode)
+        self.proc_filter_mode.currentIndexChanged.connect(self._apply_proc_filter)
+        filter_row.addWidget(self.proc_filter_mode)
+        proc_layout.addLayout(filter_row)
+        # Índice compartido: el ProcessSampler lo actualiza con cada snapshot
+        self.proc_index = get_process_index()
+
+        # Modelo alimentado por snapshots en segundo plano (diff incremental por fila)
+        self.proc_model = ProcessTableModel(self)
+        self.proc_proxy = KeySetFilterProxy(self)
+        self.proc_proxy.setSourceModel(self.proc_model)
+        self.proc_table = QtWidgets.QTableView()
+        self.proc_table.setModel(self.proc_proxy)
+        self.proc_table.setSortingEnabled(True)
+        self.proc_table.sortByColumn(1, QtCore.Qt.AscendingOrder)
+        self.proc_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.proc_table.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.proc_table.verticalHeader().setVisible(False)
         self.proc_table.setStyleSheet(
             """
-            QTableWidget {
+            QTableView {
                 background-color: #0f1726;
                 color: #ffffff;
                 border: 1px solid #2e2e3e;
@@ -74,29 +105,110 @@ class RegisterEditorPage(QtWidgets.QWidget):
         header = self.proc_table.horizontalHeader()
         header.setStretchLastSection(False)
         header.setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
-        header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
+        for col in range(1, self.proc_model.columnCount()):
+            header.setSectionResizeMode(col, QtWidgets.QHeaderView.ResizeToContents)
         proc_layout.addWidget(self.proc_table)
 
+        # Vista jerárquica (padre/hijos) con totales por subárbol
+        self.proc_tree_model = ProcessTreeModel(self)
+        self.proc_tree = QtWidgets.QTreeView()
+        self.proc_tree_proxy = KeySetFilterProxy(self)
+        self.proc_tree_proxy.setRecursiveFilteringEnabled(True)
+        self.proc_tree_proxy.setSourceModel(self.proc_tree_model)
+        self.proc_tree.setModel(self.proc_tree_proxy)
+        self.proc_tree.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.proc_tree.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.proc_tree.setUniformRowHeights(True)
+        self.proc_tree.setStyleSheet(self.proc_table.styleSheet().replace("QTableView", "QTreeView"))
+        tree_header = self.proc_tree.header()
+        tree_header.setStretchLastSection(False)
+        tree_header.setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)
+        for col in range(1, self.proc_tree_model.columnCount()):
+            tree_header.setSectionResizeMode(col, QtWidgets.QHeaderView.ResizeToContents)
+        self.proc_tree.setVisible(False)
+        self._expanded_keys = set()
+        self.proc_tree_proxy.modelAboutToBeReset.connect(self._save_tree_state)
+        self.proc_tree_proxy.modelReset.connect(self._restore_tree_state)
+        proc_layout.addWidget(self.proc_tree)
+
         btns_row = QtWidgets.QHBoxLayout()
         btns_row.setSpacing(8)
         btn_refresh_proc = QtWidgets.QPushButton("Actualizar procesos")
         btn_refresh_proc.clicked.connect(self.load_processes)
         btns_row.addWidget(btn_refresh_proc)
 
+        self.chk_auto_proc = QtWidgets.QCheckBox("Auto (1 s)")
+        self.chk_auto_proc.toggled.connect(self._on_auto_toggled)
+        btns_row.addWidget(self.chk_auto_proc)
+
+        self.chk_tree_proc = QtWidgets.QCheckBox("Vista de árbol")
+        self.chk_tree_proc.toggled.connect(self._on_tree_toggled)
+        btns_row.addWidget(self.chk_tree_proc)
+
         self.proc_pid_input = QtWidgets.QLineEdit()
-        self.proc_pid_input.setPlaceholderText("PID")
+        self.proc_pid_input.setPlaceholderText("PID (varios: 12, 34)")
         self.proc_pid_input.setFixedWidth(140)
         btns_row.addWidget(self.proc_pid_input)
 
         btn_kill_by_pid = QtWidgets.QPushButton("Terminar Proceso")
         btn_kill_by_pid.clicked.connect(self.terminate_by_pid)
         btns_row.addWidget(btn_kill_by_pid)
+
+        btn_kill_tree = QtWidgets.QPushButton("Terminar árbol")
+        btn_kill_tree.clicked.connect(self.terminate_tree_by_pid)
+        btns_row.addWidget(btn_kill_tree)
         btns_row.addStretch(1)
 
-        for b in (btn_refresh_proc, btn_kill_by_pid):
+        for b in (btn_refresh_proc, btn_kill_by_pid, btn_kill_tree):
             b.setStyleSheet("padding: 8px 12px; font-weight: 600;")
 
         proc_layout.addLayout(btns_row)
+
+        # Perfiles de prioridad/afinidad/E-S y reglas por nombre
+        self.profiles = get_profile_manager()
+        tune_row = QtWidgets.QHBoxLayout()
+        tune_row.setSpacing(8)
+        self.profile_combo = QtWidgets.QComboBox()
+        for name in self.profiles.profiles:
+            self.profile_combo.addItem(name)
+        tune_row.addWidget(self.profile_combo)
+        btn_apply_profile = QtWidgets.QPushButton("Aplicar perfil")
+        btn_apply_profile.clicked.connect(self.apply_profile_to_selection)
+        tune_row.addWidget(btn_apply_profile)
+        self.rule_pattern = QtWidgets.QLineEdit()
+        self.rule_pattern.setPlaceholderText("Nombre (p. ej. updater)")
+        tune_row.addWidget(self.rule_pattern, 1)
+        btn_add_rule = QtWidgets.QPushButton("Agregar regla")
+        btn_add_rule.clicked.connect(self.add_profile_rule)
+        tune_row.addWidget(btn_add_rule)
+        self.chk_auto_profile = QtWidgets.QCheckBox("Aplicar a procesos nuevos")
+        self.chk_auto_profile.setChecked(self.profiles.auto)
+        self.chk_auto_profile.toggled.connect(self._on_auto_profile)
+        tune_row.addWidget(self.chk_auto_profile)
+        for b in (btn_apply_profile, btn_add_rule):
+            b.setStyleSheet("padding: 8px 12px; font-weight: 600;")
+        proc_layout.addLayout(tune_row)
+
+        rules_row = QtWidgets.QHBoxLayout()
+        self.rules_list = QtWidgets.QListWidget()
+        self.rules_list.setMaximumHeight(70)
+        rules_row.addWidget(self.rules_list, 1)
+        btn_remove_rule = QtWidgets.QPushButton("Quitar regla")
+        btn_remove_rule.clicked.connect(self.remove_profile_rule)
+        rules_row.addWidget(btn_remove_rule)
+        proc_layout.addLayout(rules_row)
+        self._refresh_rules()
+
+        self.proc_status = QtWidgets.QLabel("")
+        self.proc_status.setStyleSheet("color: #bcd7ff;")
+        proc_layout.addWidget(self.proc_status)
+
+        # Actividad reciente: inicios y fines de procesos (fuente de eventos compartida)
+        self.proc_events = QtWidgets.QListWidget()
+        self.proc_events.setMaximumHeight(120)
+        self.proc_events.setStyleSheet("background-color: #0f1726; color: #bcd7ff; border: 1px solid #2e2e3e;")
+        proc_layout.addWidget(self.proc_events)
+        get_bridge().process_events.connect(self._on_process_events)
         left_layout.addWidget(grp_proc)
 
         right = QtWidgets.QWidget()
@@ -179,6 +291,20 @@ class RegisterEditorPage(QtWidgets.QWidget):
         box.addWidget(btn_reboot)
         layout.addLayout(box)
 
+        self.proc_feed = ProcessFeed(self)
+        self.proc_feed.worker.snapshot.connect(self._on_proc_snapshot)
+        self.proc_table.selectionModel().selectionChanged.connect(self._on_proc_selected)
+        self.proc_tree.selectionModel().selectionChanged.connect(self._on_tree_selected)
+
+        # Terminación en lote fuera del hilo de la GUI
+        self.proc_terminator = ProcessTerminator(self)
+        self.proc_terminator.result.connect(self._on_terminate_result)
+        self.proc_terminator.finished.connect(self._on_terminate_finished)
+        self._terminate_done = 0
+        # Perfiles sobre la selección, también fuera del hilo de la GUI
+        self.profile_applier = ProfileApplier(self)
+        self.profile_applier.finished.connect(self._on_profile_applied)
+
         self.load_users()
         self.load_processes()
 
@@ -236,38 +362,165 @@ class RegisterEditorPage(QtWidgets.QWidget):
             QtWidgets.QMessageBox.warning(self, "Error", msg)
 
     def load_processes(self):
-        self.proc_table.setRowCount(0)
-        for p in psutil.process_iter(attrs=["pid", "name"]):
-            try:
-                row = self.proc_table.rowCount()
-                self.proc_table.insertRow(row)
-                self.proc_table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(p.info.get("name", ""))))
-                self.proc_table.setItem(row, 1, QtWidgets.QTableWidgetItem(str(p.info["pid"])))
-            except Exception:
-                continue
-
-    def terminate_by_pid(self):
-        pid_text = self.proc_pid_input.text().strip()
-        if not pid_text:
-            QtWidgets.QMessageBox.warning(self, "Aviso", "Ingrese un PID")
+        # El snapshot se toma en el hilo del worker; el modelo aplica solo el diff
+        self.proc_feed.request.emit()
+
+    def _on_proc_snapshot(self, snapshot):
+        self.proc_model.apply_snapshot(snapshot)
+        self.proc_tree_model.apply_snapshot(snapshot)
+        if self.proc_filter.text():
+            self._apply_proc_filter()
+
+    def _apply_proc_filter(self, *args):
+        pattern = self.proc_filter.text().strip()
+        allowed = None
+        if pattern:
+            allowed = self.proc_index.filter(pattern, self.proc_filter_mode.currentData())
+        self.proc_proxy.set_allowed(allowed)
+        self.proc_tree_proxy.set_allowed(allowed)
+
+    def _refresh_rules(self):
+        self.rules_list.clear()
+        for rule in self.profiles.rules:
+            self.rules_list.addItem(f"{rule.pattern} → {rule.profile}")
+
+    def apply_profile_to_selection(self):
+        pids = self._selected_pids()
+        if not pids:
+            return
+        profile = self.profiles.profiles[self.profile_combo.currentText()]
+        if not self.profile_applier.start(pids, profile):
+            QtWidgets.QMessageBox.warning(self, "Aviso", "Ya se está aplicando un perfil")
             return
+        self.proc_status.setText(f"Aplicando '{profile.name}' a {len(pids)} procesos…")
+
+    def _on_profile_applied(self, profile, results):
+        failed = {pid: err for pid, err in results.items() if err}
+        self.proc_status.setText(f"Perfil '{profile.name}': {len(results) - len(failed)} procesos, {len(failed)} con error")
+        if failed:
+            detail = "\n".join(f"{pid}: {err}" for pid, err in sorted(failed.items())[:20])
+            QtWidgets.QMessageBox.warning(self, "Error", detail)
+
+    def add_profile_rule(self):
+        pattern = self.rule_pattern.text().strip()
+        if not pattern:
+            QtWidgets.QMessageBox.warning(self, "Aviso", "Ingrese un nombre de proceso")
+            return
+        rule = TuningRule(pattern, self.profile_combo.currentText())
+        self.profiles.add_rule(rule)
+        self.rule_pattern.clear()
+        self._refresh_rules()
+        # Se aplica ya a los procesos en ejecución que coinciden, solo la regla nueva
+        # y fuera del hilo de la GUI (el último snapshot no se modifica, se reemplaza)
+        snapshot = get_process_sampler().last
+        if snapshot:
+            threading.Thread(target=self.profiles.apply_rule, args=(rule, snapshot),
+                             name="hw-tuning", daemon=True).start()
+
+    def remove_profile_rule(self):
+        row = self.rules_list.currentRow()
+        if row >= 0:
+            self.profiles.remove_rule(row)
+            self._refresh_rules()
+
+    def _on_auto_profile(self, enabled):
+        self.profiles.auto = enabled
+
+    EVENT_LINES = 200
+
+    def _on_process_events(self, events):
+        if not self.isVisible():
+            return
+        for ev in events[-self.EVENT_LINES:]:
+            if ev.kind == "start":
+                text = f"▲ {ev.name} ({ev.pid}) iniciado por {ev.ppid}"
+            else:
+                life = f", vivió {ev.lifetime:.1f} s" if ev.lifetime is not None else ""
+                text = f"▼ {ev.name} ({ev.pid}) terminó{life}"
+            self.proc_events.insertItem(0, text)
+        while self.proc_events.count() > self.EVENT_LINES:
+            self.proc_events.takeItem(self.proc_events.count() - 1)
+
+    def _on_auto_toggled(self, enabled):
+        self.proc_feed.auto.emit(enabled and self.isVisible())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.chk_auto_proc.isChecked():
+            self.proc_feed.auto.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.proc_feed.auto.emit(False)
+
+    def _on_proc_selected(self, *args):
+        rows = self.proc_table.selectionModel().selectedRows()
+        if rows:
+            pids = [self.proc_model.row_data(self.proc_proxy.mapToSource(r).row())["pid"] for r in rows]
+            self.proc_pid_input.setText(", ".join(str(p) for p in pids))
+
+    def _on_tree_toggled(self, enabled):
+        self.proc_tree.setVisible(enabled)
+        self.proc_table.setVisible(not enabled)
+
+    def _on_tree_selected(self, *args):
+        rows = self.proc_tree.selectionModel().selectedRows()
+        if rows:
+            pids = [self.proc_tree_model.row_data(self.proc_tree_proxy.mapToSource(r))["pid"] for r in rows]
+            self.proc_pid_input.setText(", ".join(str(p) for p in pids))
+
+    def _save_tree_state(self):
+        model = self.proc_tree_model
+        proxy = self.proc_tree_proxy
+        self._expanded_keys = {k for k in model.tree.rows if model.tree.children(k)
+                               and self.proc_tree.isExpanded(proxy.mapFromSource(model.index_for_key(k)))}
+
+    def _restore_tree_state(self):
+        model = self.proc_tree_model
+        for k in self._expanded_keys:
+            index = self.proc_tree_proxy.mapFromSource(model.index_for_key(k))
+            if index.isValid():
+                self.proc_tree.setExpanded(index, True)
+
+    def _selected_pids(self):
+        text = self.proc_pid_input.text().replace(",", " ").split()
+        if not text:
+            QtWidgets.QMessageBox.warning(self, "Aviso", "Ingrese un PID")
+            return None
         try:
-            pid = int(pid_text)
+            return [int(t) for t in text]
         except ValueError:
             QtWidgets.QMessageBox.warning(self, "Validación", "PID inválido")
+            return None
+
+    def _start_termination(self, tree):
+        pids = self._selected_pids()
+        if not pids:
             return
-        try:
-            p = psutil.Process(pid)
-            p.terminate()
-            p.wait(timeout=3)
-            QtWidgets.QMessageBox.information(self, "Listo", f"Proceso {pid} finalizado")
-            self.load_processes()
-        except psutil.AccessDenied:
-            QtWidgets.QMessageBox.warning(self, "Permisos", "Se requieren permisos de administrador...")
-        except psutil.NoSuchProcess:
-            QtWidgets.QMessageBox.warning(self, "Error", "Proceso inexistente")
-        except Exception as e:
-            QtWidgets.QMessageBox.warning(self, "Error", str(e))
+        if not self.proc_terminator.start(pids, tree=tree):
+            QtWidgets.QMessageBox.warning(self, "Aviso", "Ya hay una terminación en curso")
+            return
+        self._terminate_done = 0
+        self.proc_status.setText(f"Finalizando {len(pids)} procesos…")
+
+    def terminate_tree_by_pid(self):
+        self._start_termination(tree=True)
+
+    def terminate_by_pid(self):
+        self._start_termination(tree=False)
+
+    def _on_terminate_result(self, pid, err):
+        self._terminate_done += 1
+        self.proc_status.setText(f"Finalizados {self._terminate_done} (último: {pid})")
+
+    def _on_terminate_finished(self, results):
+        failed = {pid: err for pid, err in results.items() if err}
+        ok = len(results) - len(failed)
+        self.proc_status.setText(f"{ok} procesos finalizados, {len(failed)} con error")
+        if failed:
+            detail = "\n".join(f"{pid}: {err}" for pid, err in sorted(failed.items())[:20])
+            QtWidgets.QMessageBox.warning(self, "Error", detail)
+        self.load_processes()
 
     def on_shutdown(self):
         if not is_admin():
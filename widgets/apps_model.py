@@ -0,0 +1,275 @@
+import threading
+from PyQt5 import QtCore, QtWidgets
+from core.app_inventory import get_app_inventory, icon_file
+from core.footprint import get_footprint_analyzer, install_dir
+from core.system_utils import close_entry, installed_app_entries
+
+
+def _size_text(size):
+    if size is None:
+        return ""
+    if size >= 1024 ** 3:
+        return f"{size / 1024 ** 3:.1f} GB"
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+class AppTableModel(QtCore.QAbstractTableModel):
+    """
+    Modelo de la tabla de aplicaciones instaladas sobre registros AppEntry.
+    Tamaño e ícono se completan de a poco con set_details() (ver AppDetailsLoader);
+    los íconos se crean recién cuando la vista pinta la fila, y quedan en caché por
+    archivo. Los detalles ya cargados sobreviven a un recargado de la lista. Si la
+    carpeta de instalación se midió (FootprintWorker), el tamaño en disco reemplaza
+    al EstimatedSize declarado por el instalador.
+    """
+
+    COLUMNS = (("name", "Nombre"), ("version", "Versión"), ("size", "Tamaño"), ("path", "Ubicación"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._apps = []
+        self._pos = {}
+        self._details = {}      # ident -> (tamaño en bytes o None, archivo de ícono)
+        self._usage = {}        # ident -> Footprint medido en disco
+        self._icons = {}        # archivo -> QIcon
+        self._provider = None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._apps)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def set_apps(self, apps):
+        self.beginResetModel()
+        self._apps = list(apps)
+        self._pos = {a.ident: i for i, a in enumerate(self._apps)}
+        self.endResetModel()
+
+    def entry_at(self, row):
+        return self._apps[row]
+
+    def key_at(self, row, parent=QtCore.QModelIndex()):
+        return self._apps[row].ident
+
+    def needs_details(self, entry):
+        return entry.ident not in self._details
+
+    def set_details(self, ident, size, icon_path):
+        self._details[ident] = (size, icon_path)
+        row = self._pos.get(ident)
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, 2))
+
+    def set_usage(self, ident, footprint):
+        self._usage[ident] = footprint
+        row = self._pos.get(ident)
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 2), self.index(row, 2))
+
+    def _icon(self, path):
+        icon = self._icons.get(path)
+        if icon is None:
+            if self._provider is None:
+                self._provider = QtWidgets.QFileIconProvider()
+            icon = self._icons[path] = self._provider.icon(QtCore.QFileInfo(path))
+        return icon
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._apps[index.row()]
+        field = self.COLUMNS[index.column()][0]
+        size, icon_path = self._details.get(entry.ident, (None, ""))
+        usage = self._usage.get(entry.ident)
+        if usage is not None:
+            size = usage.size
+        if field == "size":
+            if role == QtCore.Qt.ToolTipRole and usage is not None:
+                return f"{usage.files} archivos en {usage.dirs} carpetas\n{usage.path}"
+            if role == QtCore.Qt.DisplayRole:
+                return _size_text(size)
+            if role == QtCore.Qt.UserRole:
+                return -1 if size is None else size
+            if role == QtCore.Qt.TextAlignmentRole:
+                return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return getattr(entry, field)
+        if role == QtCore.Qt.UserRole:
+            return getattr(entry, field).lower()
+        if role == QtCore.Qt.DecorationRole and field == "name" and icon_path:
+            return self._icon(icon_path)
+        if role == QtCore.Qt.ToolTipRole and field == "name":
+            return entry.uninstall_command or None
+        return None
+
+
+class AppsLoader(QtCore.QObject):
+    """
+    Lee el inventario de aplicaciones en un hilo aparte; 'loaded' se emite con la
+    lista de AppEntry (Qt la encola hacia el hilo de la GUI). Si ya hay una lectura
+    en curso, load() no lanza otra.
+    """
+    loaded = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent=None, load_fn=installed_app_entries):
+        super().__init__(parent)
+        self.load_fn = load_fn
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def load(self, deep=False):
+        if self.busy():
+            return False
+
+        def run():
+            try:
+                apps = self.load_fn(deep=deep)
+            except Exception:
+                apps = []
+            self.loaded.emit(apps)
+
+        self._thread = threading.Thread(target=run, name="hw-apps", daemon=True)
+        self._thread.start()
+        return True
+
+
+class AppCloser(QtCore.QObject):
+    """
+    Cierra la aplicación de una entrada (búsqueda en el índice de procesos y
+    terminación del árbol con su plazo de gracia) en un hilo aparte. 'finished' se
+    emite con (AppEntry, éxito). Mientras hay un cierre en curso start() no lanza otro.
+    """
+    finished = QtCore.pyqtSignal(object, bool)
+
+    def __init__(self, parent=None, close_fn=close_entry):
+        super().__init__(parent)
+        self.close_fn = close_fn
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, entry):
+        if self.busy():
+            return False
+
+        def run():
+            try:
+                ok = self.close_fn(entry)
+            except Exception:
+                ok = False
+            self.finished.emit(entry, ok)
+
+        self._thread = threading.Thread(target=run, name="hw-app-close", daemon=True)
+        self._thread.start()
+        return True
+
+
+class AppDetailsLoader(QtCore.QObject):
+    """
+    Carga en segundo plano el tamaño (EstimatedSize) y el archivo de ícono de las
+    entradas que se le piden. Cada request() reemplaza la cola anterior: si el
+    usuario sigue desplazándose, las filas que ya no se ven no se cargan.
+    'loaded' se emite con (ident, tamaño, archivo de ícono).
+    """
+    loaded = QtCore.pyqtSignal(object, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = []
+        self._requested = set()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+    def request(self, entries):
+        with self._cond:
+            self._queue = [e for e in entries if e.ident not in self._requested]
+            self._queue.reverse()       # pop() desde el final: primero la fila de arriba
+            if self._queue:
+                self._cond.notify()
+        if self._queue and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="hw-app-details", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        inventory = get_app_inventory()
+        while True:
+            with self._cond:
+                while not self._queue and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                entry = self._queue.pop()
+                self._requested.add(entry.ident)
+            try:
+                size = inventory.estimated_size(entry)
+                icon = icon_file(entry)
+            except Exception:
+                size, icon = None, ""
+            self.loaded.emit(entry.ident, size, icon)
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+
+
+class FootprintWorker(QtCore.QObject):
+    """
+    Mide en segundo plano la carpeta de instalación de cada aplicación con el
+    FootprintAnalyzer compartido. 'result' se emite por aplicación (ident, Footprint)
+    y 'progress' con (hechas, total); 'finished' con True si se canceló.
+    """
+    result = QtCore.pyqtSignal(object, object)
+    progress = QtCore.pyqtSignal(int, int)
+    finished = QtCore.pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.analyzer = get_footprint_analyzer()
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, apps):
+        if self.busy():
+            return False
+        apps = list(apps)
+        self.analyzer.reset()
+
+        def run():
+            # install_dir consulta el disco por cada aplicación: también va en este hilo
+            by_dir = {}
+            for app in apps:
+                d = install_dir(app.path, app.install_location)
+                if d:
+                    by_dir.setdefault(d, []).append(app.ident)
+
+            def on_progress(done, total, fp):
+                for ident in by_dir.get(fp.path, ()):
+                    self.result.emit(ident, fp)
+                self.progress.emit(done, total)
+
+            try:
+                self.analyzer.analyze(by_dir, progress=on_progress, reset=False)
+            except Exception:
+                pass
+            self.finished.emit(self.analyzer.cancelled)
+
+        self._thread = threading.Thread(target=run, name="hw-footprint", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self.analyzer.cancel()
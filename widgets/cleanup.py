@@ -0,0 +1,74 @@
+import threading
+import time
+from PyQt5 import QtCore
+from core.cache_utils import CleanPlan, apply_plan, scan_paths, temp_candidates
+
+
+class CleanupWorker(QtCore.QObject):
+    """
+    Limpieza de temporales en dos fases, fuera del hilo de la GUI: scan() recorre y
+    arma un CleanPlan (vista previa), apply() borra solo lo previsto. El avance se
+    emite como mucho cada 'interval' segundos por 'progress' (archivos, bytes,
+    carpeta actual), así un árbol enorme no inunda la cola de eventos. cancel()
+    corta cualquiera de las dos fases en milisegundos: marca un Event que los
+    recorridos revisan cada pocas entradas, sin pasar por la cola de señales.
+    """
+    progress = QtCore.pyqtSignal(int, int, str)
+    scanned = QtCore.pyqtSignal(object, bool)       # plan, cancelado
+    applied = QtCore.pyqtSignal(object, bool)       # {raíz: CleanResult}, cancelado
+
+    def __init__(self, parent=None, interval=0.1, workers=4):
+        super().__init__(parent)
+        self.interval = interval
+        self.workers = workers
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _start(self, target):
+        if self.busy():
+            return False
+        self._cancel.clear()
+        self._thread = threading.Thread(target=target, name="hw-cleanup", daemon=True)
+        self._thread.start()
+        return True
+
+    def scan(self, roots=None):
+        def run():
+            plan = CleanPlan(temp_candidates() if roots is None else roots)
+            last = 0.0
+            try:
+                for item in scan_paths(plan.roots, plan, self._cancel):
+                    now = time.monotonic()
+                    if now - last >= self.interval:
+                        last = now
+                        self.progress.emit(plan.files, plan.size, item.path)
+            except Exception:
+                pass
+            self.progress.emit(plan.files, plan.size, "")
+            self.scanned.emit(plan, self._cancel.is_set())
+
+        return self._start(run)
+
+    def apply(self, plan):
+        def run():
+            last = [0.0]
+
+            def on_progress(deleted, freed):
+                now = time.monotonic()
+                if now - last[0] >= self.interval:
+                    last[0] = now
+                    self.progress.emit(deleted, freed, "")
+
+            try:
+                results = apply_plan(plan, self.workers, self._cancel, on_progress)
+            except Exception:
+                results = {}
+            self.applied.emit(results, self._cancel.is_set())
+
+        return self._start(run)
@@ -0,0 +1,40 @@
+from PyQt5 import QtWidgets
+import numpy as np
+import pyqtgraph as pg
+
+class CoreHeatmap(QtWidgets.QFrame):
+    """
+    Mapa de calor tiempo x núcleo para el uso por CPU.
+    Usa un único ImageItem (una textura por frame), así 64+ núcleos cuestan lo mismo
+    que uno; el array llega como vista del MatrixRing y no se copia.
+    """
+
+    def __init__(self, title=""):
+        super().__init__()
+        layout = QtWidgets.QVBoxLayout(self)
+        self.title = QtWidgets.QLabel(title)
+        self.title.setObjectName("titleLabel")
+        layout.addWidget(self.title)
+        self.plot_widget = pg.PlotWidget()
+        self.plot_widget.setBackground(None)
+        self.plot_widget.setMouseEnabled(x=False, y=False)
+        self.plot_widget.getPlotItem().hideAxis("bottom")
+        self.plot_widget.getPlotItem().setLabel("left", "Núcleo")
+        self.image = pg.ImageItem()
+        cmap = pg.ColorMap([0.0, 0.5, 1.0], [(20, 40, 80), (255, 204, 0), (255, 85, 85)])
+        self.image.setLookupTable(cmap.getLookupTable(0.0, 1.0, 256))
+        self.plot_widget.addItem(self.image)
+        layout.addWidget(self.plot_widget)
+        self.hot_label = QtWidgets.QLabel("")
+        layout.addWidget(self.hot_label)
+
+    def update_data(self, matrix):
+        """'matrix' es (tiempo, núcleos), memoryview o ndarray."""
+        if not len(matrix):
+            return
+        data = np.asarray(matrix)
+        # ImageItem interpreta el eje 0 como X (tiempo) y el eje 1 como Y (núcleo)
+        self.image.setImage(data, levels=(0, 100), autoLevels=False)
+        last = data[-1]
+        hot = int(last.argmax())
+        self.hot_label.setText(f"Núcleo más cargado: {hot} ({last[hot]:.0f}%) de {data.shape[1]}")
@@ -1,5 +1,5 @@
 from PyQt5 import QtWidgets, QtCore
-from core.monitor import Monitor
+from widgets.sampler_bridge import get_bridge
 
 class Footer(QtWidgets.QFrame):
     def __init__(self, parent=None):
@@ -27,23 +27,43 @@ class Footer(QtWidgets.QFrame):
 
         layout.addStretch(1)
 
-        # Monitor para CPU/RAM
-        self.monitor = Monitor(history_max=60)  
-        self.monitor.sample()
+        # Alertas activas (reglas sostenidas de core.alerts)
+        self.lbl_alerts = QtWidgets.QLabel("")
+        self.lbl_alerts.setStyleSheet("QLabel { color: #ff5555; font-weight: bold; }")
+        layout.addWidget(self.lbl_alerts)
+        self._active_alerts = {}
 
-        self.timer = QtCore.QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.start(2000)  # cada 2 segundos
+        # CPU/RAM desde el Sampler compartido (mismo tick que Home)
+        self.bridge = get_bridge()
+        self.bridge.updated.connect(self._on_sample)
+        self.bridge.alert.connect(self._on_alert)
 
-    def _tick(self):
-        self.monitor.sample()
-        snap = self.monitor.snapshot()
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.bridge.sampler.set_demand("footer", 2.0)
+        self._on_sample(self.bridge.sampler.latest())
 
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.bridge.sampler.release("footer")
+
+    def _on_alert(self, event):
+        if event.state == "firing":
+            self._active_alerts[event.rule] = event.message
+        else:
+            self._active_alerts.pop(event.rule, None)
+        self.lbl_alerts.setText(" | ".join(self._active_alerts.values()))
+
+    def _on_sample(self, snap):
+        if not self.isVisible():
+            return
         cpu = snap['cpu']
         ram = snap['ram']
 
         # Colores dinamicos segun nivel de uso
-        def colorize(value):
+        def colorize(value, metric):
+            if any(r.metric == metric for r in self.bridge.alerts.active()):
+                return "#ff5555"   # alerta activa
             if value < 50:
                 return "#00ff88"   # verde
             elif value < 80:
@@ -51,8 +71,8 @@ class Footer(QtWidgets.QFrame):
             else:
                 return "#ff5555"   # rojo
 
-        cpu_color = colorize(cpu)
-        ram_color = colorize(ram)
+        cpu_color = colorize(cpu, "cpu")
+        ram_color = colorize(ram, "ram")
 
         self.lbl_status.setText(
             f"<span style='color:{cpu_color}'>CPU {cpu:.0f}%</span> - "
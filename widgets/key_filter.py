@@ -0,0 +1,25 @@
+from PyQt5 import QtCore
+
+
+class KeySetFilterProxy(QtCore.QSortFilterProxyModel):
+    """
+    Proxy que filtra por un conjunto de claves ya resuelto afuera (procesos
+    (pid, create_time) de ProcessIndex.filter(), identidades de AppFilter.match()):
+    cada fila se decide con una pertenencia O(1) a un set, usando el key_at() del
+    modelo de origen. Ordena por el valor crudo (UserRole).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._allowed = None
+        self.setSortRole(QtCore.Qt.UserRole)
+
+    def set_allowed(self, keys):
+        """None desactiva el filtro."""
+        self._allowed = keys
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._allowed is None:
+            return True
+        return self.sourceModel().key_at(source_row, source_parent) in self._allowed
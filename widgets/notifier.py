@@ -0,0 +1,17 @@
+from PyQt5 import QtWidgets
+from widgets.sampler_bridge import get_bridge
+
+class DesktopNotifier(QtWidgets.QSystemTrayIcon):
+    """Muestra las alertas del AlertEngine como notificaciones de escritorio."""
+
+    def __init__(self, icon, parent=None):
+        super().__init__(icon, parent)
+        self.setToolTip("HardWindows")
+        if QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
+            self.show()
+        get_bridge().alert.connect(self.on_alert)
+
+    def on_alert(self, event):
+        if event.state != "firing" or not self.isVisible():
+            return
+        self.showMessage("HardWindows - Alerta", event.message, QtWidgets.QSystemTrayIcon.Warning, 8000)
@@ -0,0 +1,372 @@
+import threading
+from PyQt5 import QtCore
+from core.processes import diff_snapshots, terminate_many
+from core.process_snapshot import get_process_sampler
+from core.process_tree import ProcessTree
+from core.process_tuning import apply_profile
+
+
+def _mb(value):
+    return f"{value / (1024 * 1024):.1f}"
+
+
+def _kb(value):
+    return f"{value / 1024:.0f}"
+
+
+def _pct(value):
+    return f"{value:.1f}"
+
+
+FORMATS = {"cpu": _pct, "rss": _mb, "io_read": _kb, "io_write": _kb,
+           "tree_cpu": _pct, "tree_rss": _mb}
+TEXT_FIELDS = ("name", "user")
+
+
+def _cell(field, value, role):
+    """Valor de una celda según el rol: texto formateado, alineación o valor crudo para ordenar."""
+    if role == QtCore.Qt.DisplayRole:
+        if value is None:
+            return ""
+        fmt = FORMATS.get(field)
+        return fmt(value) if fmt else str(value)
+    if role == QtCore.Qt.TextAlignmentRole and field not in TEXT_FIELDS:
+        return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+    if role == QtCore.Qt.UserRole:
+        # Valor crudo para ordenar numéricamente (sin acceso cuenta como -1)
+        if value is None and field not in TEXT_FIELDS:
+            return -1
+        return value
+    return None
+
+
+class ProcessTableModel(QtCore.QAbstractTableModel):
+    """
+    Modelo de la tabla de procesos. Cada snapshot nuevo se compara con el anterior
+    por (pid, create_time) y se aplican solo las filas eliminadas, agregadas y
+    modificadas, así la vista conserva selección y scroll.
+    """
+
+    COLUMNS = (("name", "Nombre"), ("pid", "PID"), ("cpu", "CPU %"), ("rss", "RAM (MB)"),
+               ("threads", "Hilos"), ("handles", "Handles"), ("io_read", "Lectura (KB)"),
+               ("io_write", "Escritura (KB)"), ("user", "Usuario"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []
+        self._rows = {}
+        self._pos = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[self._keys[index.row()]]
+        field = self.COLUMNS[index.column()][0]
+        return _cell(field, row.get(field), role)
+
+    def row_data(self, row: int):
+        return self._rows[self._keys[row]]
+
+    def key_at(self, row, parent=QtCore.QModelIndex()):
+        return self._keys[row]
+
+    def _ranges(self, positions):
+        """Agrupa posiciones ordenadas en rangos contiguos [(inicio, fin)]."""
+        out = []
+        for p in positions:
+            if out and p == out[-1][1] + 1:
+                out[-1][1] = p
+            else:
+                out.append([p, p])
+        return out
+
+    def apply_snapshot(self, snapshot):
+        added, removed, changed = diff_snapshots(self._rows, snapshot)
+
+        if removed:
+            # De abajo hacia arriba para no invalidar las posiciones pendientes
+            for start, end in reversed(self._ranges(sorted(self._pos[k] for k in removed))):
+                self.beginRemoveRows(QtCore.QModelIndex(), start, end)
+                del self._keys[start:end + 1]
+                self.endRemoveRows()
+            for k in removed:
+                del self._rows[k]
+            self._pos = {k: i for i, k in enumerate(self._keys)}
+
+        if changed:
+            for k in changed:
+                self._rows[k] = snapshot[k]
+            last_col = len(self.COLUMNS) - 1
+            for start, end in self._ranges(sorted(self._pos[k] for k in changed)):
+                self.dataChanged.emit(self.index(start, 0), self.index(end, last_col))
+
+        if added:
+            start = len(self._keys)
+            self.beginInsertRows(QtCore.QModelIndex(), start, start + len(added) - 1)
+            for i, k in enumerate(added):
+                self._keys.append(k)
+                self._rows[k] = snapshot[k]
+                self._pos[k] = start + i
+            self.endInsertRows()
+
+
+class ProcessTreeModel(QtCore.QAbstractItemModel):
+    """
+    Modelo jerárquico de procesos sobre un ProcessTree. Los casos habituales (procesos
+    que nacen bajo un padre conocido o terminan sin hijos) se aplican como inserciones
+    y eliminaciones puntuales; solo los re-emparentamientos reinician el modelo.
+    Las columnas 'tree_*' muestran el total del subárbol.
+    """
+
+    COLUMNS = (("name", "Nombre"), ("pid", "PID"), ("cpu", "CPU %"), ("rss", "RAM (MB)"),
+               ("tree_cpu", "CPU árbol %"), ("tree_rss", "RAM árbol (MB)"), ("user", "Usuario"))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = ProcessTree()
+        self._ids = {}
+        self._keys = {}
+        self._next_id = 1
+
+    def _id(self, key):
+        i = self._ids.get(key)
+        if i is None:
+            i = self._ids[key] = self._next_id
+            self._keys[i] = key
+            self._next_id += 1
+        return i
+
+    def _forget(self, key):
+        i = self._ids.pop(key, None)
+        if i is not None:
+            del self._keys[i]
+
+    def key_for(self, index):
+        return self._keys.get(index.internalId()) if index.isValid() else None
+
+    def index_for_key(self, key, column=0):
+        if key is None or key not in self.tree:
+            return QtCore.QModelIndex()
+        return self.createIndex(self.tree.row_of(key), column, self._id(key))
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        children = self.tree.children(self.key_for(parent))
+        if 0 <= row < len(children) and 0 <= column < len(self.COLUMNS):
+            return self.createIndex(row, column, self._id(children[row]))
+        return QtCore.QModelIndex()
+
+    def parent(self, index):
+        key = self.key_for(index)
+        if key is None:
+            return QtCore.QModelIndex()
+        return self.index_for_key(self.tree.parent(key))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.tree.children(self.key_for(parent)))
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        key = self.key_for(index)
+        if key is None:
+            return None
+        field = self.COLUMNS[index.column()][0]
+        if field.startswith("tree_"):
+            if role not in (QtCore.Qt.DisplayRole, QtCore.Qt.UserRole, QtCore.Qt.TextAlignmentRole):
+                return None
+            value = self.tree.aggregate(key)[field[5:]]
+        else:
+            value = self.tree.rows[key].get(field)
+        return _cell(field, value, role)
+
+    def row_data(self, index):
+        return self.tree.rows[self.key_for(index)]
+
+    def key_at(self, row, parent=QtCore.QModelIndex()):
+        return self.tree.children(self.key_for(parent))[row]
+
+    def apply_snapshot(self, snapshot):
+        tree = self.tree
+        added, removed, changed = diff_snapshots(tree.rows, snapshot)
+        structural = (not tree
+                      or any(tree.children(k) for k in removed)
+                      or any(tree.needs_move(k, snapshot[k]) for k in changed))
+        if structural:
+            self.beginResetModel()
+            tree.apply(snapshot)
+            for k in removed:
+                self._forget(k)
+            self.endResetModel()
+            return
+
+        touched = set()
+        for k in removed:
+            parent = tree.parent(k)
+            row = tree.row_of(k)
+            self.beginRemoveRows(self.index_for_key(parent), row, row)
+            tree.remove(k)
+            self._forget(k)
+            self.endRemoveRows()
+            touched.add(parent)
+        added.sort(key=lambda k: k[1])
+        for k in added:
+            parent = tree.parent_for(k, snapshot[k])
+            row = len(tree.children(parent))
+            self.beginInsertRows(self.index_for_key(parent), row, row)
+            tree.add(k, snapshot[k])
+            self.endInsertRows()
+            touched.add(parent)
+        for k in changed:
+            tree.update(k, snapshot[k])
+            touched.add(tree.parent(k))
+
+        # Los totales de los ancestros también cambian: un dataChanged por grupo de hermanos
+        groups = set()
+        for p in touched:
+            groups.add(p)
+            if p is not None:
+                groups.update(tree.ancestors(p))
+                groups.add(tree.parent(p))
+        last_col = len(self.COLUMNS) - 1
+        for p in groups:
+            n = len(tree.children(p))
+            if n:
+                parent_index = self.index_for_key(p)
+                self.dataChanged.emit(self.index(0, 0, parent_index), self.index(n - 1, last_col, parent_index))
+
+
+class ProcessSnapshotWorker(QtCore.QObject):
+    """
+    Toma snapshots de procesos en un QThread propio. Con auto-refresco activo
+    emite uno por segundo; refresh() pide uno inmediato.
+    """
+    snapshot = QtCore.pyqtSignal(object)
+
+    def __init__(self, interval_ms=1000, snapshot_fn=None):
+        super().__init__()
+        self.interval_ms = interval_ms
+        self.snapshot_fn = snapshot_fn or get_process_sampler().snapshot
+        self._timer = None
+
+    @QtCore.pyqtSlot()
+    def setup(self):
+        # El timer debe crearse dentro del hilo del worker
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+
+    @QtCore.pyqtSlot()
+    def refresh(self):
+        try:
+            self.snapshot.emit(self.snapshot_fn())
+        except Exception:
+            pass
+
+    @QtCore.pyqtSlot(bool)
+    def set_auto(self, enabled):
+        if self._timer is None:
+            return
+        if enabled:
+            self._timer.start(self.interval_ms)
+        else:
+            self._timer.stop()
+
+
+class ProcessFeed(QtCore.QObject):
+    """Dueño del QThread del worker; expone señales para pedir snapshots desde la GUI."""
+    request = QtCore.pyqtSignal()
+    auto = QtCore.pyqtSignal(bool)
+
+    def __init__(self, parent=None, **worker_kw):
+        super().__init__(parent)
+        self.thread = QtCore.QThread(self)
+        self.worker = ProcessSnapshotWorker(**worker_kw)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.setup)
+        self.request.connect(self.worker.refresh)
+        self.auto.connect(self.worker.set_auto)
+        self.thread.start()
+
+    def stop(self):
+        self.auto.emit(False)
+        self.thread.quit()
+        self.thread.wait(2000)
+
+
+class ProcessTerminator(QtCore.QObject):
+    """
+    Ejecuta terminate_many en un hilo aparte para no bloquear la GUI durante el
+    plazo de gracia. 'result' se emite por cada pid apenas termina (o falla) y
+    'finished' con el dict completo; Qt encola ambas señales hacia el hilo de la GUI.
+    """
+    result = QtCore.pyqtSignal(int, object)
+    finished = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, pids, tree=False):
+        if self.busy():
+            return False
+
+        def run():
+            results = terminate_many(pids, tree=tree, callback=self.result.emit)
+            self.finished.emit(results)
+
+        self._thread = threading.Thread(target=run, name="hw-terminate", daemon=True)
+        self._thread.start()
+        return True
+
+
+class ProfileApplier(QtCore.QObject):
+    """
+    Aplica un perfil (prioridad, afinidad, E/S) a varios procesos en un hilo aparte:
+    son llamadas psutil por pid que con una selección grande tardan. 'finished' se
+    emite con (Profile, {pid: None o mensaje de error}).
+    """
+    finished = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, pids, profile):
+        if self.busy():
+            return False
+        pids = list(pids)
+
+        def run():
+            try:
+                results = apply_profile(pids, profile)
+            except Exception as e:
+                results = dict.fromkeys(pids, f"Error: {e}")
+            self.finished.emit(profile, results)
+
+        self._thread = threading.Thread(target=run, name="hw-profile", daemon=True)
+        self._thread.start()
+        return True
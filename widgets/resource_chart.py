@@ -1,4 +1,5 @@
 from PyQt5 import QtWidgets
+import numpy as np
 import pyqtgraph as pg
 
 class ResourceChart(QtWidgets.QFrame):
@@ -15,6 +16,18 @@ class ResourceChart(QtWidgets.QFrame):
         layout.addWidget(self.plot_widget)
         self.data = []
 
-    def update_data(self, data):
+    def update_data(self, data, times=None):
+        """
+        Acepta listas o memoryviews del RingBuffer; estos se envuelven con
+        np.frombuffer (sin copia). Si se pasan 'times', el eje X es "segundos atrás".
+        """
+        if isinstance(data, memoryview):
+            data = np.frombuffer(data, dtype=np.float64)
         self.data = data
-        self.curve.setData(self.data)
+        if times is not None and len(times) == len(data):
+            t = np.frombuffer(times, dtype=np.float64) if isinstance(times, memoryview) else np.asarray(times)
+            x = t - t[-1] if len(t) else t
+            # connect="finite" corta la línea en los huecos (NaN) del historial
+            self.curve.setData(x, self.data, connect="finite")
+        else:
+            self.curve.setData(self.data, connect="finite")
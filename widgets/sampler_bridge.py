@@ -0,0 +1,41 @@
+from PyQt5 import QtCore
+from core.sampler import get_sampler
+from core.alerts import AlertEngine, default_rules, log_sink
+from core.process_events import get_event_source
+
+
+class SamplerBridge(QtCore.QObject):
+    """
+    Reenvía los snapshots del Sampler compartido como señal Qt.
+    La señal se emite desde el hilo de muestreo y Qt la encola hacia el hilo de la GUI.
+    También evalúa las reglas de alerta en ese hilo y publica los eventos en 'alert'.
+    Los inicios/fines de procesos llegan por 'process_events' (listas de ProcessEvent)
+    y sus tasas se suman a los valores que ven las reglas.
+    """
+    updated = QtCore.pyqtSignal(object)
+    alert = QtCore.pyqtSignal(object)
+    process_events = QtCore.pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sampler = get_sampler()
+        self.events = get_event_source()
+        self.alerts = AlertEngine(default_rules(), sinks=[log_sink, self.alert.emit])
+        self.sampler.subscribe(self._evaluate)
+        self.sampler.subscribe(self.updated.emit)
+        self.events.subscribe(self.process_events.emit)
+
+    def _evaluate(self, snap):
+        values = dict(snap)
+        values.update(self.events.metrics())
+        self.alerts.evaluate(values, snap.get("time"))
+
+
+_bridge = None
+
+
+def get_bridge() -> SamplerBridge:
+    global _bridge
+    if _bridge is None:
+        _bridge = SamplerBridge()
+    return _bridge